@@ -0,0 +1,145 @@
+# artifact_cache.py
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# 快取目錄中記錄檔案雜湊的檔名 (不能用 manifest.json，會與瀏覽器外掛的 manifest 衝突)
+MANIFEST_NAME = '.artifact.json'
+# 各平台常見的 Chrome 執行檔
+CHROME_BINARIES = (
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+WINDOWS_CHROME_VERSION_KEYS = (
+    r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon',
+    r'HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon',
+)
+VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+
+class IntegrityError(Exception):
+    """
+    快取中的檔案與當初記錄的雜湊不符 (檔案損毀、被修改或缺少)。
+    """
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _run_version_command(args):
+    try:
+        completed = subprocess.run(args, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(completed.stdout or '')
+    return match.group(0) if match else None
+
+def detect_chrome_version(binary=None):
+    """
+    回傳已安裝的 Chrome 版本 (例如 '124.0.6367.91')；找不到時回傳 None。
+    有指定 binary 時只檢查該執行檔。
+    """
+    if binary:
+        return _run_version_command([binary, '--version'])
+    if sys.platform.startswith('win'):
+        for key in WINDOWS_CHROME_VERSION_KEYS:
+            version = _run_version_command(['reg', 'query', key, '/v', 'version'])
+            if version:
+                return version
+        return None
+    for candidate in CHROME_BINARIES:
+        if os.path.isabs(candidate) and not os.path.exists(candidate):
+            continue
+        if not os.path.isabs(candidate) and shutil.which(candidate) is None:
+            continue
+        version = _run_version_command([candidate, '--version'])
+        if version:
+            return version
+    return None
+
+def major_version(version):
+    """
+    ChromeDriver 只需與 Chrome 的主版本相符，因此以主版本作為快取的鍵值。
+    """
+    return version.split('.', 1)[0] if version else None
+
+
+class ArtifactCache:
+    """
+    以 (名稱, 鍵值) 保存下載過的檔案 (例如 chromedriver、瀏覽器外掛) 的本機快取。
+    每個項目存放在 <root>/<名稱>/<鍵值>/，並以 .artifact.json 記錄每個檔案的 SHA-256；
+    讀取時會驗證雜湊，寫入時先放在暫存目錄再整個搬移，中途失敗不會留下不完整的項目。
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def entry_path(self, name, key):
+        return os.path.join(self.root, name, str(key))
+
+    def get(self, name, key):
+        """
+        回傳通過完整性檢查的項目目錄；項目不存在時回傳 None，雜湊不符時拋出 IntegrityError。
+        """
+        path = self.entry_path(name, key)
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if not os.path.isfile(manifest_path):
+            return None
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                files = json.load(f)['files']
+        except (OSError, ValueError, KeyError) as e:
+            raise IntegrityError(f"{name}/{key}: unreadable manifest ({e})")
+        for relpath, expected in files.items():
+            file_path = os.path.join(path, relpath)
+            if not os.path.isfile(file_path) or file_sha256(file_path) != expected:
+                raise IntegrityError(f"{name}/{key}: {relpath} does not match its recorded hash")
+        return path
+
+    def put(self, name, key, populate, source=None):
+        """
+        呼叫 populate(暫存目錄) 寫入檔案後，記錄雜湊並以原子的方式取代 (名稱, 鍵值) 的項目，回傳項目目錄。
+        """
+        parent = os.path.join(self.root, name)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f'.{key}-', dir=parent)
+        try:
+            populate(staging)
+            files = {}
+            for directory, _, filenames in os.walk(staging):
+                for filename in filenames:
+                    file_path = os.path.join(directory, filename)
+                    files[os.path.relpath(file_path, staging).replace(os.sep, '/')] = file_sha256(file_path)
+            with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                json.dump({'files': files, 'source': source, 'created': time.time()}, f, indent=2)
+            path = self.entry_path(name, key)
+            self.remove(name, key)
+            os.replace(staging, path)
+            return path
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def remove(self, name, key):
+        shutil.rmtree(self.entry_path(name, key), ignore_errors=True)
+
+    def keys(self, name):
+        """
+        回傳 name 下所有已完成的項目鍵值 (數字鍵值依數值由新到舊排序)。
+        """
+        parent = os.path.join(self.root, name)
+        if not os.path.isdir(parent):
+            return []
+        keys = [k for k in os.listdir(parent)
+                if not k.startswith('.') and os.path.isfile(os.path.join(parent, k, MANIFEST_NAME))]
+        return sorted(keys, key=lambda k: (k.isdigit(), int(k) if k.isdigit() else 0, k), reverse=True)
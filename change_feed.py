@@ -0,0 +1,97 @@
+# change_feed.py
+import threading
+import time
+
+from incremental import sms_fingerprint
+
+
+class ChangeFeed:
+    """
+    為每次發布的號碼快照編上遞增的版本號，記錄每個號碼與每則簡訊最後一次新增或變更的版本，
+    讓 API 用戶端以游標 (cursor) 只取得之後的變化。
+    游標包含本次程式啟動的時間 (epoch)，程式重新啟動或游標過舊時會要求用戶端重新取得完整快照。
+    """
+
+    def __init__(self, max_removed=5000, clock=time.time):
+        self.epoch = int(clock())
+        self.max_removed = max_removed
+        self.revision = 0
+        self._fingerprints = {}
+        self._number_revisions = {}
+        self._sms_revisions = {}
+        self._removed = {}
+        # 比這個版本更舊的游標已無法得知完整的移除紀錄
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cursor(self):
+        return f"{self.epoch}-{self.revision}"
+
+    def update(self, numbers):
+        """
+        以最新的號碼快照更新版本紀錄；有任何號碼新增、變更或移除時版本號加一。回傳目前的游標。
+        """
+        with self._lock:
+            next_revision = self.revision + 1
+            changed = False
+            seen = set()
+            for item in numbers:
+                url = item['url']
+                seen.add(url)
+                fingerprint = sms_fingerprint(item.get('smss', []))
+                if self._fingerprints.get(url) == fingerprint:
+                    continue
+                changed = True
+                self._fingerprints[url] = fingerprint
+                self._number_revisions[url] = next_revision
+                self._removed.pop(url, None)
+                known = self._sms_revisions.get(url, {})
+                self._sms_revisions[url] = {sms: known.get(sms, next_revision) for sms in item.get('smss', [])}
+            for url in [u for u in self._fingerprints if u not in seen]:
+                changed = True
+                for table in (self._fingerprints, self._number_revisions, self._sms_revisions):
+                    table.pop(url, None)
+                self._removed[url] = next_revision
+            if changed:
+                self.revision = next_revision
+            if len(self._removed) > self.max_removed:
+                oldest = sorted(self._removed.items(), key=lambda kv: kv[1])[:len(self._removed) - self.max_removed]
+                for url, revision in oldest:
+                    del self._removed[url]
+                    self._floor = max(self._floor, revision)
+            return self.cursor
+
+    def parse_cursor(self, cursor):
+        """
+        將游標轉為版本號；游標無效、來自先前的程式執行或早於保留的紀錄時回傳 None (需重新取得完整快照)。
+        """
+        try:
+            epoch, revision = (int(part) for part in str(cursor).split('-', 1))
+        except ValueError:
+            return None
+        with self._lock:
+            if epoch != self.epoch or revision > self.revision or revision < self._floor:
+                return None
+        return revision
+
+    def changes_since(self, numbers, revision):
+        """
+        從 numbers 中挑出在該版本之後新增或變更的號碼 (附上 'new_smss')，並回傳 (changed, removed_urls)。
+        """
+        with self._lock:
+            changed = []
+            for item in numbers:
+                if self._number_revisions.get(item['url'], 0) <= revision:
+                    continue
+                sms_revisions = self._sms_revisions.get(item['url'], {})
+                changed.append((item, [sms for sms in item.get('smss', []) if sms_revisions.get(sms, 0) > revision]))
+            removed = [url for url, removed_at in self._removed.items() if removed_at > revision]
+        return changed, removed
+
+    def changed_urls_since(self, revision):
+        """
+        該版本之後內容有變化的所有號碼網址 (不論是否通過篩選)。
+        """
+        with self._lock:
+            return {url for url, changed_at in self._number_revisions.items() if changed_at > revision}
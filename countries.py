@@ -0,0 +1,58 @@
+# countries.py
+
+# 國碼 → 網站上顯示的國家名稱 (receive-smss.com 列表中的國家名稱、temp-number.com 網址中的國家都以此對應)
+COUNTRY_NAMES = {
+    'us': 'United States',
+    'ca': 'Canada',
+    'gb': 'United Kingdom',
+    'au': 'Australia',
+    'be': 'Belgium',
+    'de': 'Germany',
+    'dk': 'Denmark',
+    'es': 'Spain',
+    'fi': 'Finland',
+    'fr': 'France',
+    'hk': 'Hong Kong',
+    'id': 'Indonesia',
+    'in': 'India',
+    'it': 'Italy',
+    'my': 'Malaysia',
+    'nl': 'Netherlands',
+    'ph': 'Philippines',
+    'pl': 'Poland',
+    'pt': 'Portugal',
+    'ro': 'Romania',
+    'se': 'Sweden',
+    'ua': 'Ukraine',
+}
+_CODES_BY_NAME = {name.lower(): code for code, name in COUNTRY_NAMES.items()}
+
+
+def country_name(code):
+    """
+    回傳國碼對應的國家名稱；不在對照表中的國碼以大寫顯示。
+    """
+    return COUNTRY_NAMES.get(code, code.upper()) if code else ''
+
+def country_slug(code):
+    """
+    temp-number.com 網址中的國家名稱 (例如 'United-States')。
+    """
+    return country_name(code).replace(' ', '-')
+
+def country_code(name):
+    """
+    由網站上顯示的國家名稱找回國碼；無法對應時回傳 None。
+    """
+    return _CODES_BY_NAME.get(' '.join((name or '').split()).lower())
+
+def configured_countries(config):
+    """
+    回傳設定檔中要爬取的所有國碼 (依出現順序、不重複)：[general] 的 countries
+    (未設定時為 country_code)，加上各網站在 [sites.<網站>] 另外指定的 countries。
+    """
+    general = config.get('general', {})
+    codes = list(general.get('countries') or [general.get('country_code', 'us')])
+    for site_config in config.get('sites', {}).values():
+        codes.extend(site_config.get('countries') or [])
+    return list(dict.fromkeys(code.lower() for code in codes))
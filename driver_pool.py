@@ -0,0 +1,108 @@
+# driver_pool.py
+import queue
+import threading
+
+from selenium import webdriver
+
+from metrics import REGISTRY
+from tracing import TRACER
+
+DRIVER_LAUNCH_SECONDS = REGISTRY.histogram('smscatcher_driver_launch_seconds', 'Time to start a new Chrome WebDriver.')
+
+
+class DriverPool:
+    """
+    有上限的 Chrome WebDriver 池，讓執行緒池中的各個工作者共用已啟動的瀏覽器，
+    攤銷 Chrome 冷啟動的成本。
+    """
+
+    def __init__(self, service, options, lang_dict, size=7, max_pages_per_driver=50, checkout_timeout=300):
+        self.service = service
+        self.options = options
+        self.lang_dict = lang_dict
+        self.size = max(1, int(size))
+        self.max_pages_per_driver = max(1, int(max_pages_per_driver))
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def checkout(self):
+        """
+        借出一個健康的瀏覽器；池已滿時會阻塞等待，直到有瀏覽器被歸還或逾時。
+        """
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError(self.lang_dict['DRIVER_POOL_TIMEOUT'].format(seconds=self.checkout_timeout))
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._launch()
+                if self._is_alive(driver):
+                    return driver
+                # 閒置期間崩潰的瀏覽器直接丟棄，再取下一個
+                self._discard(driver)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver):
+        """
+        歸還瀏覽器；達到頁面上限或池已關閉時會直接回收。
+        """
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0) + 1
+                self._pages[id(driver)] = pages
+                recycle = self._closed or pages >= self.max_pages_per_driver
+            if recycle:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """
+        關閉池：結束所有閒置的瀏覽器，仍在使用中的瀏覽器會在歸還時被回收。
+        """
+        with self._lock:
+            self._closed = True
+        self.drain()
+
+    def drain(self):
+        """
+        結束所有閒置的瀏覽器，但池仍可繼續借出 (之後按需重新啟動)。
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _launch(self):
+        with DRIVER_LAUNCH_SECONDS.time(), TRACER.span('driver_launch'):
+            driver = webdriver.Chrome(service=self.service, options=self.options)
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
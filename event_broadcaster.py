@@ -0,0 +1,104 @@
+# event_broadcaster.py
+import json
+import queue
+import threading
+
+from keyword_matcher import compile_keywords, item_search_text
+
+
+class Subscriber:
+    """
+    一個已連線的 SSE 用戶端：自己的關鍵字與國家篩選條件，以及待送出的事件佇列。
+    佇列滿了 (用戶端太慢) 時會被中斷，用戶端重新連線後再從游標補上變化。
+    """
+
+    def __init__(self, include_keywords, exclude_keywords, max_queue, country=None):
+        self.include_keywords = tuple(include_keywords)
+        self.exclude_keywords = tuple(exclude_keywords)
+        self.country = country
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+
+    def render(self, batch):
+        """
+        依此用戶端的篩選條件組出事件內容：符合條件的號碼放在 numbers，不再符合的號碼放在 removed。
+        """
+        matcher = None
+        if self.include_keywords or self.exclude_keywords:
+            matcher = compile_keywords(self.include_keywords, self.exclude_keywords)
+        numbers = []
+        removed = list(batch['removed'])
+        for url, country, search_text, payload in batch['numbers']:
+            if self.country is not None and country != self.country:
+                continue
+            if matcher is None or matcher.matches(search_text):
+                numbers.append(payload)
+            else:
+                removed.append(url)
+        if not numbers and not removed:
+            return None
+        removed_json = json.dumps(removed, ensure_ascii=False)
+        return f'{{"cursor": {json.dumps(batch["cursor"])}, "numbers": [{", ".join(numbers)}], "removed": {removed_json}}}'
+
+
+class EventBroadcaster:
+    """
+    程式內唯一的事件廣播器：爬蟲每次發布新結果時，變化的號碼只序列化一次，
+    再依各用戶端的篩選條件分送 (同樣的篩選條件共用同一個已快取比對結果的 KeywordMatcher)。
+    """
+
+    def __init__(self, max_subscribers=12, max_queue=100):
+        self.max_subscribers = max_subscribers
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, include_keywords, exclude_keywords, country=None):
+        """
+        加入一個用戶端 (country 為 None 時接收所有國家的號碼)；已達連線上限時回傳 None。
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscriber = Subscriber(include_keywords, exclude_keywords, self.max_queue, country)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    @staticmethod
+    def make_batch(cursor, changes, removed, to_public):
+        """
+        將一次發布的變化轉為可分送的批次：每個號碼預先序列化成 JSON，並保留比對用的文字。
+        changes 為 ChangeFeed.changes_since() 回傳的 (item, new_smss) 列表。
+        """
+        numbers = []
+        for item, new_smss in changes:
+            payload = dict(to_public(item), new_smss=new_smss)
+            numbers.append((item['url'], item.get('country'), item_search_text(item), json.dumps(payload, ensure_ascii=False)))
+        return {'cursor': cursor, 'numbers': numbers, 'removed': list(removed)}
+
+    def publish(self, batch):
+        """
+        將批次分送給所有用戶端；事件內容依篩選條件只組一次。
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        rendered = {}
+        for subscriber in subscribers:
+            key = (subscriber.include_keywords, subscriber.exclude_keywords, subscriber.country)
+            if key not in rendered:
+                rendered[key] = subscriber.render(batch)
+            data = rendered[key]
+            if data is None:
+                continue
+            try:
+                subscriber.queue.put_nowait((batch['cursor'], data))
+            except queue.Full:
+                subscriber.closed = True
+                self.unsubscribe(subscriber)
@@ -0,0 +1,78 @@
+# http_cache.py
+import gzip
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli 為選用套件，未安裝時只提供 gzip
+    brotli = None
+
+# 會被壓縮的回應類型；太小的回應壓縮後反而更大
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'text/event-stream',
+    'application/javascript', 'application/json',
+}
+MIN_COMPRESS_SIZE = 500
+# 內容雜湊網址的靜態檔案可以被快取一年
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_file_digests = {}
+
+
+def make_etag(*parts):
+    """
+    由組成頁面內容的各項參數 (快取時間戳記、篩選條件等) 產生強 ETag (不含引號)。
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def negotiate_encoding(accept_encodings):
+    """
+    依 Accept-Encoding 選出最適合的壓縮方式 (優先 brotli)；用戶端不接受壓縮時回傳 None。
+    accept_encodings 為 werkzeug 的 request.accept_encodings。
+    """
+    return accept_encodings.best_match(supported_encodings()) or None
+
+def encoded_etag(etag, encoding):
+    """
+    同一份內容的不同壓縮版本必須使用不同的強 ETag。
+    """
+    return f"{etag}-{encoding}" if encoding else etag
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    return data
+
+def should_compress(response):
+    """
+    判斷回應是否適合在送出前壓縮 (尚未壓縮、類型可壓縮、大小足夠、非檔案串流)。
+    """
+    return (
+        response.status_code == 200
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and (response.content_length or 0) >= MIN_COMPRESS_SIZE
+    )
+
+def file_digest(path):
+    """
+    回傳檔案內容的短雜湊，依修改時間快取，檔案更新後自動重新計算；檔案不存在時回傳 None。
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _file_digests.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = (mtime, hashlib.sha1(f.read()).hexdigest()[:12])
+        _file_digests[path] = cached
+    return cached[1]
@@ -0,0 +1,81 @@
+# http_fetcher.py
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 出現這些標記代表拿到的是 Cloudflare 等人機驗證頁面，而不是實際內容
+CHALLENGE_MARKERS = (
+    b'cf-chl',
+    b'challenge-platform',
+    b'cf-browser-verification',
+    b'<title>just a moment',
+    b'<title>attention required',
+    b'g-recaptcha',
+)
+
+def looks_like_challenge(status_code, content):
+    """
+    判斷回應是否為人機驗證 / 阻擋頁面。
+    """
+    if status_code in (403, 429, 503):
+        return True
+    head = content[:20000].lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class HttpFetcher:
+    """
+    以 requests.Session (keep-alive、連線池) 讀取伺服器端渲染頁面的快速路徑。
+    """
+
+    def __init__(self, headers, timeout=15, pool_maxsize=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url):
+        """
+        取得頁面原始內容 (bytes)；連線失敗或遇到驗證頁面時回傳 None。
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200 or looks_like_challenge(response.status_code, response.content):
+            return None
+        return response.content
+
+
+class FetchStats:
+    """
+    執行緒安全的計數器，記錄每個網站的頁面是由哪條路徑 (http / selenium) 取得。
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, site, path):
+        with self._lock:
+            site_counts = self._counts.setdefault(site, {'http': 0, 'selenium': 0})
+            site_counts[path] = site_counts.get(path, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {site: dict(counts) for site, counts in self._counts.items()}
+
+    @staticmethod
+    def hit_rate(counts):
+        """
+        計算 HTTP 快速路徑的命中率 (0.0 ~ 1.0)。
+        """
+        total = sum(counts.values())
+        return counts.get('http', 0) / total if total else 0.0
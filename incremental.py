@@ -0,0 +1,64 @@
+# incremental.py
+import hashlib
+import threading
+import time
+
+
+def sms_fingerprint(smss):
+    """
+    以簡訊內容列表計算指紋，用來判斷號碼的訊息是否有變化。
+    """
+    digest = hashlib.sha1()
+    for sms in smss or []:
+        digest.update(sms.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class IncrementalRefresher:
+    """
+    記錄每個號碼上次檢查的結果與列表頁資訊，只重新檢查列表項目有變化或已超過時限的號碼，
+    其餘號碼沿用上次的結果。
+    """
+
+    def __init__(self, active_max_age=900, inactive_max_age=5400, clock=time.time):
+        self.active_max_age = active_max_age
+        self.inactive_max_age = inactive_max_age
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def plan(self, numbers_to_check):
+        """
+        將號碼分成需要重新檢查的清單，以及可沿用的活躍結果清單。
+        """
+        now = self._clock()
+        to_check = []
+        carried = []
+        with self._lock:
+            for number_info in numbers_to_check:
+                entry = self._entries.get(number_info['url'])
+                if entry is None or entry['list_meta'] != number_info.get('list_meta'):
+                    to_check.append(number_info)
+                    continue
+                max_age = self.active_max_age if entry['result'] else self.inactive_max_age
+                if now - entry['checked_at'] >= max_age:
+                    to_check.append(number_info)
+                elif entry['result']:
+                    carried.append(dict(entry['result']))
+        return to_check, carried
+
+    def record(self, number_info, result):
+        """
+        記錄一次成功的檢查 (result 為 None 代表號碼不活躍)。回傳簡訊內容是否與上次不同。
+        """
+        fingerprint = sms_fingerprint(result['smss']) if result else None
+        with self._lock:
+            previous = self._entries.get(number_info['url'])
+            self._entries[number_info['url']] = {
+                'list_meta': number_info.get('list_meta'),
+                'checked_at': self._clock(),
+                'result': dict(result) if result else None,
+                'sms_fingerprint': fingerprint,
+            }
+        return previous is None or previous['sms_fingerprint'] != fingerprint
@@ -0,0 +1,77 @@
+# keyword_matcher.py
+import functools
+
+
+def normalize_sms_text(smss):
+    """
+    將號碼的所有簡訊合併並轉為小寫，作為關鍵字比對的文字。
+    """
+    return " ".join(smss or []).lower()
+
+def item_search_text(item):
+    """
+    取得號碼預先計算好的比對文字；舊資料沒有此欄位時才即時計算。
+    """
+    text = item.get('search_text')
+    if text is None:
+        text = normalize_sms_text(item.get('smss', []))
+    return text
+
+def prune_keywords(keywords):
+    """
+    將關鍵字轉小寫、去除重複與空字串，並移除包含其他關鍵字的多餘關鍵字
+    (例如已有 "code" 時，"google code" 不會改變「含有任一關鍵字」的結果)。
+    """
+    lowered = sorted({k.lower() for k in keywords if k}, key=len)
+    kept = []
+    for keyword in lowered:
+        if not any(shorter in keyword for shorter in kept):
+            kept.append(keyword)
+    return tuple(kept)
+
+
+class KeywordMatcher:
+    """
+    針對一組包含/排除關鍵字編譯出的比對器。
+    每段文字的比對結果會被記住，同一份資料重複篩選時只需查表。
+    """
+
+    def __init__(self, include_keywords, exclude_keywords, memo_size=50000):
+        self.include = prune_keywords(include_keywords)
+        self.exclude = prune_keywords(exclude_keywords)
+        self.memo_size = memo_size
+        self._memo = {}
+
+    def matches(self, text):
+        """
+        文字不含任何排除關鍵字，且 (有包含關鍵字時) 含有其中任一個時回傳 True。
+        """
+        result = self._memo.get(text)
+        if result is None:
+            if any(k in text for k in self.exclude):
+                result = False
+            else:
+                result = not self.include or any(k in text for k in self.include)
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[text] = result
+        return result
+
+
+@functools.lru_cache(maxsize=32)
+def compile_keywords(include_keywords, exclude_keywords):
+    """
+    依關鍵字組合 (需為 tuple) 建立並快取 KeywordMatcher。
+    """
+    return KeywordMatcher(include_keywords, exclude_keywords)
+
+def apply_keyword_filter(numbers, include_keywords, exclude_keywords):
+    """
+    根據關鍵字清單篩選爬蟲結果 (大小寫不敏感)：
+    含有任一排除關鍵字的號碼會被移除；有包含關鍵字時，只保留含有其中任一個的號碼。
+    """
+    if not include_keywords and not exclude_keywords:
+        return numbers
+
+    matcher = compile_keywords(tuple(include_keywords), tuple(exclude_keywords))
+    return [item for item in numbers if matcher.matches(item_search_text(item))]
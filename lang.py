@@ -13,8 +13,16 @@ STRINGS = {
         'FILTER_UPDATED': "[篩選] 設定已更新: 模式={mode}, 包含={include}, 排除={exclude}",
         'POST_REQUEST_ERROR': "[錯誤] 處理 POST 請求時發生錯誤: {e}",
         'INITIALIZING': "正在初始化...",
+        'WARM_START_LOADED': "[*] 已從歷史資料庫載入上次的快照：{count} 個號碼 (更新於 {time})。",
+        'SERVE_ONLY_MODE': "🚀 僅提供網頁與 API 模式：使用上次保存的快照，不執行爬蟲。",
+        'STORAGE_SAVE_ERROR': "[!] 寫入歷史資料庫時發生錯誤: {e}",
         'CHECKING_DRIVER': "[*] 正在檢查並安裝 ChromeDriver...",
         'DRIVER_READY': "[*] ChromeDriver 服務已就緒。",
+        'DRIVER_CACHE_HIT': "[*] 使用本機快取的 ChromeDriver (Chrome {version}): {path}",
+        'DRIVER_CACHE_MISS': "[*] 本機快取中沒有符合 Chrome {version} 的 ChromeDriver，正在下載...",
+        'DRIVER_CACHE_FALLBACK': "[!] 下載 ChromeDriver 失敗 ({e})，改用快取中的其他版本: {path}",
+        'ARTIFACT_INTEGRITY_FAIL': "[!] 快取檔案完整性檢查失敗，將重新取得: {e}",
+        'ARTIFACT_OFFLINE_MISSING': "[!] 離線模式：本機快取中沒有 {name} ({key})。",
         'NGROK_REMINDER': "如果只想在本地端執行的話，請確認 config.toml 中的 ngrok_auth_token 為空字串 ''。",
         'NGROK_NOT_SET': "\033[91m[注意] ngrok Authtoken 未設定。\033[0m",
         'RUN_LOCAL_MODE': "將以本地模式運行 Flask 服務。",
@@ -38,6 +46,7 @@ STRINGS = {
         'ADBLOCK_BAD_ZIP': "\n[!] 下載的檔案非有效的 ZIP 檔案。",
         'ADBLOCK_UNKNOWN_ERROR': "\n[!] 安裝廣告攔截外掛時發生未知錯誤: {e}",
         'ADBLOCK_LOAD_WARN': "[!] 警告：廣告攔截外掛目錄不存在，瀏覽器將在無攔截模式下運行。",
+        'DRIVER_POOL_TIMEOUT': "等待空閒瀏覽器超過 {seconds} 秒",
         'SMS_CONTENT_ENCRYPTED': " 【注意：內容可能被網站加密，請在瀏覽器中確認】",
         'CANNOT_READ_SMS': "無法讀取簡訊內容。",
         'CHECKING_NUMBER': "    [THREAD] 檢查號碼: {number} ...",
@@ -64,7 +73,8 @@ STRINGS = {
         'LOAD_COUNTRY_PAGE_FAIL': "\n[!] 載入國家頁面失敗: {e}",
         'LOAD_COUNTRY_PAGE_GENERAL_ERROR': "\n[!] 載入國家頁面發生一般錯誤: {e}",
         'LOAD_MAIN_PAGE_ATTEMPT_FAIL': "\n[!] 第 {attempt} 次嘗試載入主頁面或等待元素時發生錯誤: {e}",
-        'NO_NUMBERS_AFTER_RETRIES': "[!] 在 3 次嘗試後，仍然無法在主頁上找到任何號碼。",
+        'NO_NUMBERS_AFTER_RETRIES': "[!] 在 {attempts} 次嘗試後，仍然無法在主頁上找到任何號碼。",
+        'RETRYING': "\n  -> 第 {attempt} 次嘗試失敗 ({e})，{delay:.1f} 秒後重試...",
         'FOUND_LINK_SUCCESS': "[*] 第 {attempt} 次嘗試成功找到號碼連結。",
         'NO_LINK_ON_ATTEMPT': "[!] 第 {attempt} 次嘗試在主頁上找不到任何號碼。",
         'LOAD_MAIN_PAGE_GENERAL_ERROR': "\n[!] 載入主頁面發生一般錯誤: {e}",
@@ -72,20 +82,28 @@ STRINGS = {
         'WRITING_DEBUG_FILE': "\n--- 正在將頁面原始碼寫入 {path} (偵錯用) ---",
         'WRITE_DEBUG_FILE_DONE': "--- 寫入完成 ---",
         'WRITE_DEBUG_FILE_ERROR': "--- 寫入偵錯檔案時發生錯誤: {e} ---",
+        'INCREMENTAL_PLAN': "[*] 增量更新：重新檢查 {check} 個號碼，略過 {skipped} 個未變化的號碼 (沿用 {carried} 個活躍結果)。",
+        'POLLING_DUE_NUMBERS': "\n[*] [輪詢] 檢查 {count} 個已到期的號碼...",
         'SEARCH_COMPLETE': "\n[*] 搜尋完畢。總共找到 {count} 個活躍號碼。",
-        'SEARCH_COMPLETE_TEMP': "\n[*] temp-number.com 搜尋完畢。總共找到 {count} 個活躍號碼。",
-        'TRAVERSING_SITES_START': "[*] 開始遍歷 {count} 個目標網站...",
+        'LISTED_TARGETS': "[*] {site}: 已載入 {pages} 個列表頁，共 {count} 個不重複的號碼。",
+        'LIST_PAGES_FAILED_KEPT': "[!] {site}: {pages} 個列表頁載入失敗，沿用上次列出的 {count} 個號碼。",
+        'TRAVERSING_SITES_START': "[*] 開始併發爬取 {count} 個目標網站...",
         'PROCESSING_SITE': "\n--- 正在處理網站: {url} ---",
         'PARSER_NOT_FOUND': "[!] 警告：找不到為 {url} 設定的解析器。 ",
         'PROCESS_SITE_ERROR': "[!] 處理 {url} 時發生錯誤: {e}",
+        'SITE_DONE': "[*] 網站 {url} 處理完畢，找到 {count} 個活躍號碼。",
+        'SITE_LIST_FAILED': "[!] 網站 {url} 的列表頁全部載入失敗，保留上次的結果。",
+        'SITE_TIMEOUT': "[!] 網站 {url} 超過 {seconds} 秒仍未完成，本輪略過其結果。",
+        'FETCH_PATH_SUMMARY': "[*] {site}: HTTP 快速路徑 {http} 頁 / Selenium {selenium} 頁 (HTTP 命中率 {rate:.0%})",
         'ALL_SITES_DONE': "\n[*] 所有網站處理完畢，總共從 {count} 個網站中收集到 {total} 個活躍號碼。 ",
 
         # Web Interface (index.html)
         'WEB_TITLE': "活躍簡訊號碼與關鍵字篩選",
         'WEB_H1': "活躍簡訊號碼",
-        'WEB_INFO_REFRESH': "頁面每 60 秒自動刷新。上次資料更新於 {last_updated} (每 {minutes} 分鐘更新一次資料)。",
+        'WEB_INFO_REFRESH': "新簡訊會即時顯示在頁面上。上次資料更新於 {last_updated} (每 {minutes} 分鐘完整更新一次資料)。",
         'WEB_INFO_DISPLAYING': "<br>當前顯示 **{filtered_count}** 個號碼 (總活躍數: {total_count})。",
         'WEB_FILTER_TITLE': "關鍵字篩選設定",
+        'WEB_COUNTRY_LABEL': "國家",
         'WEB_INCLUDE_LABEL': "必須包含的關鍵字 (逗號分隔):",
         'WEB_INCLUDE_PLACEHOLDER': "例如: google, code, verify",
         'WEB_EXCLUDE_LABEL': "必須排除的關鍵字 (逗號分隔):",
@@ -112,8 +130,16 @@ STRINGS = {
         'FILTER_UPDATED': "[Filter] Settings updated: Mode={mode}, Include={include}, Exclude={exclude}",
         'POST_REQUEST_ERROR': "[Error] An error occurred while processing POST request: {e}",
         'INITIALIZING': "Initializing...",
+        'WARM_START_LOADED': "[*] Loaded the last snapshot from the history database: {count} numbers (updated at {time}).",
+        'SERVE_ONLY_MODE': "🚀 Serve-only mode: serving the dashboard and API from the last saved snapshot without scraping.",
+        'STORAGE_SAVE_ERROR': "[!] An error occurred while writing to the history database: {e}",
         'CHECKING_DRIVER': "[*] Checking and installing ChromeDriver...",
         'DRIVER_READY': "[*] ChromeDriver service is ready.",
+        'DRIVER_CACHE_HIT': "[*] Using the locally cached ChromeDriver (Chrome {version}): {path}",
+        'DRIVER_CACHE_MISS': "[*] No cached ChromeDriver matches Chrome {version}, downloading...",
+        'DRIVER_CACHE_FALLBACK': "[!] Failed to download ChromeDriver ({e}), using another cached version: {path}",
+        'ARTIFACT_INTEGRITY_FAIL': "[!] Cached file failed its integrity check and will be fetched again: {e}",
+        'ARTIFACT_OFFLINE_MISSING': "[!] Offline mode: {name} ({key}) is not in the local cache.",
         'NGROK_REMINDER': "If you only want to run locally, please ensure ngrok_auth_token is an empty string '' in config.toml.",
         'NGROK_NOT_SET': "\033[91m[Warning] ngrok Authtoken is not set.\033[0m",
         'RUN_LOCAL_MODE': "Running Flask service in local mode.",
@@ -137,6 +163,7 @@ STRINGS = {
         'ADBLOCK_BAD_ZIP': "\n[!] Downloaded file is not a valid ZIP file.",
         'ADBLOCK_UNKNOWN_ERROR': "\n[!] An unknown error occurred while installing the adblocker extension: {e}",
         'ADBLOCK_LOAD_WARN': "[!] Warning: Adblocker extension directory not found. The browser will run without ad blocking.",
+        'DRIVER_POOL_TIMEOUT': "Timed out after {seconds} seconds waiting for an idle browser",
         'SMS_CONTENT_ENCRYPTED': " [Note: Content may be encrypted by the website, please verify in browser]",
         'CANNOT_READ_SMS': "Could not read SMS content.",
         'CHECKING_NUMBER': "    [THREAD] Checking number: {number} ...",
@@ -163,7 +190,8 @@ STRINGS = {
         'LOAD_COUNTRY_PAGE_FAIL': "\n[!] Failed to load country page: {e}",
         'LOAD_COUNTRY_PAGE_GENERAL_ERROR': "\n[!] A general error occurred while loading the country page: {e}",
         'LOAD_MAIN_PAGE_ATTEMPT_FAIL': "\n[!] Attempt {attempt} to load main page or wait for element failed: {e}",
-        'NO_NUMBERS_AFTER_RETRIES': "[!] Could not find any numbers on the main page after 3 attempts.",
+        'NO_NUMBERS_AFTER_RETRIES': "[!] Could not find any numbers on the main page after {attempts} attempts.",
+        'RETRYING': "\n  -> Attempt {attempt} failed ({e}), retrying in {delay:.1f} seconds...",
         'FOUND_LINK_SUCCESS': "[*] Successfully found number links on attempt {attempt}.",
         'NO_LINK_ON_ATTEMPT': "[!] Could not find any numbers on the main page on attempt {attempt}.",
         'LOAD_MAIN_PAGE_GENERAL_ERROR': "\n[!] A general error occurred while loading the main page: {e}",
@@ -171,20 +199,28 @@ STRINGS = {
         'WRITING_DEBUG_FILE': "\n--- Writing page source to {path} (for debugging) ---",
         'WRITE_DEBUG_FILE_DONE': "--- Write complete ---",
         'WRITE_DEBUG_FILE_ERROR': "--- An error occurred while writing the debug file: {e} ---",
+        'INCREMENTAL_PLAN': "[*] Incremental refresh: re-checking {check} numbers, skipping {skipped} unchanged numbers ({carried} active results carried forward).",
+        'POLLING_DUE_NUMBERS': "\n[*] [Polling] Checking {count} numbers that are due...",
         'SEARCH_COMPLETE': "\n[*] Search complete. Found a total of {count} active numbers.",
-        'SEARCH_COMPLETE_TEMP': "\n[*] temp-number.com search complete. Found a total of {count} active numbers.",
-        'TRAVERSING_SITES_START': "[*] Starting to traverse {count} target websites...",
+        'LISTED_TARGETS': "[*] {site}: loaded {pages} list pages with {count} distinct numbers.",
+        'LIST_PAGES_FAILED_KEPT': "[!] {site}: {pages} list pages failed to load; keeping {count} numbers they listed last time.",
+        'TRAVERSING_SITES_START': "[*] Starting to crawl {count} target websites concurrently...",
         'PROCESSING_SITE': "\n--- Processing site: {url} ---",
         'PARSER_NOT_FOUND': "[!] Warning: No parser configured for {url}.",
         'PROCESS_SITE_ERROR': "[!] An error occurred while processing {url}: {e}",
+        'SITE_DONE': "[*] Finished {url}: found {count} active numbers.",
+        'SITE_LIST_FAILED': "[!] Every list page of {url} failed to load; keeping its previous results.",
+        'SITE_TIMEOUT': "[!] {url} did not finish within {seconds} seconds; skipping its results this cycle.",
+        'FETCH_PATH_SUMMARY': "[*] {site}: {http} pages via HTTP fast path / {selenium} pages via Selenium (HTTP hit rate {rate:.0%})",
         'ALL_SITES_DONE': "\n[*] All sites processed. Collected a total of {total} active numbers from {count} websites.",
 
         # Web Interface (index.html)
         'WEB_TITLE': "Active SMS Numbers & Keyword Filter",
         'WEB_H1': "Active SMS Numbers",
-        'WEB_INFO_REFRESH': "Page auto-refreshes every 60 seconds. Last data update at {last_updated} (updates every {minutes} minutes).",
+        'WEB_INFO_REFRESH': "New messages appear on the page as they arrive. Last data update at {last_updated} (full update every {minutes} minutes).",
         'WEB_INFO_DISPLAYING': "<br>Currently displaying **{filtered_count}** numbers (Total active: {total_count}).",
         'WEB_FILTER_TITLE': "Keyword Filter Settings",
+        'WEB_COUNTRY_LABEL': "Country",
         'WEB_INCLUDE_LABEL': "Keywords to Include (comma-separated):",
         'WEB_INCLUDE_PLACEHOLDER': "e.g., google, code, verify",
         'WEB_EXCLUDE_LABEL': "Keywords to Exclude (comma-separated):",
@@ -1,89 +1,289 @@
 # -*- coding: utf-8 -*-
-from webdriver_manager.chrome import ChromeDriverManager
-
+# 注意：selenium、webdriver_manager、pyngrok、waitress 與 scraper_core 只在實際用到的路徑才匯入，
+# 讓 --test-ui / --serve-only 模式與測試不必付出爬蟲相關套件的載入成本。
 import sys
-from selenium.webdriver.chrome.service import Service
-from flask import Flask, render_template, request, redirect, url_for
-from waitress import serve
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify
 import threading
 import time
 import json # 處理 JSON 格式的關鍵字清單
 import argparse
+import queue
+import functools
+import os
 
-import tomli
-from scraper_core import scrape_all_sites, apply_keyword_filter
+from keyword_matcher import apply_keyword_filter
+from countries import configured_countries, country_name
 from lang import get_lang
-
-# --- ngrok 相關匯入 ---
-from pyngrok import ngrok
+from settings import load_config
+from storage import SmsStore
+from view_cache import ViewCache
+from snapshot import KeywordSettings, Snapshot
+from change_feed import ChangeFeed
+from event_broadcaster import EventBroadcaster
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS
+from http_cache import (
+    IMMUTABLE_CACHE_CONTROL, compress, encoded_etag, file_digest, make_etag, negotiate_encoding, should_compress,
+)
 
 # --- 全域變數定義 ---
 CHROME_SERVICE = None # 📌 儲存 Selenium Service 實例，避免重複安裝驅動程式。
+SMS_STORE = None # SQLite 歷史資料庫，啟動時載入上次的快照
+# 最近一次成功完成爬取 (任一網站的完整更新或一輪輪詢) 的時間。資料沒有變化時不會發布新的快照，
+# 網頁以此顯示爬蟲仍在運作；它不屬於快照，變更游標、篩選結果與歷史資料庫都不受影響
+LAST_SCRAPE_TIME = 0
 lang_dict = get_lang() # 預設為中文，稍後會被 argparse 的結果覆寫
 
-# --- 讀取設定檔 ---
-try:
-    with open("config.toml", "rb") as f:
-        config = tomli.load(f)
-except FileNotFoundError:
-    print(lang_dict['CONFIG_NOT_FOUND'])
-    sys.exit(1)
-
 # --- 全域設定 ---
-default_ngrok_token = config.get('ngrok_auth_token', '')
-
-general_config = config['general']
-BASE_URLS = general_config['base_urls']
-COUNTRY_CODE = general_config['country_code']
-CACHE_DURATION_SECONDS = general_config['cache_duration_seconds']
-CACHE_DURATION_MINUTES = int(CACHE_DURATION_SECONDS / 60) 
-PORT = general_config['port']
-
-KEYWORDS_CONFIG = config.get('keywords', {})
-KEYWORD_SETTINGS = {
-    "filter_mode": KEYWORDS_CONFIG.get('filter_mode', 'contains'),
-    "must_include": KEYWORDS_CONFIG.get('must_include', []),
-    "must_exclude": KEYWORDS_CONFIG.get('must_exclude', [])
-}
-
-cached_data = {
-    "raw_numbers": None,
-    "timestamp": 0
-}
+# 匯入本模組時不讀取設定檔 (測試與 bench_startup 只匯入 main)；以下由設定檔決定的全域設定在啟動時由 configure() 載入
+# API 回傳的號碼欄位
+API_NUMBER_FIELDS = ('number', 'url', 'source', 'country', 'last_time', 'last_sms', 'smss')
+# 記錄每次發布的版本，供 /api/numbers?since=<cursor> 只回傳變化的部分
+CHANGE_FEED = ChangeFeed()
+# /metrics (Prometheus 文字格式)：爬蟲與網頁伺服器的計數器與耗時直方圖
+HOME_SECONDS = METRICS.histogram('smscatcher_home_seconds', 'Latency of the dashboard page (GET /), including 304 responses.')
+FILTER_SECONDS = METRICS.histogram('smscatcher_filter_seconds', 'Time to apply the keyword filter to the cached numbers (cache misses only).')
+
+def configure(new_config=None):
+    """
+    套用設定 (未指定時讀取 config.toml) 到網頁伺服器的全域設定，並建立頁面快取、SSE 廣播器與初始的快照及篩選設定。
+    啟動時呼叫一次；找不到設定檔時拋出 FileNotFoundError。
+    """
+    global config, default_ngrok_token, BASE_URLS, COUNTRY_CODE, COUNTRIES, DEFAULT_COUNTRY
+    global CACHE_DURATION_SECONDS, CACHE_DURATION_MINUTES, PORT, STORAGE_CONFIG, VIEW_CACHE
+    global API_PAGE_SIZE, API_MAX_PAGE_SIZE, WEB_THREADS, SSE_HEARTBEAT_SECONDS, BROADCASTER, METRICS_ENABLED
+    global KEYWORD_SETTINGS, SNAPSHOT
+    config = load_config() if new_config is None else new_config
+    default_ngrok_token = config.get('ngrok_auth_token', '')
+
+    general_config = config['general']
+    BASE_URLS = general_config['base_urls']
+    COUNTRY_CODE = general_config['country_code']
+    # 爬取的所有國家 (網頁上可用 ?country=<國碼> 切換)；預設顯示 country_code
+    COUNTRIES = configured_countries(config)
+    DEFAULT_COUNTRY = COUNTRY_CODE if COUNTRY_CODE in COUNTRIES else COUNTRIES[0]
+    CACHE_DURATION_SECONDS = general_config['cache_duration_seconds']
+    CACHE_DURATION_MINUTES = int(CACHE_DURATION_SECONDS / 60)
+    PORT = general_config['port']
+
+    STORAGE_CONFIG = config.get('storage', {})
+
+    web_config = config.get('web', {})
+    # 篩選結果與渲染好的首頁，鍵值為 (快照時間戳記, 國碼, 篩選模式, 包含關鍵字, 排除關鍵字)
+    VIEW_CACHE = ViewCache(web_config.get('view_cache_size', 32))
+    # /api/numbers 每頁預設與最多回傳的號碼數
+    API_PAGE_SIZE = web_config.get('api_page_size', 100)
+    API_MAX_PAGE_SIZE = web_config.get('api_max_page_size', 500)
+    # /events (Server-Sent Events)：每個連線會佔用一個 waitress 執行緒，因此連線數上限需小於 threads
+    WEB_THREADS = web_config.get('threads', 16)
+    SSE_HEARTBEAT_SECONDS = web_config.get('sse_heartbeat_seconds', 15)
+    BROADCASTER = EventBroadcaster(
+        max_subscribers=web_config.get('sse_max_clients', 12),
+        max_queue=web_config.get('sse_queue_size', 100),
+    )
+    METRICS_ENABLED = web_config.get('metrics_enabled', True)
+
+    keywords_config = config.get('keywords', {})
+    # 主頁面的篩選設定與快取資料都是不可變的物件，更新時整個換掉參照 (見 snapshot.py)，讀取端不需要加鎖
+    KEYWORD_SETTINGS = KeywordSettings(
+        keywords_config.get('filter_mode', 'contains'),
+        keywords_config.get('must_include', []),
+        keywords_config.get('must_exclude', []),
+    )
+    SNAPSHOT = Snapshot(default_country=COUNTRY_CODE)
+
+def load_scraper():
+    """
+    匯入 scraper_core 並套用同一份設定 (只在開始爬蟲時呼叫，網頁 / API 模式不會載入爬蟲相關套件)。
+    """
+    import scraper_core
+    scraper_core.configure(config)
+    return scraper_core
 
 def update_cache(target_urls, lang_dict):
     """
-    在背景執行爬蟲並更新快取資料。
+    在背景執行爬蟲並更新快取資料：每 CACHE_DURATION_SECONDS 秒做一次完整更新，
+    兩次完整更新之間則依輪詢排程個別檢查已到期的號碼。
     """
-    global cached_data
+    scraper_core = load_scraper()
+    scrape_all_sites = scraper_core.scrape_all_sites
+    poll_due_numbers = scraper_core.poll_due_numbers
+    seconds_until_next_poll = scraper_core.seconds_until_next_poll
+
+    # 每個網站最近一次的結果；慢的網站在完成前會沿用上一輪的資料，不會拖住其他網站
+    site_results = {}
+    for number in SNAPSHOT.numbers or ():
+        site_results.setdefault(number.get('base_url'), []).append(number)
+    # 輪詢檢查的結果 (網址 → 結果，None 代表已不活躍) 先累積，每次排程迴圈結束後一次發布並只寫入這些號碼
+    polled = {}
+
+    def publish():
+        global SNAPSHOT
+        numbers = tuple(n for url_numbers in site_results.values() for n in url_numbers)
+        # 資料沒有變化時沿用目前的快照 (回傳 None)：時間戳記不變，記住的篩選結果、頁面與 ETag 都仍然有效
+        if SNAPSHOT.loaded and numbers == SNAPSHOT.numbers:
+            return None
+        # 先建好完整的快照 (含索引) 再一次換掉參照；資料要在游標前發布，讀取端先取游標再取資料才不會漏掉變化
+        snapshot = Snapshot(numbers, time.time(), COUNTRY_CODE)
+        previous_revision = CHANGE_FEED.revision
+        SNAPSHOT = snapshot
+        cursor = CHANGE_FEED.update(snapshot.numbers)
+        VIEW_CACHE.clear()
+        if CHANGE_FEED.revision != previous_revision and len(BROADCASTER):
+            changes, removed = CHANGE_FEED.changes_since(snapshot.numbers, previous_revision)
+            BROADCASTER.publish(EventBroadcaster.make_batch(cursor, changes, removed, public_number))
+        return snapshot
+
+    def save(write):
+        if SMS_STORE is None:
+            return
+        try:
+            write(SMS_STORE)
+        except Exception as e:
+            print(lang_dict['STORAGE_SAVE_ERROR'].format(e=e))
+
+    def save_snapshot():
+        snapshot = publish()
+        if snapshot is not None:
+            save(lambda store: store.save_snapshot(snapshot.numbers, snapshot.timestamp))
+
+    def mark_scraped():
+        global LAST_SCRAPE_TIME
+        LAST_SCRAPE_TIME = time.time()
+
+    def publish_site(url, numbers):
+        site_results[url] = numbers
+        save_snapshot()
+        mark_scraped()
+
+    def record_number(number_info, result):
+        numbers = [n for n in site_results.get(number_info['base_url'], []) if n['url'] != number_info['url']]
+        if result:
+            numbers.append(result)
+        site_results[number_info['base_url']] = numbers
+        polled[number_info['url']] = result
+
+    def publish_polled():
+        if not polled:
+            return
+        snapshot = publish()
+        updated = [result for result in polled.values() if result]
+        removed = [url for url, result in polled.items() if not result]
+        polled.clear()
+        if snapshot is not None:
+            save(lambda store: store.save_changes(updated, removed, snapshot.timestamp))
+        mark_scraped()
+
+    next_full_update = 0
     while True:
-        print(lang_dict['UPDATE_START'])
-        raw_numbers = scrape_all_sites(CHROME_SERVICE, target_urls, lang_dict)
-        cached_data["raw_numbers"] = raw_numbers
-        cached_data["timestamp"] = time.time()
-        
-        initial_filtered = apply_keyword_filter(
-            raw_numbers if raw_numbers is not None else [],
-            KEYWORD_SETTINGS['must_include'], 
-            KEYWORD_SETTINGS['must_exclude']
-        )
-        print(lang_dict['UPDATE_DONE'].format(
-            raw_count=len(raw_numbers) if raw_numbers is not None else 0, 
-            filtered_count=len(initial_filtered)
-        ))
-        print(lang_dict['UPDATE_NEXT'].format(seconds=CACHE_DURATION_SECONDS))
-        print("*"*80)
-        
-        time.sleep(CACHE_DURATION_SECONDS)
+        if time.time() >= next_full_update:
+            print(lang_dict['UPDATE_START'])
+            scrape_all_sites(CHROME_SERVICE, target_urls, lang_dict, on_site_done=publish_site)
+            if not SNAPSHOT.loaded:
+                # 第一輪所有網站都失敗時也發布空的快照，讓網頁不再顯示「初始化中」
+                save_snapshot()
+            snapshot = SNAPSHOT
+            settings = KEYWORD_SETTINGS
+
+            initial_filtered = apply_keyword_filter(
+                snapshot.numbers or [],
+                settings.must_include,
+                settings.must_exclude
+            )
+            print(lang_dict['UPDATE_DONE'].format(
+                raw_count=len(snapshot),
+                filtered_count=len(initial_filtered)
+            ))
+            print(lang_dict['UPDATE_NEXT'].format(seconds=CACHE_DURATION_SECONDS))
+            print("*"*80)
+            next_full_update = time.time() + CACHE_DURATION_SECONDS
+        elif poll_due_numbers(CHROME_SERVICE, lang_dict, on_result=record_number):
+            publish_polled()
+            continue
+
+        # 睡到下一次完整更新或下一個號碼到期 (以先到者為準)
+        wait = next_full_update - time.time()
+        until_poll = seconds_until_next_poll()
+        if until_poll is not None:
+            wait = min(wait, until_poll)
+        time.sleep(max(wait, 1))
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 
+@app.url_defaults
+def add_static_version(endpoint, values):
+    """
+    靜態檔案的網址加上內容雜湊 (?v=...)，檔案內容改變時網址也會改變，因此可以長期快取。
+    """
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        digest = file_digest(os.path.join(app.static_folder, values['filename']))
+        if digest:
+            values['v'] = digest
+
+@app.after_request
+def apply_http_caching(response):
+    """
+    帶有正確內容雜湊的靜態檔案回應加上長期快取標頭；其他可壓縮的回應依 Accept-Encoding 壓縮。
+    """
+    if request.endpoint == 'static':
+        filename = (request.view_args or {}).get('filename', '')
+        version = request.args.get('v')
+        if version and version == file_digest(os.path.join(app.static_folder, filename)):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+    if should_compress(response):
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding:
+            response.set_data(compress(response.get_data(), encoding))
+            response.headers['Content-Encoding'] = encoding
+            etag, weak = response.get_etag()
+            if etag:
+                response.set_etag(encoded_etag(etag, encoding), weak)
+        response.vary.add('Accept-Encoding')
+    return response
+
+@functools.lru_cache(maxsize=1)
+def page_version():
+    """
+    頁面模板、靜態檔案與介面語言的版本，任何一項改變都會讓 ETag 失效。
+    """
+    return make_etag(
+        file_digest(os.path.join(app.root_path, app.template_folder, 'index.html')),
+        file_digest(os.path.join(app.static_folder, 'style.css')),
+        file_digest(os.path.join(app.static_folder, 'script.js')),
+        sorted(lang_dict.items()),
+    )
+
+def conditional_page(etag, cache_key, render):
+    """
+    以 ETag 回應條件式 GET (If-None-Match 相符時回傳 304)，否則回傳依 Accept-Encoding 壓縮過的頁面。
+    渲染結果與壓縮後的內容都存放在 VIEW_CACHE 中。
+    """
+    encoding = negotiate_encoding(request.accept_encodings)
+    etag = encoded_etag(etag, encoding)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        body = VIEW_CACHE.get_or_create(
+            cache_key + (encoding,),
+            lambda: compress(VIEW_CACHE.get_or_create(cache_key, render).encode('utf-8'), encoding),
+        )
+        response = app.response_class(body, mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    # 允許快取，但每次使用前都要以 ETag 向伺服器確認
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/', methods=['GET', 'POST'])
 def home():
     """
     渲染主頁面，並處理關鍵字篩選器的 POST 請求。
+    同一份快取資料與篩選條件的結果會被記住，多人同時重新整理時不必重複篩選與渲染。
     """
     global KEYWORD_SETTINGS
+    country = request_country(request.args)
     
     if request.method == 'POST':
         try:
@@ -93,52 +293,79 @@ def home():
             new_include = json.loads(include_json) if include_json else []
             new_exclude = json.loads(exclude_json) if exclude_json else []
 
-            KEYWORD_SETTINGS['filter_mode'] = request.form.get('filter_mode', 'none')
-            KEYWORD_SETTINGS['must_include'] = new_include
-            KEYWORD_SETTINGS['must_exclude'] = new_exclude
+            KEYWORD_SETTINGS = KeywordSettings(request.form.get('filter_mode', 'none'), new_include, new_exclude)
             
             print(lang_dict['FILTER_UPDATED'].format(
-                mode=KEYWORD_SETTINGS['filter_mode'], 
+                mode=KEYWORD_SETTINGS.filter_mode, 
                 include=new_include, 
                 exclude=new_exclude
             ))
             
-            return redirect(url_for('home'))
+            return redirect(url_for('home', country=request.args.get('country')))
             
         except Exception as e:
             print(lang_dict['POST_REQUEST_ERROR'].format(e=e))
             pass
 
-    country_name_map = {'ca': 'Canada', 'us': 'United States', 'gb': 'United Kingdom'}
-    country_name = country_name_map.get(COUNTRY_CODE, COUNTRY_CODE.upper())
+    with HOME_SECONDS.time():
+        # 整個請求只讀取一次全域參照，即使期間有新的資料或設定發布，頁面與 ETag 也都來自同一份快照；
+        # 與 api_numbers 相同，先取游標再取資料，頁面上的事件串流才不會漏掉兩者之間發布的變化
+        cursor = CHANGE_FEED.cursor
+        snapshot = SNAPSHOT
+        # 頁面上顯示的更新時間：資料沒有變化時快照時間戳記不變，改用最近一次完成爬取的時間 (只影響這個頁面的快取)
+        last_updated = max(snapshot.timestamp, LAST_SCRAPE_TIME) if snapshot.timestamp > 0 else 0
+        mode, include_k, exclude_k = KEYWORD_SETTINGS
+        page_key = ('page', snapshot.timestamp, last_updated, cursor, country, mode, include_k, exclude_k)
+        etag = make_etag(page_version(), *page_key)
+        return conditional_page(etag, page_key,
+                                lambda: render_home(snapshot, cursor, last_updated, mode, include_k, exclude_k, country))
+
+def effective_keywords(mode, include_k, exclude_k):
+    """
+    依篩選模式決定實際使用的 (包含關鍵字, 排除關鍵字)。
+    """
+    if mode == 'contains':
+        return include_k, []
+    if mode == 'excludes':
+        return [], exclude_k
+    if mode == 'both':
+        return include_k, exclude_k
+    return [], []
+
+def request_country(args):
+    """
+    查詢參數 country 指定的國碼；未指定或不是爬取中的國家時使用預設國家。
+    """
+    country = (args.get('country') or '').lower()
+    return country if country in COUNTRIES else DEFAULT_COUNTRY
+
+def filtered_view(snapshot, final_include, final_exclude, country=None):
+    """
+    回傳快照中篩選後的號碼列表 (有指定 country 時只含該國家)，依 (快照時間戳記, 國碼, 包含關鍵字, 排除關鍵字) 記住結果。
+    """
+    raw_numbers = (snapshot.numbers or ()) if country is None else snapshot.country_numbers(country)
+    key = ('filtered', snapshot.timestamp, country, tuple(final_include), tuple(final_exclude))
+
+    def apply_filter():
+        with FILTER_SECONDS.time():
+            return apply_keyword_filter(raw_numbers, final_include, final_exclude)
+
+    return VIEW_CACHE.get_or_create(key, apply_filter)
+
+def render_home(snapshot, cursor, updated_at, mode, include_k, exclude_k, country):
+    """
+    依快照、國家與篩選條件渲染主頁面；cursor 是讀取快照前取得的變更游標，頁面上的事件串流由此接續，
+    updated_at 是顯示的資料更新時間 (0 代表仍在初始化)。
+    """
     last_updated = lang_dict['INITIALIZING']
     
-    if cached_data["timestamp"] > 0:
-        last_updated = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(cached_data["timestamp"]))
-    
-    raw_numbers = cached_data["raw_numbers"]
+    if updated_at > 0:
+        last_updated = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(updated_at))
     
-    if raw_numbers is not None:
-        total_count = len(raw_numbers)
-        
-        mode = KEYWORD_SETTINGS['filter_mode']
-        include_k = KEYWORD_SETTINGS['must_include']
-        exclude_k = KEYWORD_SETTINGS['must_exclude']
-
-        if mode == 'contains':
-            final_include = include_k
-            final_exclude = []
-        elif mode == 'excludes':
-            final_include = []
-            final_exclude = exclude_k
-        elif mode == 'both':
-            final_include = include_k
-            final_exclude = exclude_k
-        else:
-            final_include = []
-            final_exclude = []
-        
-        filtered_numbers = apply_keyword_filter(raw_numbers, final_include, final_exclude)
+    if snapshot.loaded:
+        total_count = len(snapshot.country_numbers(country))
+        final_include, final_exclude = effective_keywords(mode, include_k, exclude_k)
+        filtered_numbers = filtered_view(snapshot, final_include, final_exclude, country)
         filtered_count = len(filtered_numbers)
     else:
         filtered_numbers = None
@@ -148,17 +375,156 @@ def home():
     return render_template(
         'index.html', 
         numbers=filtered_numbers, 
-        country_name=country_name,
+        country_name=country_name(country),
+        country=country,
+        countries=[(code, country_name(code)) for code in COUNTRIES],
         last_updated=last_updated,
         update_min=CACHE_DURATION_MINUTES,
         total_count=total_count,
         filtered_count=filtered_count,
-        initial_include=KEYWORD_SETTINGS['must_include'],
-        initial_exclude=KEYWORD_SETTINGS['must_exclude'],
-        initial_mode=KEYWORD_SETTINGS['filter_mode'],
+        initial_include=list(include_k),
+        initial_exclude=list(exclude_k),
+        initial_mode=mode,
+        events_cursor=cursor,
         lang=lang_dict  # 將語言字典傳遞給模板
     )
 
+def split_keywords(value):
+    return [k.strip() for k in value.split(',') if k.strip()]
+
+def public_number(item):
+    return {field: item.get(field) for field in API_NUMBER_FIELDS}
+
+def request_keywords(args):
+    """
+    查詢參數有 include/exclude (逗號分隔) 時使用它們，否則沿用主頁面的篩選設定。
+    """
+    if 'include' in args or 'exclude' in args:
+        return split_keywords(args.get('include', '')), split_keywords(args.get('exclude', ''))
+    return effective_keywords(*KEYWORD_SETTINGS)
+
+def format_sse(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [''])
+    return "\n".join(lines) + "\n\n"
+
+@app.route('/api/numbers')
+def api_numbers():
+    """
+    以 JSON 回傳篩選後的號碼快照，支援分頁 (offset, limit)。
+    預設使用主頁面的篩選設定；也可以用 include/exclude 查詢參數 (逗號分隔) 指定關鍵字。
+    有 country 查詢參數時只回傳該國家的號碼 (預設為所有國家)。
+    帶上前一次回應的 cursor 作為 since 參數時，只回傳之後新增或變更的號碼 (附 new_smss) 與已移除的號碼網址；
+    游標失效時 reset 為 true 並回傳完整快照。
+    """
+    args = request.args
+    try:
+        offset = max(0, int(args.get('offset', 0)))
+        limit = min(max(1, int(args.get('limit', API_PAGE_SIZE))), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'error': 'offset and limit must be integers'}), 400
+
+    final_include, final_exclude = request_keywords(args)
+    country = args.get('country', '').lower() or None
+    # 先取游標再取資料：資料若在兩者之間更新，下次請求只會重複收到這些變化，不會漏掉
+    cursor = CHANGE_FEED.cursor
+    snapshot = SNAPSHOT
+    filtered_numbers = filtered_view(snapshot, final_include, final_exclude, country)
+
+    revision = CHANGE_FEED.parse_cursor(args['since']) if args.get('since') else None
+    removed = []
+    if revision is None:
+        entries = [public_number(item) for item in filtered_numbers]
+    else:
+        changed, removed = CHANGE_FEED.changes_since(filtered_numbers, revision)
+        entries = [dict(public_number(item), new_smss=new_smss) for item, new_smss in changed]
+        # 內容變更後不再符合篩選條件的號碼，對用戶端而言等同於被移除
+        kept = {entry['url'] for entry in entries}
+        removed += sorted(url for url in CHANGE_FEED.changed_urls_since(revision) if url not in kept)
+
+    end = offset + limit
+    return jsonify({
+        'cursor': cursor,
+        'reset': revision is None,
+        'timestamp': snapshot.timestamp,
+        'total': len(entries),
+        'offset': offset,
+        'limit': limit,
+        'next_offset': end if end < len(entries) else None,
+        'numbers': entries[offset:end],
+        'removed': removed if offset == 0 else [],
+    })
+
+@app.route('/events')
+def events():
+    """
+    以 Server-Sent Events 即時推送新增或變更的號碼 (numbers 事件，內容格式同 /api/numbers 的差異回應)。
+    關鍵字與國家的篩選條件同 /api/numbers；帶上 since=<cursor> (或重新連線時的 Last-Event-ID) 會先補送之後的變化，
+    游標失效時送出 reset 事件，用戶端應重新載入頁面。
+    """
+    final_include, final_exclude = request_keywords(request.args)
+    country = request.args.get('country', '').lower() or None
+    subscriber = BROADCASTER.subscribe(final_include, final_exclude, country)
+    if subscriber is None:
+        return Response(status=503, headers={'Retry-After': '30'})
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            if since:
+                revision = CHANGE_FEED.parse_cursor(since)
+                if revision is None:
+                    yield format_sse('reset', CHANGE_FEED.cursor)
+                    return
+                if revision < CHANGE_FEED.revision:
+                    cursor = CHANGE_FEED.cursor
+                    changes, removed = CHANGE_FEED.changes_since(SNAPSHOT.numbers or (), revision)
+                    data = subscriber.render(EventBroadcaster.make_batch(cursor, changes, removed, public_number))
+                    if data is not None:
+                        yield format_sse('numbers', data, cursor)
+            while not subscriber.closed:
+                try:
+                    cursor, data = subscriber.queue.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # 定期送出註解行，保持連線並偵測已斷線的用戶端
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse('numbers', data, cursor)
+        finally:
+            BROADCASTER.unsubscribe(subscriber)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+@app.route('/metrics')
+def metrics():
+    """
+    以 Prometheus 文字格式輸出爬蟲與網頁伺服器的指標。
+    """
+    if not METRICS_ENABLED:
+        return Response(status=404)
+    return Response(METRICS.render(), content_type=METRICS_CONTENT_TYPE)
+
+def load_warm_start(store):
+    """
+    從歷史資料庫載入上次的號碼快照，讓網頁與 API 在第一輪爬蟲完成前就有資料。
+    """
+    global SNAPSHOT
+    snapshot_numbers, snapshot_timestamp = store.load_snapshot()
+    if snapshot_numbers is None:
+        return
+    SNAPSHOT = Snapshot(snapshot_numbers, snapshot_timestamp, COUNTRY_CODE)
+    CHANGE_FEED.update(SNAPSHOT.numbers)
+    print(lang_dict['WARM_START_LOADED'].format(
+        count=len(snapshot_numbers),
+        time=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot_timestamp)),
+    ))
+
 @app.route('/test-ui')
 def test_ui():
     """
@@ -191,13 +557,12 @@ def test_ui():
         }
     ]
     
-    country_name_map = {'ca': 'Canada', 'us': 'United States', 'gb': 'United Kingdom'}
-    country_name = country_name_map.get(COUNTRY_CODE, COUNTRY_CODE.upper())
-
-    return render_template(
+    return conditional_page(make_etag(page_version(), 'test-ui'), ('test-ui',), lambda: render_template(
         'index.html',
         numbers=mock_sms_data,
-        country_name=country_name,
+        country_name=country_name(DEFAULT_COUNTRY),
+        country=DEFAULT_COUNTRY,
+        countries=[(code, country_name(code)) for code in COUNTRIES],
         last_updated="UI Test Mode",
         update_min=99,
         total_count=len(mock_sms_data),
@@ -205,10 +570,18 @@ def test_ui():
         initial_include=[],
         initial_exclude=[],
         initial_mode='none',
+        events_cursor=None,
         lang=lang_dict
-    )
+    ))
 
 if __name__ == '__main__':
+    # --- 讀取設定檔 ---
+    try:
+        configure()
+    except FileNotFoundError:
+        print(lang_dict['CONFIG_NOT_FOUND'])
+        sys.exit(1)
+
     parser = argparse.ArgumentParser(
         description="Temporary SMS Receiver and Monitor.",
         formatter_class=argparse.RawTextHelpFormatter
@@ -245,6 +618,11 @@ if __name__ == '__main__':
         action='store_true',
         help="Run in UI test mode. Starts the server without web scraping."
     )
+    parser.add_argument(
+        '--serve-only',
+        action='store_true',
+        help="Serve the dashboard and API from the saved snapshot without scraping (no Chrome needed)."
+    )
     args = parser.parse_args()
 
     # 語言設定應優先處理
@@ -256,6 +634,18 @@ if __name__ == '__main__':
         print("   Background scraping is DISABLED.")
         print(f"✅ Access the test page at: http://127.0.0.1:{PORT}/test-ui")
         print("="*60)
+    elif args.serve_only:
+        # 只提供網頁與 API，資料來自上次保存的快照，不啟動爬蟲與瀏覽器
+        if STORAGE_CONFIG.get('enabled', True):
+            SMS_STORE = SmsStore(
+                STORAGE_CONFIG.get('path', 'sms_history.sqlite3'),
+                message_bucket_seconds=STORAGE_CONFIG.get('message_bucket_seconds', 86400),
+            )
+            load_warm_start(SMS_STORE)
+        print("="*60)
+        print(lang_dict['SERVE_ONLY_MODE'])
+        print(lang_dict['LOCAL_URL'].format(port=PORT))
+        print("="*60)
     else:
         # --- 只有在非測試模式下才執行爬蟲和 ngrok 相關邏輯 ---
         NGROK_AUTH_TOKEN = args.ngrok_token
@@ -269,8 +659,16 @@ if __name__ == '__main__':
         }
         target_urls = url_map.get(args.web, BASE_URLS)
 
+        if STORAGE_CONFIG.get('enabled', True):
+            SMS_STORE = SmsStore(
+                STORAGE_CONFIG.get('path', 'sms_history.sqlite3'),
+                message_bucket_seconds=STORAGE_CONFIG.get('message_bucket_seconds', 86400),
+            )
+            load_warm_start(SMS_STORE)
+
+        from selenium.webdriver.chrome.service import Service
         print(lang_dict['CHECKING_DRIVER'])
-        CHROME_SERVICE = Service(ChromeDriverManager().install())
+        CHROME_SERVICE = Service(load_scraper().resolve_chromedriver(lang_dict))
         print(lang_dict['DRIVER_READY'])
 
         if not NGROK_AUTH_TOKEN:
@@ -290,12 +688,13 @@ if __name__ == '__main__':
         
         if NGROK_AUTH_TOKEN:
             try:
+                from pyngrok import ngrok
                 ngrok.set_auth_token(NGROK_AUTH_TOKEN)
                 public_url = ngrok.connect(PORT)
                 print("="*60)
                 print(lang_dict['APP_STARTING'])
                 print(lang_dict['TARGET_SITES'].format(urls=target_urls))
-                print(lang_dict['TARGET_COUNTRY'].format(country=COUNTRY_CODE))
+                print(lang_dict['TARGET_COUNTRY'].format(country=', '.join(COUNTRIES)))
                 print(lang_dict['LOCAL_URL'].format(port=PORT))
                 print(lang_dict['PUBLIC_URL'].format(url=public_url))
                 print("="*60)
@@ -310,7 +709,7 @@ if __name__ == '__main__':
             print("="*60)
             print(lang_dict['APP_STARTING_LOCAL'])
             print(lang_dict['TARGET_SITES'].format(urls=target_urls))
-            print(lang_dict['TARGET_COUNTRY'].format(country=COUNTRY_CODE))
+            print(lang_dict['TARGET_COUNTRY'].format(country=', '.join(COUNTRIES)))
             print(lang_dict['LOCAL_URL'].format(port=PORT))
             print("="*60)
             print(lang_dict['BACKGROUND_UPDATE_INFO'].format(minutes=CACHE_DURATION_MINUTES))
@@ -318,4 +717,5 @@ if __name__ == '__main__':
             print("="*60)        
     
     # --- Flask 伺服器在所有模式下都會啟動 ---
-    serve(app, host="0.0.0.0", port=PORT)
\ No newline at end of file
+    from waitress import serve
+    serve(app, host="0.0.0.0", port=PORT, threads=WEB_THREADS)
\ No newline at end of file
@@ -0,0 +1,178 @@
+# metrics.py
+import bisect
+import threading
+import time
+
+# Prometheus 文字格式 (exposition format 0.0.4) 的 Content-Type
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# 預設的直方圖區間 (秒)，涵蓋從解析一頁的毫秒級到整輪爬蟲的數分鐘
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """
+    只會增加的計數器。標籤值以位置參數傳入 (順序同 labelnames)，更新只需一次字典操作。
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield self.name, format_labels(self.labelnames, label_values), value
+
+
+class Gauge(Counter):
+    """
+    可任意設定的數值 (例如最近一輪找到的活躍號碼數)。
+    """
+
+    kind = 'gauge'
+
+    def set(self, *label_values, value):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class _Timer:
+    __slots__ = ('histogram', 'label_values', 'start')
+
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(*self.label_values, value=time.perf_counter() - self.start)
+
+
+class Histogram:
+    """
+    固定區間的直方圖；每個標籤組合只保存各區間的次數、總和與總數，輸出時才累加成 Prometheus 的累積區間。
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *label_values, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                # [各區間次數 (最後一格為 +Inf), 總和, 總數]
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, *label_values):
+        """
+        以 with 區塊計時並記錄耗時 (秒)。
+        """
+        return _Timer(self, label_values)
+
+    def count(self, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            return state[2] if state else 0
+
+    def total(self, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            return state[1] if state else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((label_values, (list(state[0]), state[1], state[2])) for label_values, state in self._values.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labelnames, label_values, extra=(('le', format_value(float(bound))),))
+                yield self.name + '_bucket', labels, cumulative
+            labels = format_labels(self.labelnames, label_values)
+            yield self.name + '_sum', labels, total
+            yield self.name + '_count', labels, count
+
+
+class MetricsRegistry:
+    """
+    保存所有指標，並以 Prometheus 文字格式輸出。同名指標只會建立一次，重複註冊時回傳既有的指標。
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# 爬蟲與網頁伺服器共用的預設登錄表 (/metrics 輸出的內容)
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,36 @@
+# page_parser.py
+import functools
+import importlib.util
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# 依優先順序排列的 BeautifulSoup 解析器：lxml 以 C 實作，速度快很多；未安裝時退回內建的 html.parser
+PARSER_BACKENDS = ('lxml', 'html.parser')
+
+
+def resolve_backend(name='auto'):
+    """
+    回傳實際可用的解析器名稱。name 為 'auto' 或指定的解析器未安裝時，依 PARSER_BACKENDS 的順序選擇。
+    """
+    candidates = PARSER_BACKENDS if name in (None, '', 'auto') else (name,) + PARSER_BACKENDS
+    for backend in candidates:
+        if backend == 'html.parser' or importlib.util.find_spec(backend) is not None:
+            return backend
+    return 'html.parser'
+
+@functools.lru_cache(maxsize=None)
+def subtree_strainer(tag, css_class):
+    """
+    只保留指定標籤與 class 的元素 (含其所有子元素) 的 SoupStrainer。
+    解析途中 class 屬性仍是未拆分的字串，因此以正規表達式比對其中的單一 class。
+    """
+    return SoupStrainer(tag, class_=re.compile(r'(?:^|\s)' + re.escape(css_class) + r'(?:\s|$)'))
+
+def parse_html(markup, backend='html.parser', only=None):
+    """
+    解析 HTML。only 為 (標籤名稱或 None, class) 時只建立符合的子樹，略過 head、script、導覽列等其他部分。
+    傳給 select() 的選擇器必須能在這些子樹內成立 (祖先元素需包含在 only 的範圍內)。
+    """
+    parse_only = subtree_strainer(*only) if only else None
+    return BeautifulSoup(markup, backend, parse_only=parse_only)
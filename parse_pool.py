@@ -0,0 +1,94 @@
+# parse_pool.py
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from page_parser import parse_html
+from row_extractor import extract_rows_from_soup
+
+
+def parse_message_rows(markup, backend, only, spec, expected_selector=None):
+    """
+    解析號碼頁面並只回傳訊息列 (格式見 row_extractor)；頁面缺少 expected_selector 時回傳 None。
+    在解析工作程序中執行時，只有結構化的訊息列會被傳回主程序。
+    """
+    soup = parse_html(markup, backend, only)
+    if expected_selector and soup.select_one(expected_selector) is None:
+        return None
+    return extract_rows_from_soup(soup, spec)
+
+def start_method():
+    """
+    主程序中有許多操作瀏覽器的執行緒，直接 fork 可能複製到被鎖住的狀態，因此優先使用 forkserver，其次是 spawn。
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return 'forkserver' if 'forkserver' in methods else 'spawn'
+
+
+class ParsePool:
+    """
+    解析用的程序池：讓操作瀏覽器的執行緒不必在 GIL 下執行 BeautifulSoup，解析的 CPU 可以分散到多個核心。
+    工作程序在第一次使用時才啟動。工作程序意外結束時會重建程序池，無法建立程序池時則改在呼叫端的執行緒中解析，
+    每次改為就地解析都會呼叫 on_fallback(例外)。
+    """
+
+    def __init__(self, workers, on_fallback=None):
+        self.workers = max(1, int(workers))
+        self.on_fallback = on_fallback
+        self._executor = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and not self._disabled:
+                try:
+                    context = multiprocessing.get_context(start_method())
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                except (OSError, ValueError, NotImplementedError) as e:
+                    self._disabled = True
+                    self._fallback(e)
+            return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fallback(self, error):
+        if self.on_fallback is not None:
+            self.on_fallback(error)
+
+    def run(self, func, *args):
+        """
+        在工作程序中執行 func(*args) 並回傳結果；func 本身拋出的例外照常傳回呼叫端。
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        try:
+            future = executor.submit(func, *args)
+        except OSError as e:
+            # 無法啟動工作程序 (例如資源不足)，之後都改為就地解析
+            self._disabled = True
+            self._discard(executor)
+            self._fallback(e)
+            return func(*args)
+        except (BrokenProcessPool, RuntimeError) as e:
+            self._discard(executor)
+            self._fallback(e)
+            return func(*args)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            self._discard(executor)
+            self._fallback(e)
+            return func(*args)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,48 @@
+# readiness.py
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+# 一次往返同時取得目標元素數量與文件載入狀態
+_PROBE_SCRIPT = "return [document.querySelectorAll(arguments[0]).length, document.readyState];"
+
+
+class ReadinessStrategy:
+    """
+    自適應的頁面就緒偵測：等待目標元素出現，且其數量在 quiet_period 秒內不再變化，
+    取代 WebDriverWait 之後固定的 time.sleep()。
+    """
+
+    def __init__(self, selector, timeout=10, quiet_period=0.5, poll_interval=0.1, min_rows=1,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.selector = selector
+        self.timeout = timeout
+        self.quiet_period = quiet_period
+        self.poll_interval = poll_interval
+        self.min_rows = min_rows
+        self._clock = clock
+        self._sleep = sleep
+
+    def wait(self, driver):
+        """
+        阻塞直到頁面就緒並回傳元素數量。逾時仍未出現任何元素時拋出 TimeoutException；
+        若元素已出現但仍在變化，逾時後照常回傳目前的數量。
+        """
+        deadline = self._clock() + self.timeout
+        last_count = -1
+        stable_since = None
+        while True:
+            count, ready_state = driver.execute_script(_PROBE_SCRIPT, self.selector)
+            now = self._clock()
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif (count >= self.min_rows
+                  and ready_state != 'loading'
+                  and now - stable_since >= self.quiet_period):
+                return count
+            if now >= deadline:
+                if count >= self.min_rows:
+                    return count
+                raise TimeoutException(f"no element matched '{self.selector}' within {self.timeout}s")
+            self._sleep(self.poll_interval)
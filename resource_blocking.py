@@ -0,0 +1,109 @@
+# resource_blocking.py
+import json
+import threading
+import weakref
+
+# 預設攔截的資源：圖片、字型、樣式表、影音與常見的分析/廣告網域 (Chrome 的 setBlockedURLs 萬用字元格式)。
+# 不攔截一般的 JavaScript，以免影響需要腳本渲染的頁面與 Cloudflare 驗證。
+DEFAULT_BLOCKED_URLS = (
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*',
+    '*.woff*', '*.ttf*', '*.otf*', '*.eot*',
+    '*.css*',
+    '*.mp4*', '*.webm*', '*.m3u8*',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*adservice.google.*', '*facebook.net*', '*hotjar.com*',
+)
+# 讓 Chrome 不載入任何圖片的偏好設定
+DISABLE_IMAGES_PREFS = {'profile.managed_default_content_settings.images': 2}
+
+
+def configure_options(options, disable_images=True):
+    """
+    在 ChromeOptions 上加入資源攔截所需的設定 (停用圖片)。
+    """
+    if disable_images:
+        options.add_experimental_option('prefs', dict(DISABLE_IMAGES_PREFS))
+    return options
+
+def enable_network_log(options):
+    """
+    開啟只記錄網路事件的效能日誌，供 ResourceBlocker.page_stats() 統計請求數與傳輸量。
+    與是否攔截資源無關，關閉攔截時也要開啟，才能量測攔截前的基準。
+    """
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    return options
+
+def summarize_network_log(entries):
+    """
+    彙總 Chrome 效能日誌中的網路事件，回傳 {'requests': 發出的請求數, 'blocked': 被攔截的請求數, 'bytes': 實際傳輸的位元組數}。
+    """
+    requests = blocked = transferred = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            requests += 1
+        elif method == 'Network.loadingFinished':
+            transferred += params.get('encodedDataLength', 0) or 0
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            blocked += 1
+    return {'requests': requests, 'blocked': blocked, 'bytes': int(transferred)}
+
+
+class ResourceBlocker:
+    """
+    以 CDP 的 Network.setBlockedURLs 在瀏覽器層攔截不需要的資源。共用池中的瀏覽器會輪流載入不同網站，
+    因此每次載入頁面前呼叫 apply()，只有攔截清單與該瀏覽器上次的設定不同時才送出 CDP 指令。
+    不支援 CDP 的 WebDriver (例如基準測試的 HttpPageDriver) 會直接略過。
+    """
+
+    def __init__(self, measure=True):
+        self.measure = measure
+        self._applied = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def apply(self, driver, patterns):
+        """
+        在載入頁面前設定此瀏覽器要攔截的網址，並清掉先前頁面留下的網路日誌。
+        """
+        execute = getattr(driver, 'execute_cdp_cmd', None)
+        if execute is None:
+            return
+        patterns = tuple(patterns)
+        with self._lock:
+            previous = self._applied.get(driver)
+        if previous != patterns and (patterns or previous):
+            try:
+                if previous is None:
+                    execute('Network.enable', {})
+                execute('Network.setBlockedURLs', {'urls': list(patterns)})
+            except Exception:
+                pass
+        with self._lock:
+            self._applied[driver] = patterns
+        if self.measure:
+            self._read_log(driver)
+
+    def page_stats(self, driver):
+        """
+        回傳自上次 apply() 以來載入的頁面的網路統計 (見 summarize_network_log)；未啟用或無法讀取效能日誌時回傳 None。
+        """
+        if not self.measure:
+            return None
+        entries = self._read_log(driver)
+        return None if entries is None else summarize_network_log(entries)
+
+    @staticmethod
+    def _read_log(driver):
+        get_log = getattr(driver, 'get_log', None)
+        if get_log is None:
+            return None
+        try:
+            return get_log('performance')
+        except Exception:
+            return None
@@ -0,0 +1,56 @@
+# retry_policy.py
+import random
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+
+class RetryableError(Exception):
+    """
+    可以重試的錯誤，例如頁面尚未出現預期內容。
+    """
+
+
+class ChallengePageError(RetryableError):
+    """
+    遇到 Cloudflare 等人機驗證頁面。
+    """
+
+
+class RetryPolicy:
+    """
+    可重複使用的重試策略：成功即停止，只重試可重試的錯誤，並以指數退避加上隨機抖動等待。
+    """
+
+    def __init__(self, max_attempts=1, base_delay=1.0, max_delay=30.0, jitter=0.5,
+                 retry_on=(TimeoutException, RetryableError), sleep=time.sleep, rng=random.random):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self._sleep = sleep
+        self._rng = rng
+
+    def delay(self, attempt):
+        """
+        第 attempt 次失敗後的等待秒數：base_delay * 2^(attempt-1)，上限 max_delay，再隨機縮減最多 jitter 比例。
+        """
+        capped = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return capped * (1 - self.jitter * self._rng())
+
+    def run(self, func, on_retry=None):
+        """
+        執行 func(attempt) 直到成功或用完重試次數。不可重試的錯誤會立即拋出；
+        on_retry(attempt, error, delay) 會在每次重試前被呼叫。
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return func(attempt)
+            except self.retry_on as e:
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.delay(attempt)
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                self._sleep(delay)
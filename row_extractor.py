@@ -0,0 +1,51 @@
+# row_extractor.py
+import json
+
+# 在頁面中執行：依 arguments[0] 找出每一列，再以 arguments[1] 的 {欄位: 選擇器} 取出各欄位文字，
+# 只把結構化的結果以 JSON 字串傳回，不必傳送整個 page_source。
+# 文字的取法與 BeautifulSoup 的 get_text(strip=True) 相同：每段文字去除前後空白後直接相連。
+EXTRACT_ROWS_SCRIPT = """
+const fields = Object.entries(arguments[1]);
+function stripText(element) {
+    const parts = [];
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const text = walker.currentNode.nodeValue.trim();
+        if (text) {
+            parts.push(text);
+        }
+    }
+    return parts.join('');
+}
+const rows = [];
+for (const row of document.querySelectorAll(arguments[0])) {
+    const item = {};
+    for (const [name, selector] of fields) {
+        const element = row.querySelector(selector);
+        item[name] = element ? stripText(element) : null;
+    }
+    rows.push(item);
+}
+return JSON.stringify(rows);
+"""
+
+
+def extract_rows_from_soup(soup, spec):
+    """
+    從已解析的頁面取出訊息列，回傳 [{欄位: 文字或 None}, ...]，格式與 extract_rows_in_browser 相同。
+    spec 為 {'rows': 列選擇器, 'fields': {欄位: 選擇器}}。
+    """
+    rows = []
+    for row in soup.select(spec['rows']):
+        item = {}
+        for name, selector in spec['fields'].items():
+            element = row.select_one(selector)
+            item[name] = element.get_text(strip=True) if element is not None else None
+        rows.append(item)
+    return rows
+
+def extract_rows_in_browser(driver, spec):
+    """
+    在瀏覽器中執行 EXTRACT_ROWS_SCRIPT，只取回訊息列的結構化資料。
+    """
+    return json.loads(driver.execute_script(EXTRACT_ROWS_SCRIPT, spec['rows'], spec['fields']))
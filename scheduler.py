@@ -0,0 +1,135 @@
+# scheduler.py
+import heapq
+import itertools
+import threading
+import time
+
+
+class PollScheduler:
+    """
+    以優先佇列 (heap) 為每個號碼安排下一次檢查時間：
+    經常收到簡訊的號碼依觀察到的訊息頻率縮短間隔，沒有變化或不活躍的號碼則指數退避；
+    所有檢查共用一個每分鐘頁面數的預算 (token bucket)。
+    """
+
+    def __init__(self, min_interval=60, active_max_interval=600, max_interval=3600,
+                 backoff_factor=2.0, pages_per_minute=30, clock=time.time):
+        self.min_interval = min_interval
+        self.active_max_interval = active_max_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.pages_per_minute = max(1, pages_per_minute)
+        self._clock = clock
+        self._heap = []
+        self._entries = {}
+        self._seq = itertools.count()
+        self._tokens = float(pages_per_minute)
+        self._tokens_at = clock()
+        self._lock = threading.Lock()
+
+    def sync(self, group, payloads):
+        """
+        以某個網站 (group) 最新的號碼列表更新排程：加入新號碼，移除已不在列表上的號碼。
+        """
+        now = self._clock()
+        keys = set()
+        with self._lock:
+            for payload in payloads:
+                key = payload['url']
+                keys.add(key)
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = {'group': group, 'interval': self.min_interval, 'last_change': None, 'gap': None}
+                    self._entries[key] = entry
+                    self._push(key, entry, now + self.min_interval)
+                entry['payload'] = payload
+            for key in [k for k, e in self._entries.items() if e['group'] == group and k not in keys]:
+                del self._entries[key]
+
+    def payloads(self, group):
+        """
+        回傳某個網站 (group) 目前排程中的號碼 (上次 sync 時的 payload)。
+        """
+        with self._lock:
+            return [entry['payload'] for entry in self._entries.values() if entry['group'] == group]
+
+    def observe(self, key, active, changed):
+        """
+        依一次成功檢查的結果重新計算該號碼的間隔：
+        有新簡訊時以訊息間隔的平滑平均估計頻率；沒有變化或不活躍時則乘上 backoff_factor。
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if active and changed:
+                if entry['last_change'] is not None:
+                    gap = now - entry['last_change']
+                    entry['gap'] = gap if entry['gap'] is None else 0.5 * entry['gap'] + 0.5 * gap
+                entry['last_change'] = now
+                estimate = entry['gap'] / 2 if entry['gap'] is not None else self.min_interval
+                interval = min(max(estimate, self.min_interval), self.active_max_interval)
+            elif active:
+                interval = min(entry['interval'] * self.backoff_factor, self.active_max_interval)
+            else:
+                interval = min(entry['interval'] * self.backoff_factor, self.max_interval)
+            entry['interval'] = max(interval, self.min_interval)
+            self._push(key, entry, now + entry['interval'])
+
+    def charge(self, pages):
+        """
+        從預算扣除其他流程 (例如完整更新) 已經載入的頁面數，預算可以暫時為負。
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= pages
+
+    def pop_due(self, limit):
+        """
+        取出最多 limit 個已到期的號碼 (受頁面預算限制)。取出的號碼會先以目前的間隔暫時排定下一次，
+        檢查成功後 observe() 會再重新計算；檢查失敗則維持暫定的時間。
+        """
+        now = self._clock()
+        due = []
+        with self._lock:
+            self._refill(now)
+            while self._heap and len(due) < limit and self._tokens >= 1:
+                at, _, key = self._heap[0]
+                entry = self._entries.get(key)
+                if entry is None or entry['due'] != at:
+                    heapq.heappop(self._heap)
+                    continue
+                if at > now:
+                    break
+                heapq.heappop(self._heap)
+                self._tokens -= 1
+                due.append(entry['payload'])
+                self._push(key, entry, now + entry['interval'])
+        return due
+
+    def seconds_until_due(self):
+        """
+        距離下一個號碼到期 (且預算足夠) 還有幾秒；沒有任何排程時回傳 None。
+        """
+        now = self._clock()
+        with self._lock:
+            while self._heap:
+                at, _, key = self._heap[0]
+                entry = self._entries.get(key)
+                if entry is None or entry['due'] != at:
+                    heapq.heappop(self._heap)
+                    continue
+                self._refill(now)
+                token_wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) * 60.0 / self.pages_per_minute
+                return max(at - now, token_wait, 0.0)
+        return None
+
+    def _push(self, key, entry, at):
+        entry['due'] = at
+        heapq.heappush(self._heap, (at, next(self._seq), key))
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._tokens_at)
+        self._tokens = min(float(self.pages_per_minute), self._tokens + elapsed * self.pages_per_minute / 60.0)
+        self._tokens_at = now
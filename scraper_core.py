@@ -1,84 +1,719 @@
 # --- Selenium 相關匯入 ---
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 # 📌 優化：webdriver_manager 將只在主程式啟動時呼叫一次。
-from selenium.common.exceptions import WebDriverException
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import tomli
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import atexit
+import threading
 import time
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 import re
-from bs4 import BeautifulSoup
 import os
 import requests
 import zipfile
 import io
+import shutil
+from countries import country_code as country_code_for_name, country_slug
+from artifact_cache import ArtifactCache, IntegrityError, detect_chrome_version, major_version
+from driver_pool import DriverPool
+from http_fetcher import HttpFetcher, FetchStats, looks_like_challenge
+from site_registry import SiteAdapter, SiteRegistry
+from retry_policy import ChallengePageError, RetryPolicy, RetryableError
+from incremental import IncrementalRefresher
+from scheduler import PollScheduler
+from page_parser import parse_html, resolve_backend
+from parse_pool import ParsePool, parse_message_rows
+from row_extractor import extract_rows_in_browser
+from keyword_matcher import normalize_sms_text
+from metrics import REGISTRY
+from resource_blocking import DEFAULT_BLOCKED_URLS, ResourceBlocker, configure_options, enable_network_log
+from settings import load_config
+from tracing import TRACER
 
-# --- 讀取設定檔 ---
-# 注意：配置檔案在運行期間不會自動熱更新，如需修改請重啟程式。
-with open("config.toml", "rb") as f:
-    config = tomli.load(f)
-
-# --- 全域設定 ---
-general_config = config['general']
-COUNTRY_CODE = general_config['country_code']
-CACHE_DURATION_SECONDS = general_config['cache_duration_seconds']
-CACHE_DURATION_MINUTES = int(CACHE_DURATION_SECONDS / 60) 
-MAX_WORKERS = general_config['max_workers']
-PAGE_INDEX = general_config['page_index']
-PORT = general_config['port']
-KEYWORDS_CONFIG = config['keywords']
-HEADERS = config['headers']
+# --- HTML 解析設定 ---
+# 各頁面只需解析的子樹 (標籤, class)；選擇器的祖先元素都包含在子樹內
+PARSE_TARGETS = {
+    'freereceivesms_list': (None, 'number-boxes-item'),
+    'freereceivesms_number': ('div', 'container'),
+    'receivesmss_list': (None, 'number-boxes'),
+    'receivesmss_number': ('div', 'border-bottom'),
+    'tempnumber_list': ('a', 'country-link'),
+    'tempnumber_number': ('div', 'direct-chat-msg'),
+}
+# 各網站號碼頁面的訊息列選擇器與每列要取出的欄位
+MESSAGE_ROW_SPECS = {
+    'freereceivesms': {
+        'rows': '.container .row.border-bottom',
+        'fields': {
+            'time_lg': '.d-none.d-lg-block.col-lg-2 span',
+            'time_sm': '.d-block.d-lg-none.ml-2',
+            'text': '.col-lg-8 div',
+        },
+    },
+    'receivesmss': {
+        'rows': 'div.row.border-bottom.py-2',
+        'fields': {'time': 'div.col-md-2.text-right span.text-muted', 'text': 'div.col-md-8'},
+    },
+    'tempnumber': {
+        'rows': 'div.direct-chat-msg',
+        'fields': {'time': 'time.direct-chat-timestamp', 'text': 'div.direct-chat-text'},
+    },
+}
+
+# --- 由設定檔決定的全域設定 ---
+# 匯入本模組時不讀取設定檔：下列設定與共用物件 (HTTP 快速路徑、增量更新、輪詢排程、解析程序池、資源攔截、
+# 檔案快取與網站登錄表) 都由 configure() 建立，開始爬蟲前需先呼叫一次 (main 啟動爬蟲時、基準測試與測試)。
+CONFIGURED = False
+
+def configure(new_config=None):
+    """
+    套用設定 (未指定時讀取 config.toml) 到本模組的全域設定並建立共用物件；重複呼叫時以新的設定取代。
+    """
+    global config, CONFIGURED, COUNTRY_CODE, MAX_WORKERS, PAGE_INDEX, COUNTRIES, PAGES, LIST_CONCURRENCY
+    global SITE_TIMEOUT_SECONDS, HEADERS, DRIVER_POOL_SIZE, DRIVER_MAX_PAGES, DRIVER_CHECKOUT_TIMEOUT
+    global HTTP_FETCHER, REFRESHER, SCHEDULER, PARSER_BACKEND, PARSE_TARGETED, EXTRACT_IN_BROWSER
+    global PARSE_WORKERS, PARSE_POOL, SITES_CONFIG, BLOCKING_ENABLED, BLOCK_IMAGES, BLOCKED_URLS, RESOURCE_BLOCKER
+    global ARTIFACT_CACHE, ARTIFACTS_OFFLINE, CHROME_BINARY, SITE_REGISTRY
+    config = load_config() if new_config is None else new_config
+
+    general_config = config['general']
+    COUNTRY_CODE = general_config['country_code']
+    MAX_WORKERS = general_config['max_workers']
+    PAGE_INDEX = general_config['page_index']
+    # 要爬取的國家與列表頁碼 (未設定時只爬 country_code 的第 page_index 頁)，各網站可在 [sites.<網站>] 覆寫
+    COUNTRIES = [code.lower() for code in general_config.get('countries') or [COUNTRY_CODE]]
+    PAGES = list(general_config.get('pages') or [PAGE_INDEX])
+    # 每個網站同時載入的列表頁數上限
+    LIST_CONCURRENCY = general_config.get('list_concurrency', 4)
+    SITE_TIMEOUT_SECONDS = general_config.get('site_timeout_seconds', 1200)
+    HEADERS = config['headers']
+
+    # --- WebDriver 池設定 ---
+    driver_pool_config = config.get('driver_pool', {})
+    # 所有網站併發爬取時共用同一個池，因此池大小不超過 max_workers，以限制 Chrome 程序總數
+    DRIVER_POOL_SIZE = min(driver_pool_config.get('size', MAX_WORKERS), MAX_WORKERS)
+    DRIVER_MAX_PAGES = driver_pool_config.get('max_pages_per_driver', 50)
+    DRIVER_CHECKOUT_TIMEOUT = driver_pool_config.get('checkout_timeout_seconds', 300)
+
+    # --- 純 HTTP 快速路徑設定 ---
+    http_config = config.get('http', {})
+    HTTP_FETCHER = HttpFetcher(
+        HEADERS,
+        timeout=http_config.get('timeout_seconds', 15),
+        pool_maxsize=http_config.get('pool_maxsize', MAX_WORKERS),
+    ) if http_config.get('enabled', True) else None
+
+    # --- 增量更新設定 ---
+    incremental_config = config.get('incremental', {})
+    REFRESHER = IncrementalRefresher(
+        active_max_age=incremental_config.get('active_max_age_seconds', 900),
+        inactive_max_age=incremental_config.get('inactive_max_age_seconds', 5400),
+    ) if incremental_config.get('enabled', True) else None
+
+    # --- 逐號碼自適應輪詢設定 ---
+    scheduler_config = config.get('scheduler', {})
+    SCHEDULER = PollScheduler(
+        min_interval=scheduler_config.get('min_interval_seconds', 60),
+        active_max_interval=scheduler_config.get('active_max_interval_seconds', 600),
+        max_interval=scheduler_config.get('max_interval_seconds', 3600),
+        backoff_factor=scheduler_config.get('backoff_factor', 2.0),
+        pages_per_minute=scheduler_config.get('pages_per_minute', 30),
+    ) if scheduler_config.get('enabled', True) else None
+
+    # --- HTML 解析設定 ---
+    parser_config = config.get('parser', {})
+    PARSER_BACKEND = resolve_backend(parser_config.get('backend', 'auto'))
+    PARSE_TARGETED = parser_config.get('targeted', True)
+    # 以瀏覽器載入號碼頁面時，直接在頁面中執行腳本取出訊息列，不傳送與解析整個 page_source
+    EXTRACT_IN_BROWSER = parser_config.get('extract_in_browser', True)
+    # 號碼頁面交給幾個解析工作程序處理 (0 代表在爬蟲執行緒中就地解析)
+    PARSE_WORKERS = parser_config.get('process_workers', 0)
+    close_parse_pool()
+    PARSE_POOL = ParsePool(PARSE_WORKERS, on_fallback=lambda e: PARSE_FALLBACKS.inc()) if PARSE_WORKERS > 0 else None
+
+    # --- 各網站個別設定 ([sites.<網站>]) ---
+    SITES_CONFIG = config.get('sites', {})
+
+    # --- 瀏覽器層的資源攔截 (CDP Network.setBlockedURLs) ---
+    blocking_config = config.get('blocking', {})
+    BLOCKING_ENABLED = blocking_config.get('enabled', True)
+    BLOCK_IMAGES = blocking_config.get('disable_images', True)
+    BLOCKED_URLS = tuple(blocking_config.get('urls', DEFAULT_BLOCKED_URLS)) if BLOCKING_ENABLED else ()
+    RESOURCE_BLOCKER = ResourceBlocker(measure=blocking_config.get('measure', True))
+
+    # --- 各階段耗時的追蹤 (JSON lines，可用 `python -m tracing summary` 彙總) ---
+    tracing_config = config.get('tracing', {})
+    if tracing_config.get('enabled', False):
+        TRACER.configure(
+            tracing_config.get('path', 'traces.jsonl'),
+            sample_rate=tracing_config.get('sample_rate', 1.0),
+            max_bytes=tracing_config.get('max_bytes', 10 * 1024 * 1024),
+            backup_count=tracing_config.get('backup_count', 3),
+        )
+    else:
+        TRACER.close()
+
+    # --- 本機檔案快取 (chromedriver 與廣告攔截外掛) ---
+    artifacts_config = config.get('artifacts', {})
+    ARTIFACT_CACHE = ArtifactCache(artifacts_config.get('cache_dir', 'artifacts'))
+    # 離線模式：只使用快取，不連網下載
+    ARTIFACTS_OFFLINE = artifacts_config.get('offline', False)
+    # 偵測 Chrome 版本時使用的執行檔 (空字串代表自動尋找)
+    CHROME_BINARY = artifacts_config.get('chrome_binary', '')
+
+    # 網域 → 網站介面的登錄表，依 [sites.<網站>] 覆寫各網站的預設值
+    registry = SiteRegistry()
+    for definition in SITE_DEFINITIONS:
+        registry.register(build_site(*definition))
+    SITE_REGISTRY = registry
+    CONFIGURED = True
+
+# --- 指標 (由 main.py 的 /metrics 輸出) ---
+PAGE_LOAD_SECONDS = REGISTRY.histogram('smscatcher_page_load_seconds', 'Time to fetch a page, by site and path (http or selenium).', ('site', 'path'))
+PAGE_WAIT_SECONDS = REGISTRY.histogram('smscatcher_page_wait_seconds', 'Time spent waiting for a page to be ready in the browser.', ('site',))
+PARSE_SECONDS = REGISTRY.histogram('smscatcher_parse_seconds', 'Time to parse a page, by parse target.', ('target',))
+NUMBER_CHECKS = REGISTRY.counter('smscatcher_number_checks_total', 'Number page checks, by site and outcome (active, inactive or error).', ('site', 'outcome'))
+SITE_SCRAPES = REGISTRY.counter('smscatcher_site_scrapes_total', 'Full site scrapes, by site and outcome (success or failure).', ('site', 'outcome'))
+ACTIVE_NUMBERS = REGISTRY.gauge('smscatcher_active_numbers', 'Active numbers found by the latest scrape of each site.', ('site',))
+CYCLE_SECONDS = REGISTRY.histogram('smscatcher_cycle_seconds', 'Duration of a full scrape of all sites.')
+PARSE_FALLBACKS = REGISTRY.counter('smscatcher_parse_pool_fallbacks_total', 'Pages parsed inline because the parser process pool was unavailable.')
+PAGE_REQUESTS = REGISTRY.histogram('smscatcher_page_requests', 'Network requests issued per browser page load, by site.', ('site',),
+                                   buckets=(1, 5, 10, 25, 50, 100, 200, 400))
+PAGE_BLOCKED_REQUESTS = REGISTRY.histogram('smscatcher_page_blocked_requests', 'Requests blocked per browser page load (requests saved), by site.', ('site',),
+                                           buckets=(0, 1, 5, 10, 25, 50, 100, 200))
+PAGE_BYTES = REGISTRY.histogram('smscatcher_page_bytes', 'Bytes transferred per browser page load, by site.', ('site',),
+                                buckets=(10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6))
+
+FETCH_STATS = FetchStats()
+
+# --- 解析程序池 (只處理號碼頁面的訊息列；列表頁仍在爬蟲執行緒中解析)，由 configure() 依 [parser] 建立 ---
+PARSE_POOL = None
+
+def close_parse_pool():
+    if PARSE_POOL is not None:
+        PARSE_POOL.close()
+
+atexit.register(close_parse_pool)
+
+# 各網站在其爬蟲函式定義之後以 register_site() 登錄的定義；configure() 依設定由此建立 SITE_REGISTRY
+SITE_DEFINITIONS = []
+# 網域 → 網站介面的登錄表 (configure() 之前是空的)
+SITE_REGISTRY = SiteRegistry()
+
+def register_site(key, domain, source, list_numbers, check_number, is_recent, **defaults):
+    """
+    登錄一個網站；defaults 為此網站的預設併發上限 (未指定時為 max_workers) 與逾時，可由 [sites.<key>] 覆寫。
+    已套用設定時立即加入 SITE_REGISTRY，否則在 configure() 時建立。
+    """
+    definition = (key, domain, source, list_numbers, check_number, is_recent, defaults)
+    SITE_DEFINITIONS.append(definition)
+    if CONFIGURED:
+        SITE_REGISTRY.register(build_site(*definition))
+
+def build_site(key, domain, source, list_numbers, check_number, is_recent, defaults):
+    """
+    依目前的設定建立網站介面：[sites.<key>] 的設定優先於 register_site() 傳入的預設值。
+    """
+    site_config = SITES_CONFIG.get(key, {})
+    overrides = {
+        'countries': [code.lower() for code in site_config['countries']] if site_config.get('countries') else None,
+        'pages': site_config.get('pages') or None,
+        'max_concurrency': site_config.get('max_concurrency'),
+        'page_load_timeout': site_config.get('page_load_timeout_seconds'),
+        'wait_timeout': site_config.get('wait_timeout_seconds'),
+        'list_page_load_timeout': site_config.get('list_page_load_timeout_seconds'),
+        'list_wait_timeout': site_config.get('list_wait_timeout_seconds'),
+        'readiness_quiet': site_config.get('readiness_quiet_seconds'),
+        'readiness_poll': site_config.get('readiness_poll_seconds'),
+        'blocked_urls': site_config.get('blocked_urls') if BLOCKING_ENABLED else None,
+    }
+    options = dict(defaults)
+    options.setdefault('max_concurrency', MAX_WORKERS)
+    options.setdefault('blocked_urls', BLOCKED_URLS)
+    options.update({name: value for name, value in overrides.items() if value is not None})
+    return SiteAdapter(key, domain, source, list_numbers, instrument_check(key, check_number), is_recent, **options)
+
+def instrument_check(site, check_number):
+    """
+    包裝號碼檢查函式：以 'check' 追蹤整個檢查 (各階段為其子區段)，並依結果累計 NUMBER_CHECKS。
+    沒有呼叫 record_number_check 的檢查 (讀取失敗) 記為 error。
+    """
+    def check(number_info, *args):
+        with TRACER.trace('check', site=site, number=number_info.get('number')) as span:
+            checked_before = number_info.get('last_checked')
+            result = check_number(number_info, *args)
+            if number_info.get('last_checked') == checked_before:
+                outcome = 'error'
+            else:
+                outcome = 'active' if result else 'inactive'
+            span.set(outcome=outcome)
+        NUMBER_CHECKS.inc(site, outcome)
+        return result
+    return check
+
+# --- 本機檔案快取 (chromedriver 與廣告攔截外掛)，快取目錄與離線模式由 configure() 依 [artifacts] 設定 ---
+CHROMEDRIVER_NAME = 'chromedriver.exe' if os.name == 'nt' else 'chromedriver'
 
 # --- 廣告攔截外掛設定 ---
-UBLOCK_URL = "https://github.com/gorhill/uBlock/releases/download/1.57.2/uBlock0_1.57.2.chromium.zip"
+UBLOCK_VERSION = "1.57.2"
+UBLOCK_URL = f"https://github.com/gorhill/uBlock/releases/download/{UBLOCK_VERSION}/uBlock0_{UBLOCK_VERSION}.chromium.zip"
+# 舊版本安裝外掛的位置；存在時會直接匯入快取，不必重新下載
 EXTENSION_PATH = os.path.join(os.getcwd(), "extensions", "ublock_origin")
 
+def cached_artifact(name, key, lang_dict):
+    """
+    從快取取得通過完整性檢查的項目目錄；不存在時回傳 None，檢查失敗的項目會被刪除以便重新下載。
+    """
+    try:
+        return ARTIFACT_CACHE.get(name, key)
+    except IntegrityError as e:
+        print(lang_dict['ARTIFACT_INTEGRITY_FAIL'].format(e=e))
+        ARTIFACT_CACHE.remove(name, key)
+        return None
+
+def resolve_chromedriver(lang_dict):
+    """
+    回傳與已安裝 Chrome 主版本相符的 chromedriver 路徑：優先使用本機快取，
+    只有快取中沒有這個版本時才透過 webdriver_manager 下載並存入快取。
+    偵測不到 Chrome 版本時使用快取中最新的 chromedriver；下載失敗時也會退回快取中的其他版本。
+    """
+    chrome_version = detect_chrome_version(CHROME_BINARY or None)
+    key = major_version(chrome_version)
+    for candidate in [key] if key else ARTIFACT_CACHE.keys('chromedriver')[:1]:
+        path = cached_artifact('chromedriver', candidate, lang_dict)
+        if path is not None:
+            print(lang_dict['DRIVER_CACHE_HIT'].format(version=chrome_version or candidate, path=path))
+            return os.path.join(path, CHROMEDRIVER_NAME)
+
+    if ARTIFACTS_OFFLINE:
+        raise RuntimeError(lang_dict['ARTIFACT_OFFLINE_MISSING'].format(name='chromedriver', key=key))
+    print(lang_dict['DRIVER_CACHE_MISS'].format(version=chrome_version))
+    from webdriver_manager.chrome import ChromeDriverManager
+    try:
+        downloaded = ChromeDriverManager().install()
+    except Exception as e:
+        for candidate in ARTIFACT_CACHE.keys('chromedriver'):
+            path = cached_artifact('chromedriver', candidate, lang_dict)
+            if path is not None:
+                print(lang_dict['DRIVER_CACHE_FALLBACK'].format(e=e, path=path))
+                return os.path.join(path, CHROMEDRIVER_NAME)
+        raise
+    path = ARTIFACT_CACHE.put(
+        'chromedriver', key or 'unknown',
+        lambda staging: shutil.copy2(downloaded, os.path.join(staging, CHROMEDRIVER_NAME)),
+        source=downloaded,
+    )
+    return os.path.join(path, CHROMEDRIVER_NAME)
+
+def extension_root(path):
+    """
+    回傳含有外掛 manifest.json 的目錄 (壓縮檔中的外掛可能位於一層子目錄內)。
+    """
+    if os.path.isfile(os.path.join(path, 'manifest.json')):
+        return path
+    for entry in sorted(os.listdir(path)):
+        candidate = os.path.join(path, entry)
+        if os.path.isfile(os.path.join(candidate, 'manifest.json')):
+            return candidate
+    return path
+
 def setup_adblocker(lang_dict):
     """
-    檢查、下載並解壓縮 uBlock Origin 廣告攔截外掛。
+    從快取取得此版本的 uBlock Origin 廣告攔截外掛，沒有時才下載並解壓縮到快取。
+    回傳外掛目錄；無法取得時回傳 None。
     """
-    if os.path.isdir(EXTENSION_PATH):
-        return
-    
+    path = cached_artifact('ublock_origin', UBLOCK_VERSION, lang_dict)
+    if path is None and os.path.isdir(EXTENSION_PATH):
+        path = ARTIFACT_CACHE.put(
+            'ublock_origin', UBLOCK_VERSION,
+            lambda staging: shutil.copytree(EXTENSION_PATH, staging, dirs_exist_ok=True),
+            source=EXTENSION_PATH,
+        )
+    if path is not None:
+        return extension_root(path)
+    if ARTIFACTS_OFFLINE:
+        print(lang_dict['ARTIFACT_OFFLINE_MISSING'].format(name='ublock_origin', key=UBLOCK_VERSION))
+        return None
+
     print(lang_dict['ADBLOCK_MISSING'])
     try:
-        r = requests.get(UBLOCK_URL, stream=True)
+        r = requests.get(UBLOCK_URL, timeout=60)
         r.raise_for_status()
-        
-        with zipfile.ZipFile(io.BytesIO(r.content)) as z:
-            os.makedirs(EXTENSION_PATH, exist_ok=True)
-            z.extractall(EXTENSION_PATH)
-        print(lang_dict['ADBLOCK_INSTALLED'].format(path=EXTENSION_PATH))
-        
+
+        def extract(staging):
+            with zipfile.ZipFile(io.BytesIO(r.content)) as z:
+                z.extractall(staging)
+
+        path = ARTIFACT_CACHE.put('ublock_origin', UBLOCK_VERSION, extract, source=UBLOCK_URL)
+        print(lang_dict['ADBLOCK_INSTALLED'].format(path=path))
+        return extension_root(path)
+
     except requests.exceptions.RequestException as e:
         print(lang_dict['ADBLOCK_DOWNLOAD_FAIL'].format(e=e))
     except zipfile.BadZipFile:
         print(lang_dict['ADBLOCK_BAD_ZIP'])
     except Exception as e:
         print(lang_dict['ADBLOCK_UNKNOWN_ERROR'].format(e=e))
+    return None
 
 def create_adblocking_options(user_agent, lang_dict):
     """
-    建立並回傳一個已載入廣告攔截外掛的 ChromeOptions 物件。
+    建立並回傳一個已載入廣告攔截外掛的 ChromeOptions 物件 (每個 WebDriver 池只建立一次)，
+    並依 [blocking] 停用圖片與開啟網路日誌 (measure 開啟時一律記錄，關閉攔截時也一樣)。
     """
-    setup_adblocker(lang_dict)
+    extension_path = setup_adblocker(lang_dict)
     
     options = Options()
     options.add_argument('--headless')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument(f'user-agent={user_agent}')
+    if BLOCKING_ENABLED:
+        configure_options(options, disable_images=BLOCK_IMAGES)
+    if RESOURCE_BLOCKER.measure:
+        enable_network_log(options)
     
-    if os.path.isdir(EXTENSION_PATH):
-        options.add_argument(f'--load-extension={EXTENSION_PATH}')
+    if extension_path:
+        options.add_argument(f'--load-extension={extension_path}')
     else:
         print(lang_dict['ADBLOCK_LOAD_WARN'])
         
     return options
 
+_driver_pools = {}
+_driver_pools_lock = threading.Lock()
+
+def get_driver_pool(service, user_agent, lang_dict):
+    """
+    取得 (或建立) 與 service、user_agent 對應的共用 WebDriver 池。
+    ChromeOptions 只在建立池時產生一次。
+    """
+    key = (id(service), user_agent)
+    with _driver_pools_lock:
+        pool = _driver_pools.get(key)
+        if pool is None:
+            options = create_adblocking_options(user_agent, lang_dict)
+            pool = DriverPool(
+                service, options, lang_dict,
+                size=DRIVER_POOL_SIZE,
+                max_pages_per_driver=DRIVER_MAX_PAGES,
+                checkout_timeout=DRIVER_CHECKOUT_TIMEOUT,
+            )
+            _driver_pools[key] = pool
+        return pool
+
+def drain_driver_pools():
+    """
+    關閉所有 WebDriver 池中閒置的瀏覽器 (每輪爬蟲結束時呼叫)；池本身保留，下一輪再按需啟動。
+    """
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    for pool in pools:
+        pool.drain()
+
+def close_driver_pools():
+    """
+    關閉所有 WebDriver 池中的瀏覽器 (程式結束時呼叫)。
+    """
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+        _driver_pools.clear()
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_driver_pools)
+
+def open_page(driver, site, url):
+    """
+    套用此網站的資源攔截清單後在瀏覽器中載入 url。
+    """
+    RESOURCE_BLOCKER.apply(driver, SITE_REGISTRY.get(site).blocked_urls)
+    driver.get(url)
+
+def record_page_resources(driver, site):
+    """
+    頁面就緒後記錄本次載入發出、被攔截的請求數與傳輸的位元組數。
+    """
+    stats = RESOURCE_BLOCKER.page_stats(driver)
+    if stats is None:
+        return
+    PAGE_REQUESTS.observe(site, value=stats['requests'])
+    PAGE_BLOCKED_REQUESTS.observe(site, value=stats['blocked'])
+    PAGE_BYTES.observe(site, value=stats['bytes'])
+
+def get_readiness(site, selector, timeout=None):
+    """
+    依網站介面的設定建立頁面就緒偵測策略 (未指定 timeout 時使用該網站詳細頁的等待秒數)。
+    """
+    return SITE_REGISTRY.get(site).readiness(selector, timeout)
+
+def wait_for_page(driver, site, selector, timeout=None):
+    """
+    等待瀏覽器中的頁面出現 selector。逾時時檢查頁面是否停在人機驗證頁面，是的話改拋出 ChallengePageError，
+    讓重試與錯誤訊息可以區分驗證頁面與一般的載入過慢。
+    """
+    try:
+        return get_readiness(site, selector, timeout=timeout).wait(driver)
+    except TimeoutException as e:
+        if is_challenge_page(driver):
+            raise ChallengePageError(f"challenge page instead of '{selector}'") from e
+        raise
+
+def is_challenge_page(driver):
+    """
+    以與 HTTP 快速路徑相同的標記判斷瀏覽器目前的頁面是否為人機驗證頁面。
+    """
+    try:
+        page_source = driver.page_source
+    except WebDriverException:
+        return False
+    return looks_like_challenge(200, page_source.encode('utf-8', 'replace'))
+
+def get_retry_policy(site, attempts_key='max_attempts', default_attempts=1):
+    """
+    依 [sites.<site>] 的設定建立重試策略 (重試次數、指數退避的基準與上限秒數)。
+    """
+    site_config = SITES_CONFIG.get(site, {})
+    return RetryPolicy(
+        max_attempts=site_config.get(attempts_key, default_attempts),
+        base_delay=site_config.get('retry_base_delay_seconds', 1.0),
+        max_delay=site_config.get('retry_max_delay_seconds', 30.0),
+        sleep=traced_sleep,
+    )
+
+def traced_sleep(seconds):
+    """
+    重試之間的等待，記錄為 'retry_sleep' 區段。
+    """
+    with TRACER.span('retry_sleep'):
+        time.sleep(seconds)
+
+def print_retry(lang_dict):
+    """
+    產生 RetryPolicy 的 on_retry 回呼，於重試前印出提示。
+    """
+    def on_retry(attempt, e, delay):
+        print(lang_dict['RETRYING'].format(attempt=attempt, e=str(e).splitlines()[0] if str(e) else type(e).__name__, delay=delay))
+    return on_retry
+
+def parse_page(markup, target):
+    """
+    以設定的解析器解析頁面；啟用 targeted 時只解析 PARSE_TARGETS 中該頁面所需的子樹。
+    """
+    with PARSE_SECONDS.time(target), TRACER.span('parse', target=target):
+        return parse_html(markup, PARSER_BACKEND, PARSE_TARGETS[target] if PARSE_TARGETED else None)
+
+def parse_rows(markup, target, row_spec, expected_selector=None):
+    """
+    解析號碼頁面並取出訊息列；頁面缺少 expected_selector 時回傳 None。
+    啟用解析程序池時在工作程序中執行，爬蟲執行緒只等待結構化的結果。
+    """
+    only = PARSE_TARGETS[target] if PARSE_TARGETED else None
+    with PARSE_SECONDS.time(target), TRACER.span('parse', target=target):
+        if PARSE_POOL is None:
+            return parse_message_rows(markup, PARSER_BACKEND, only, row_spec, expected_selector)
+        return PARSE_POOL.run(parse_message_rows, markup, PARSER_BACKEND, only, row_spec, expected_selector)
+
+def fetch_via_http(url, site):
+    """
+    以純 HTTP 快速路徑取得頁面內容；未啟用或遇到驗證頁面時回傳 None。
+    """
+    if HTTP_FETCHER is None:
+        return None
+    with PAGE_LOAD_SECONDS.time(site, 'http'), TRACER.span('http_fetch'):
+        return HTTP_FETCHER.fetch(url)
+
+def fetch_rows_via_http(url, expected_selector, site, target, row_spec):
+    """
+    以純 HTTP 快速路徑讀取號碼頁面並回傳訊息列。若遇到驗證頁面或缺少預期的元素則回傳 None，交由 Selenium 處理。
+    """
+    content = fetch_via_http(url, site)
+    if content is None:
+        return None
+    rows = parse_rows(content, target, row_spec, expected_selector)
+    if rows is None:
+        return None
+    FETCH_STATS.record(site, 'http')
+    return rows
+
+def fetch_soup_via_http(url, expected_selector, site, target):
+    """
+    以純 HTTP 快速路徑讀取頁面。若遇到驗證頁面或缺少預期的元素則回傳 None，交由 Selenium 處理。
+    """
+    content = fetch_via_http(url, site)
+    if content is None:
+        return None
+    soup = parse_page(content, target)
+    if not soup.select_one(expected_selector):
+        return None
+    FETCH_STATS.record(site, 'http')
+    return soup
+
+def load_page_soup(site, url, selector, target, driver_pool, lang_dict, page_load_timeout=None, wait_timeout=None, use_http=True, row_spec=None):
+    """
+    依網站的重試策略載入頁面並回傳 BeautifulSoup (只含 target 對應的子樹)：先試 HTTP 快速路徑，再改用共用池中的瀏覽器。
+    成功即回傳，只有逾時或驗證頁面等可重試的錯誤才會重新載入；HTTP 快速路徑失敗過一次後，重試時直接使用瀏覽器。
+    有 row_spec 時改為回傳訊息列 (見 row_extractor)。未指定的逾時秒數使用網站介面的詳細頁設定。
+    """
+    adapter = SITE_REGISTRY.get(site)
+    page_load_timeout = page_load_timeout or adapter.page_load_timeout
+    wait_timeout = wait_timeout or adapter.wait_timeout
+    http_missed = not use_http
+
+    def attempt(attempt_number):
+        with TRACER.span('attempt', attempt=attempt_number):
+            return load_once()
+
+    def load_once():
+        nonlocal http_missed
+        if not http_missed:
+            if row_spec is not None:
+                result = fetch_rows_via_http(url, selector, site, target, row_spec)
+            else:
+                result = fetch_soup_via_http(url, selector, site, target)
+            if result is not None:
+                return result
+            http_missed = True
+        with TRACER.span('checkout'):
+            driver = driver_pool.checkout()
+        try:
+            driver.set_page_load_timeout(page_load_timeout)
+            with PAGE_LOAD_SECONDS.time(site, 'selenium'), TRACER.span('page_load'):
+                open_page(driver, site, url)
+            with PAGE_WAIT_SECONDS.time(site), TRACER.span('wait'):
+                wait_for_page(driver, site, selector, timeout=wait_timeout)
+            record_page_resources(driver, site)
+            with TRACER.span('extract'):
+                if row_spec is not None and EXTRACT_IN_BROWSER:
+                    rows = extract_rows_in_browser(driver, row_spec)
+                    page_source = None
+                else:
+                    page_source = driver.page_source
+        finally:
+            driver_pool.checkin(driver)
+        FETCH_STATS.record(site, 'selenium')
+        if page_source is None:
+            return rows
+        # 先歸還瀏覽器再解析，讓其他執行緒可以立即使用
+        if row_spec is not None:
+            return parse_rows(page_source, target, row_spec)
+        return parse_page(page_source, target)
+
+    return get_retry_policy(site).run(attempt, on_retry=print_retry(lang_dict))
+
+def load_message_rows(site, url, target, driver_pool, lang_dict, page_load_timeout=None, wait_timeout=None, use_http=True):
+    """
+    載入號碼頁面並回傳其訊息列 [{欄位: 文字或 None}, ...] (欄位見 MESSAGE_ROW_SPECS)。
+    """
+    spec = MESSAGE_ROW_SPECS[site]
+    return load_page_soup(site, url, spec['rows'], target, driver_pool, lang_dict, page_load_timeout, wait_timeout,
+                          use_http=use_http, row_spec=spec)
+
+def list_entry_meta(tag):
+    """
+    將列表頁上某個號碼項目的文字正規化，作為判斷該項目是否有變化的依據。
+    """
+    return " ".join(tag.get_text(" ", strip=True).split())
+
+def plan_number_checks(site, base_url, numbers_to_check, lang_dict):
+    """
+    為列表頁找到的號碼標上網站資訊並加入輪詢排程；
+    增量更新時只保留需要重新檢查的號碼，並回傳可直接沿用的上次活躍結果。
+    """
+    for number_info in numbers_to_check:
+        number_info['site'] = site
+        number_info['base_url'] = base_url
+    if SCHEDULER is not None:
+        SCHEDULER.sync(base_url, numbers_to_check)
+    if REFRESHER is None:
+        to_check, carried = numbers_to_check, []
+    else:
+        to_check, carried = REFRESHER.plan(numbers_to_check)
+        print(lang_dict['INCREMENTAL_PLAN'].format(
+            check=len(to_check),
+            skipped=len(numbers_to_check) - len(to_check),
+            carried=len(carried),
+        ))
+    if SCHEDULER is not None:
+        SCHEDULER.charge(len(to_check))
+    return to_check, carried
+
+def record_number_check(number_info, result):
+    """
+    記錄一次成功完成的號碼檢查 (result 為 None 代表不活躍)，供增量更新與輪詢排程使用。
+    活躍的結果會帶上列表頁所屬的國家，沿用上次結果時也保有國家。
+    """
+    number_info['last_checked'] = time.time()
+    if result:
+        result['country'] = number_info.get('country')
+    changed = REFRESHER.record(number_info, result) if REFRESHER is not None else True
+    if SCHEDULER is not None:
+        SCHEDULER.observe(number_info['url'], active=bool(result), changed=changed)
+
+def check_listed_numbers(adapter, CHROME_SERVICE, base_url, numbers_to_check, user_agent, lang_dict):
+    """
+    在網站的併發上限內檢查列表頁找到的號碼，回傳活躍號碼 (含增量更新沿用的上次結果)。
+    """
+    numbers_to_check, raw_active_numbers = plan_number_checks(adapter.key, base_url, numbers_to_check, lang_dict)
+    with ThreadPoolExecutor(max_workers=adapter.max_concurrency) as executor:
+        future_to_number = {executor.submit(adapter.check, num_info, user_agent, CHROME_SERVICE, base_url, lang_dict): num_info for num_info in numbers_to_check}
+        for future in as_completed(future_to_number):
+            result = future.result()
+            if result:
+                raw_active_numbers.append(result)
+    print(lang_dict['SEARCH_COMPLETE'].format(count=len(raw_active_numbers)))
+    return raw_active_numbers
+
+def previously_listed(base_url, countries):
+    """
+    輪詢排程中此網站上次列出、屬於 countries 的號碼；未啟用排程時回傳空列表。
+    """
+    if SCHEDULER is None:
+        return []
+    wanted = set(countries)
+    return [n for n in SCHEDULER.payloads(base_url) if n.get('country') in wanted]
+
+def discover_numbers(adapter, CHROME_SERVICE, base_url, lang_dict, countries, pages, user_agent):
+    """
+    併發載入網站在各國家與頁碼的列表頁 (同時最多 LIST_CONCURRENCY 頁)，依網址去除重複的號碼後再一起檢查。
+    列表頁不分國家的網站只保留屬於 countries 的號碼。所有列表頁都載入失敗時回傳 None，不更新排程；
+    只有部分列表頁失敗時，這些頁面的國家沿用上次列出的號碼 (見 previously_listed)。
+    """
+    targets = adapter.targets(countries, pages)
+    wanted = set(adapter.countries or countries)
+
+    def load_list(country, page):
+        # 追蹤的區段堆疊屬於各自的執行緒，因此列表頁在工作執行緒中開始自己的 'list' 追蹤，
+        # 其中的 checkout、page_load、wait、parse 才會被記錄；列表頁數量少，不經取樣
+        with TRACER.trace('list', always=True, site=adapter.key, country=country, page=page) as span:
+            numbers = adapter.list_page(CHROME_SERVICE, base_url, lang_dict, country, page, user_agent)
+            span.set(listed=None if numbers is None else len(numbers))
+            return numbers
+
+    with ThreadPoolExecutor(max_workers=max(1, min(LIST_CONCURRENCY, len(targets)))) as executor:
+        futures = [executor.submit(load_list, country, page) for country, page in targets]
+        # 依設定的順序合併，同一個號碼出現在多個列表頁時保留第一個
+        listed = {}
+        failed = []
+        for (country, page), future in zip(targets, futures):
+            numbers = future.result()
+            if numbers is None:
+                failed.append(country)
+                continue
+            for number_info in numbers:
+                if not adapter.per_country and number_info.get('country') not in wanted:
+                    continue
+                listed.setdefault(number_info['url'], number_info)
+    if targets and len(failed) == len(targets):
+        return None
+    if len(targets) > 1:
+        print(lang_dict['LISTED_TARGETS'].format(site=adapter.key, pages=len(targets) - len(failed), count=len(listed)))
+    if failed:
+        kept = [n for n in previously_listed(base_url, failed) if n['url'] not in listed]
+        for number_info in kept:
+            listed[number_info['url']] = number_info
+        print(lang_dict['LIST_PAGES_FAILED_KEPT'].format(site=adapter.key, pages=len(failed), count=len(kept)))
+    return check_listed_numbers(adapter, CHROME_SERVICE, base_url, list(listed.values()), user_agent, lang_dict)
+
 def is_within_last_hour(time_text):
     """
     檢查時間文字 (例如 '5分钟前', '2小时前') 是否在最近一小時內。
@@ -95,26 +730,6 @@ def is_within_last_hour(time_text):
         return True
     return False
 
-def apply_keyword_filter(numbers, include_keywords, exclude_keywords):
-    """
-    根據關鍵字清單篩選爬蟲結果。
-    """
-    if not include_keywords and not exclude_keywords:
-        return numbers
-
-    filtered_numbers = []
-    inc_lower = [k.lower() for k in include_keywords if k]
-    exc_lower = [k.lower() for k in exclude_keywords if k]
-
-    for item in numbers:
-        all_sms_content = " ".join(item.get('smss', [])).lower()
-        if exc_lower and any(ex_k in all_sms_content for ex_k in exc_lower):
-            continue
-        if inc_lower and not any(in_k in all_sms_content for in_k in inc_lower):
-            continue
-        filtered_numbers.append(item)
-    return filtered_numbers
-
 
 def freereceivesms_check_single_number(number_info, user_agent, service, base_url, lang_dict):
     """
@@ -122,72 +737,51 @@ def freereceivesms_check_single_number(number_info, user_agent, service, base_ur
     """
     number_url = number_info['url']
     phone_number_text = number_info['number']
-    options = create_adblocking_options(user_agent, lang_dict)
+    driver_pool = get_driver_pool(service, user_agent, lang_dict)
     
-    driver = None
     result = None
-    for i in range(2):
-        try:
-            print(lang_dict['CHECKING_NUMBER'].format(number=phone_number_text), end="", flush=True)
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.set_page_load_timeout(30)
-            driver.get(number_url)
-            message_row_selector = '.container .row.border-bottom'
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, message_row_selector)))
-            time.sleep(4)
-            num_soup = BeautifulSoup(driver.page_source, 'html.parser')
-            message_rows = num_soup.select(message_row_selector)
-            message_rows_contents=[]
-            if message_rows:
-                latest_row = message_rows[0]
-                time_element_lg = latest_row.select_one('.d-none.d-lg-block.col-lg-2 span')
-                time_element_sm = latest_row.select_one('.d-block.d-lg-none.ml-2')
-                for item in message_rows:
-                     item_element = item.select_one('.col-lg-8 div')
-                     message_rows_contents.append(item_element.get_text(strip=True) if item_element else lang_dict['CANNOT_READ_SMS'])
-                time_text = ''
-                if time_element_lg:
-                    time_text = time_element_lg.get_text(strip=True)
-                elif time_element_sm:
-                    time_text = time_element_sm.get_text(strip=True)
-                sms_content_element = latest_row.select_one('.col-lg-8 div')
-                sms_content = sms_content_element.get_text(strip=True) if sms_content_element else lang_dict['CANNOT_READ_SMS']
-                if time_text and is_within_last_hour(time_text):
-                    if len(sms_content) > 80 and (sms_content.endswith('==') or sms_content.endswith('=')):
-                        sms_content = lang_dict['SMS_CONTENT_ENCRYPTED'] + sms_content
-                    print(lang_dict['FOUND_ACTIVE_NUMBER'].format(time=time_text))
-                    result = {'number': phone_number_text, 'url': number_url, 'last_sms': sms_content, 'smss': message_rows_contents, 'last_time':time_text}
-                else:
-                    print(lang_dict['INACTIVE_NUMBER'].format(time=time_text))
+    try:
+        print(lang_dict['CHECKING_NUMBER'].format(number=phone_number_text), end="", flush=True)
+        message_rows = load_message_rows('freereceivesms', number_url, 'freereceivesms_number', driver_pool, lang_dict)
+        if message_rows:
+            latest_row = message_rows[0]
+            message_rows_contents = [row['text'] if row['text'] is not None else lang_dict['CANNOT_READ_SMS'] for row in message_rows]
+            time_text = ''
+            if latest_row['time_lg'] is not None:
+                time_text = latest_row['time_lg']
+            elif latest_row['time_sm'] is not None:
+                time_text = latest_row['time_sm']
+            sms_content = message_rows_contents[0]
+            if time_text and SITE_REGISTRY.get('freereceivesms').is_recent(time_text):
+                if len(sms_content) > 80 and (sms_content.endswith('==') or sms_content.endswith('=')):
+                    sms_content = lang_dict['SMS_CONTENT_ENCRYPTED'] + sms_content
+                print(lang_dict['FOUND_ACTIVE_NUMBER'].format(time=time_text))
+                result = {'number': phone_number_text, 'url': number_url, 'last_sms': sms_content, 'smss': message_rows_contents, 'last_time':time_text}
             else:
-                print(lang_dict['NO_MESSAGE_ROWS'])
-        except WebDriverException as e:
-            print(lang_dict['SELENIUM_READ_FAIL'].format(e=e))
-        except Exception as e:
-            print(lang_dict['CHECK_NUMBER_FAIL'].format(number=phone_number_text, e=e))
-        finally:
-            if driver:
-                driver.quit()
-        time.sleep(5)
+                print(lang_dict['INACTIVE_NUMBER'].format(time=time_text))
+            record_number_check(number_info, result)
+        else:
+            print(lang_dict['NO_MESSAGE_ROWS'])
+    except WebDriverException as e:
+        print(lang_dict['SELENIUM_READ_FAIL'].format(e=e))
+    except Exception as e:
+        print(lang_dict['CHECK_NUMBER_FAIL'].format(number=phone_number_text, e=e))
     return result
 
-def freereceivesms_find_active_numbers(CHROME_SERVICE, base_url, lang_dict, country_code=COUNTRY_CODE, page=PAGE_INDEX):
+def freereceivesms_list_numbers(CHROME_SERVICE, base_url, lang_dict, country_code, page, user_agent):
     """
-    取得所有號碼列表，然後使用執行緒池併發檢查號碼。
+    載入 freereceivesms.com 一個國家的一頁號碼列表；載入失敗時回傳 None。
     """
     print(lang_dict['SEARCHING_NUMBERS_SELENIUM'].format(country=country_code.upper()))
     numbers_to_check = []
     country_page_url = f"{base_url}/{country_code}/{page}/"
     print(lang_dict['TARGET_COUNTRY_PAGE'].format(url=country_page_url))
-    driver = None
     try:
-        options = create_adblocking_options(HEADERS["User-Agent"], lang_dict)
         print(lang_dict['LOADING_COUNTRY_PAGE'])
-        driver = webdriver.Chrome(service=CHROME_SERVICE, options=options)
-        driver.set_page_load_timeout(30)
-        driver.get(country_page_url)
-        time.sleep(3)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        driver_pool = get_driver_pool(CHROME_SERVICE, user_agent, lang_dict)
+        adapter = SITE_REGISTRY.get('freereceivesms')
+        soup = load_page_soup('freereceivesms', country_page_url, '.number-boxes-item', 'freereceivesms_list', driver_pool, lang_dict,
+                              page_load_timeout=adapter.list_page_load_timeout, wait_timeout=adapter.list_wait_timeout)
         number_boxes = soup.select('.number-boxes-item')
         if not number_boxes:
             print(lang_dict['NO_NUMBERS_FOUND_ON_PAGE'])
@@ -198,8 +792,9 @@ def freereceivesms_find_active_numbers(CHROME_SERVICE, base_url, lang_dict, coun
                 continue
             number_path = link_tag['href']
             number_url = f"{base_url}{number_path}"
-            phone_number_text = box.find('h4').get_text(strip=True) if box.find('h4') else "N/A"
-            numbers_to_check.append({'number': phone_number_text, 'url': number_url})
+            phone_number_tag = box.find('h4')
+            phone_number_text = phone_number_tag.get_text(strip=True) if phone_number_tag else "N/A"
+            numbers_to_check.append({'number': phone_number_text, 'url': number_url, 'country': country_code, 'list_meta': list_entry_meta(box)})
         print(lang_dict['FOUND_NUMBERS_CONCURRENT_CHECK'].format(count=len(numbers_to_check)))
     except WebDriverException as e:
         print(lang_dict['LOAD_COUNTRY_PAGE_FAIL'].format(e=e))
@@ -207,18 +802,24 @@ def freereceivesms_find_active_numbers(CHROME_SERVICE, base_url, lang_dict, coun
     except Exception as e:
         print(lang_dict['LOAD_COUNTRY_PAGE_GENERAL_ERROR'].format(e=e))
         return None
-    finally:
-        if driver:
-            driver.quit()
-    raw_active_numbers = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_number = {executor.submit(freereceivesms_check_single_number, num_info, HEADERS['User-Agent'], CHROME_SERVICE, base_url, lang_dict): num_info for num_info in numbers_to_check}
-        for future in as_completed(future_to_number):
-            result = future.result()
-            if result:
-                raw_active_numbers.append(result)
-    print(lang_dict['SEARCH_COMPLETE'].format(count=len(raw_active_numbers)))
-    return raw_active_numbers
+    return numbers_to_check
+
+def freereceivesms_find_active_numbers(CHROME_SERVICE, base_url, lang_dict, country_code=None, page=None):
+    """
+    取得一個國家一頁的號碼列表 (未指定時為設定的 country_code 與 page_index)，然後使用執行緒池併發檢查號碼。
+    """
+    return discover_numbers(SITE_REGISTRY.get('freereceivesms'), CHROME_SERVICE, base_url, lang_dict,
+                            [country_code or COUNTRY_CODE], [page or PAGE_INDEX], HEADERS['User-Agent'])
+
+# freereceivesms.com 伺服器端渲染且沒有驗證頁面，可以大量併發 (預設併發上限為 max_workers)；列表頁依國家與頁碼分開 (/<國碼>/<頁碼>/)
+register_site(
+    'freereceivesms', 'freereceivesms.com', 'Free-Receive-Sms',
+    list_numbers=freereceivesms_list_numbers,
+    check_number=freereceivesms_check_single_number,
+    is_recent=is_within_last_hour,
+    page_load_timeout=30, wait_timeout=10,
+    list_page_load_timeout=30, list_wait_timeout=10,
+)
 
 def receivesmss_check_single_number(number_info, user_agent, service, base_url, lang_dict):
     """
@@ -226,116 +827,116 @@ def receivesmss_check_single_number(number_info, user_agent, service, base_url,
     """
     number_url = number_info['url']
     phone_number_text = number_info['number']
-    options = create_adblocking_options(user_agent, lang_dict)
+    driver_pool = get_driver_pool(service, user_agent, lang_dict)
     
-    driver = None
     result = None
     try:
         print(lang_dict['CHECKING_NUMBER'].format(number=phone_number_text), end="", flush=True)
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(30)
-        driver.get(number_url)
-        
-        message_row_selector = 'div.row.border-bottom.py-2'
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, message_row_selector)))
-        time.sleep(2)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        message_rows = soup.select(message_row_selector)
+        # receive-smss.com 受 Cloudflare 保護，純 HTTP 一定會被擋下，因此直接使用 Selenium
+        message_rows = load_message_rows('receivesmss', number_url, 'receivesmss_number', driver_pool, lang_dict, use_http=False)
         
         if not message_rows:
             print(lang_dict['NO_MESSAGE_ROWS'])
             return None
 
         latest_row = message_rows[0]
-        time_element = latest_row.select_one('div.col-md-2.text-right span.text-muted')
-        time_text = time_element.get_text(strip=True) if time_element else ""
+        time_text = latest_row['time'] or ""
 
-        if time_text and is_within_last_hour(time_text):
-            sms_content_element = latest_row.select_one('div.col-md-8')
-            sms_content = sms_content_element.get_text(strip=True) if sms_content_element else lang_dict['CANNOT_READ_SMS']
-            all_smss = [row.select_one('div.col-md-8').get_text(strip=True) for row in message_rows if row.select_one('div.col-md-8')]
+        if time_text and SITE_REGISTRY.get('receivesmss').is_recent(time_text):
+            sms_content = latest_row['text'] if latest_row['text'] is not None else lang_dict['CANNOT_READ_SMS']
+            all_smss = [row['text'] for row in message_rows if row['text'] is not None]
 
             print(lang_dict['FOUND_ACTIVE_NUMBER'].format(time=time_text))
             result = {'number': phone_number_text, 'url': number_url, 'last_sms': sms_content, 'smss': all_smss, 'last_time':time_text}
         else:
             print(lang_dict['INACTIVE_NUMBER'].format(time=time_text))
+        record_number_check(number_info, result)
     except WebDriverException as e:
         print(lang_dict['SELENIUM_READ_FAIL'].format(e=e))
     except Exception as e:
         print(lang_dict['CHECK_NUMBER_FAIL'].format(number=phone_number_text, e=e))
-    finally:
-        if driver:
-            driver.quit()
     return result
 
-def receivesmss_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_dict):
+def receivesmss_list_numbers(CHROME_SERVICE, base_url, lang_dict, country_code, page, user_agent):
     """
-    使用 Selenium 從 receive-smss.com 取得號碼列表。
+    使用 Selenium 從 receive-smss.com 取得號碼列表 (所有國家在同一頁，依每個號碼顯示的國家名稱標上國碼)。
+    重試用完仍無法載入 (例如一直停在 Cloudflare 驗證頁面) 時回傳 None。
     """
     print(lang_dict['SEARCHING_NUMBERS_BASE_URL'].format(url=base_url))
     numbers_to_check = []
     driver = None
     try:
-        options = create_adblocking_options(user_agent, lang_dict)
+        driver_pool = get_driver_pool(CHROME_SERVICE, user_agent, lang_dict)
         
         print(lang_dict['LOADING_COUNTRY_PAGE'])
-        driver = webdriver.Chrome(service=CHROME_SERVICE, options=options)
-        driver.set_page_load_timeout(40)
+        adapter = SITE_REGISTRY.get('receivesmss')
+        with TRACER.span('checkout'):
+            driver = driver_pool.checkout()
+        driver.set_page_load_timeout(adapter.list_page_load_timeout)
 
-        for attempt in range(3):
-            try:
-                driver.get(base_url)
-                
-                print(lang_dict['WAITING_CLOUDFLARE'])
-                WebDriverWait(driver, 60).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".number-boxes > a"))
-                )
-                print(lang_dict['CLOUDFLARE_PASS'])
-
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                number_links = soup.select('.number-boxes > a')
-
-                if number_links:
-                    print(lang_dict['FOUND_LINK_SUCCESS'].format(attempt=attempt + 1))
-                    for link in number_links:
-                        number_path = link.get('href')
-                        if number_path:
-                            number_url = f"{base_url.rstrip('/')}{number_path}"
-                            phone_number_tag = link.select_one('.number-boxes-itemm-number')
-                            phone_number_text = phone_number_tag.get_text(strip=True) if phone_number_tag else "N/A"
-                            numbers_to_check.append({'number': phone_number_text, 'url': number_url})
-                    break
-                else:
-                    print(lang_dict['NO_LINK_ON_ATTEMPT'].format(attempt=attempt + 1))
-                    driver.refresh()
-            except WebDriverException as e:
-                print(lang_dict['LOAD_MAIN_PAGE_ATTEMPT_FAIL'].format(attempt=attempt + 1, e=e))
-                driver.refresh()
-
-        if not numbers_to_check:
-            print(lang_dict['NO_NUMBERS_AFTER_RETRIES'])
-            return []
+        def load_number_links(attempt):
+            with PAGE_LOAD_SECONDS.time('receivesmss', 'selenium'), TRACER.span('page_load', attempt=attempt):
+                open_page(driver, 'receivesmss', base_url)
+
+            print(lang_dict['WAITING_CLOUDFLARE'])
+            with PAGE_WAIT_SECONDS.time('receivesmss'), TRACER.span('wait', attempt=attempt):
+                wait_for_page(driver, 'receivesmss', '.number-boxes > a', timeout=adapter.list_wait_timeout)
+            record_page_resources(driver, 'receivesmss')
+            print(lang_dict['CLOUDFLARE_PASS'])
+
+            soup = parse_page(driver.page_source, 'receivesmss_list')
+            FETCH_STATS.record('receivesmss', 'selenium')
+            number_links = soup.select('.number-boxes > a')
+            if not number_links:
+                raise RetryableError(lang_dict['NO_LINK_ON_ATTEMPT'].format(attempt=attempt))
+            print(lang_dict['FOUND_LINK_SUCCESS'].format(attempt=attempt))
+            return number_links
+
+        list_policy = get_retry_policy('receivesmss', attempts_key='list_max_attempts', default_attempts=3)
+        try:
+            number_links = list_policy.run(load_number_links, on_retry=print_retry(lang_dict))
+        except (WebDriverException, RetryableError) as e:
+            print(lang_dict['LOAD_MAIN_PAGE_ATTEMPT_FAIL'].format(attempt=list_policy.max_attempts, e=e))
+            print(lang_dict['NO_NUMBERS_AFTER_RETRIES'].format(attempts=list_policy.max_attempts))
+            return None
+
+        for link in number_links:
+            number_path = link.get('href')
+            if number_path:
+                number_url = f"{base_url.rstrip('/')}{number_path}"
+                phone_number_tag = link.select_one('.number-boxes-itemm-number')
+                phone_number_text = phone_number_tag.get_text(strip=True) if phone_number_tag else "N/A"
+                country_tag = link.select_one('.number-boxes-item-country')
+                country = country_code_for_name(country_tag.get_text(strip=True)) if country_tag else None
+                numbers_to_check.append({'number': phone_number_text, 'url': number_url, 'country': country, 'list_meta': list_entry_meta(link)})
 
         print(lang_dict['FOUND_NUMBERS_CONCURRENT_CHECK'].format(count=len(numbers_to_check)))
 
     except Exception as e:
         print(lang_dict['LOAD_MAIN_PAGE_GENERAL_ERROR'].format(e=e))
-        return []
+        return None
     finally:
         if driver:
-            driver.quit()
+            driver_pool.checkin(driver)
+    return numbers_to_check
 
-    raw_active_numbers = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_number = {executor.submit(receivesmss_check_single_number, num_info, user_agent, CHROME_SERVICE, base_url, lang_dict): num_info for num_info in numbers_to_check}
-        for future in as_completed(future_to_number):
-            result = future.result()
-            if result:
-                raw_active_numbers.append(result)
-    
-    print(lang_dict['SEARCH_COMPLETE'].format(count=len(raw_active_numbers)))
-    return raw_active_numbers
+def receivesmss_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_dict):
+    """
+    使用 Selenium 從 receive-smss.com 取得設定的國家的號碼並檢查。
+    """
+    return discover_numbers(SITE_REGISTRY.get('receivesmss'), CHROME_SERVICE, base_url, lang_dict, COUNTRIES, PAGES, user_agent)
+
+# receive-smss.com 受 Cloudflare 保護，請求太密集容易被擋，因此一次只檢查一個號碼；
+# 所有國家的號碼都在同一個列表頁，不分頁
+register_site(
+    'receivesmss', 'receive-smss.com', 'Receive-Smss',
+    list_numbers=receivesmss_list_numbers,
+    check_number=receivesmss_check_single_number,
+    is_recent=is_within_last_hour,
+    per_country=False, paged=False,
+    max_concurrency=1, page_load_timeout=30, wait_timeout=10,
+    list_page_load_timeout=40, list_wait_timeout=60,
+)
 
 def tempnumber_check_single_number(number_info, user_agent, service, base_url, lang_dict):
     """
@@ -343,82 +944,72 @@ def tempnumber_check_single_number(number_info, user_agent, service, base_url, l
     """
     number_url = number_info['url']
     phone_number_text = number_info['number']
-    options = create_adblocking_options(user_agent, lang_dict)
+    driver_pool = get_driver_pool(service, user_agent, lang_dict)
     
-    driver = None
     result = None
     try:
         print(lang_dict['CHECKING_NUMBER_TEMP'].format(number=phone_number_text), end="", flush=True)
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(40)
-        driver.get(number_url)
-        
-        message_row_selector = 'div.direct-chat-msg'
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, message_row_selector)))
-        time.sleep(2)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        message_rows = soup.select(message_row_selector)
+        message_rows = load_message_rows('tempnumber', number_url, 'tempnumber_number', driver_pool, lang_dict)
         
         if not message_rows:
             print(lang_dict['NO_MESSAGE_ROWS'])
             return None
 
         latest_row = message_rows[0]
-        time_element = latest_row.select_one('time.direct-chat-timestamp')
-        time_text = time_element.get_text(strip=True) if time_element else ""
+        time_text = latest_row['time'] or ""
 
-        if time_text and is_within_last_hour(time_text):
-            sms_content_element = latest_row.select_one('div.direct-chat-text')
-            sms_content = sms_content_element.get_text(strip=True) if sms_content_element else lang_dict['CANNOT_READ_SMS']
-            
-            all_smss = [row.select_one('div.direct-chat-text').get_text(strip=True) for row in message_rows if row.select_one('div.direct-chat-text')]
+        if time_text and SITE_REGISTRY.get('tempnumber').is_recent(time_text):
+            sms_content = latest_row['text'] if latest_row['text'] is not None else lang_dict['CANNOT_READ_SMS']
+            all_smss = [row['text'] for row in message_rows if row['text'] is not None]
 
             print(lang_dict['FOUND_ACTIVE_NUMBER'].format(time=time_text))
             result = {'number': phone_number_text, 'url': number_url, 'last_sms': sms_content, 'smss': all_smss, 'last_time':time_text}
         else:
             print(lang_dict['INACTIVE_NUMBER'].format(time=time_text))
-            
+        record_number_check(number_info, result)
+
     except WebDriverException as e:
         print(lang_dict['SELENIUM_TIMEOUT_ERROR'].format(e=str(e).splitlines()[0]))
     except Exception as e:
         print(lang_dict['CHECK_NUMBER_FAIL'].format(number=phone_number_text, e=e))
-    finally:
-        if driver:
-            driver.quit()
     return result
 
-def tempnumber_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_dict):
+def tempnumber_list_numbers(CHROME_SERVICE, base_url, lang_dict, country_code, page, user_agent):
     """
-    使用 Selenium 從 temp-number.com 取得號碼列表。
+    使用 Selenium 從 temp-number.com 取得一個國家的號碼列表 (/countries/<國家名稱>)；載入失敗時回傳 None。
     """
     print(lang_dict['SEARCHING_NUMBERS_BASE_URL'].format(url=base_url))
     numbers_to_check = []
     driver = None
-    country_url = f"{base_url.rstrip('/')}/countries/United-States"
+    country_url = f"{base_url.rstrip('/')}/countries/{country_slug(country_code)}"
     print(lang_dict['TARGET_COUNTRY_PAGE_TEMP'].format(url=country_url))
 
     try:
-        options = create_adblocking_options(user_agent, lang_dict)
-        
         print(lang_dict['LOADING_COUNTRY_PAGE_TEMP'])
-        driver = webdriver.Chrome(service=CHROME_SERVICE, options=options)
-        driver.set_page_load_timeout(60)
-        driver.get(country_url)
+        soup = fetch_soup_via_http(country_url, "a.country-link", 'tempnumber', 'tempnumber_list')
+        if soup is None:
+            driver_pool = get_driver_pool(CHROME_SERVICE, user_agent, lang_dict)
+            adapter = SITE_REGISTRY.get('tempnumber')
+            with TRACER.span('checkout'):
+                driver = driver_pool.checkout()
+            driver.set_page_load_timeout(adapter.list_page_load_timeout)
+            with PAGE_LOAD_SECONDS.time('tempnumber', 'selenium'), TRACER.span('page_load'):
+                open_page(driver, 'tempnumber', country_url)
 
-        print(lang_dict['WAITING_PAGE_LOAD_TEMP'])
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.country-link"))
-        )
-        print(lang_dict['PAGE_LOADED_PARSING'])
-        time.sleep(3)
+            print(lang_dict['WAITING_PAGE_LOAD_TEMP'])
+            with PAGE_WAIT_SECONDS.time('tempnumber'), TRACER.span('wait'):
+                wait_for_page(driver, 'tempnumber', "a.country-link", timeout=adapter.list_wait_timeout)
+            record_page_resources(driver, 'tempnumber')
+            print(lang_dict['PAGE_LOADED_PARSING'])
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = parse_page(driver.page_source, 'tempnumber_list')
+            FETCH_STATS.record('tempnumber', 'selenium')
         number_links = soup.select("a.country-link")
         
         if not number_links:
+            # 就緒偵測已確認頁面上有號碼連結，解析後卻沒有時視為載入失敗，不要當成網站沒有號碼
             print(lang_dict['NO_NUMBERS_FOUND_ON_PAGE_TEMP'])
-            return []
+            return None
 
         for link in number_links:
             number_path = link.get('href')
@@ -430,7 +1021,7 @@ def tempnumber_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_di
                     phone_number_text = '+' + phone_number_text
                 
                 if phone_number_text.startswith('+'):
-                    numbers_to_check.append({'number': phone_number_text, 'url': number_url})
+                    numbers_to_check.append({'number': phone_number_text, 'url': number_url, 'country': country_code, 'list_meta': list_entry_meta(link)})
 
         print(lang_dict['FOUND_NUMBERS_CONCURRENT_CHECK'].format(count=len(numbers_to_check)))
 
@@ -445,65 +1036,153 @@ def tempnumber_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_di
                 print(lang_dict['WRITE_DEBUG_FILE_DONE'])
             except Exception as write_e:
                 print(lang_dict['WRITE_DEBUG_FILE_ERROR'].format(e=write_e))
-        return []
+        return None
     finally:
         if driver:
-            driver.quit()
+            driver_pool.checkin(driver)
+    return numbers_to_check
+
+def tempnumber_find_active_numbers(CHROME_SERVICE, base_url, user_agent, lang_dict):
+    """
+    使用 Selenium 從 temp-number.com 取得設定的國家的號碼並檢查。
+    """
+    return discover_numbers(SITE_REGISTRY.get('tempnumber'), CHROME_SERVICE, base_url, lang_dict, COUNTRIES, PAGES, user_agent)
 
-    raw_active_numbers = []
+# temp-number.com 的列表頁依國家分開，但不分頁
+register_site(
+    'tempnumber', 'temp-number.com', 'Temp-Number',
+    list_numbers=tempnumber_list_numbers,
+    check_number=tempnumber_check_single_number,
+    is_recent=is_within_last_hour,
+    paged=False,
+    max_concurrency=3, page_load_timeout=40, wait_timeout=20,
+    list_page_load_timeout=60, list_wait_timeout=30,
+)
+
+def seconds_until_next_poll():
+    """
+    距離輪詢排程中下一個號碼到期還有幾秒；未啟用排程或沒有號碼時回傳 None。
+    """
+    if SCHEDULER is None:
+        return None
+    return SCHEDULER.seconds_until_due()
+
+def tag_result(number, site, base_url):
+    """
+    為檢查結果標上來源網站與所屬的目標網址，並預先計算關鍵字比對用的文字。
+    """
+    number['source'] = SITE_REGISTRY.get(site).source
+    number['base_url'] = base_url
+    number['search_text'] = normalize_sms_text(number.get('smss', []))
+    return number
+
+def poll_due_numbers(CHROME_SERVICE, lang_dict, on_result):
+    """
+    併發檢查輪詢排程中已到期的號碼，並以 on_result(number_info, result) 回報每個號碼的最新結果
+    (result 為 None 代表號碼已不活躍；檢查失敗的號碼不會回報，以保留原本的資料)。回傳本次檢查的號碼數量。
+    """
+    if SCHEDULER is None:
+        return 0
+    due_numbers = SCHEDULER.pop_due(limit=MAX_WORKERS)
+    if not due_numbers:
+        return 0
+    print(lang_dict['POLLING_DUE_NUMBERS'].format(count=len(due_numbers)))
+    user_agent = HEADERS['User-Agent']
+    checked_before = {num_info['url']: num_info.get('last_checked') for num_info in due_numbers}
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_number = {executor.submit(tempnumber_check_single_number, num_info, user_agent, CHROME_SERVICE, base_url, lang_dict): num_info for num_info in numbers_to_check}
+        future_to_number = {
+            executor.submit(SITE_REGISTRY.get(num_info['site']).check, num_info, user_agent, CHROME_SERVICE, num_info['base_url'], lang_dict): num_info
+            for num_info in due_numbers
+        }
         for future in as_completed(future_to_number):
+            num_info = future_to_number[future]
             result = future.result()
+            if num_info.get('last_checked') == checked_before[num_info['url']]:
+                continue
             if result:
-                raw_active_numbers.append(result)
-    
-    print(lang_dict['SEARCH_COMPLETE_TEMP'].format(count=len(raw_active_numbers)))
-    return raw_active_numbers
+                tag_result(result, num_info['site'], num_info['base_url'])
+            on_result(num_info, result)
+    return len(due_numbers)
 
-def scrape_all_sites(CHROME_SERVICE, target_urls, lang_dict):
+def scrape_site(CHROME_SERVICE, url, lang_dict, countries, pages, user_agent):
     """
-    遍歷 target_urls 列表，並為每個 URL 呼叫對應的爬蟲函式。
+    依網域從 SITE_REGISTRY 找出負責此 URL 的網站介面，爬取其在各國家與頁碼的列表頁並檢查號碼，再標記其結果 (見 tag_result)。
+    列表頁全部載入失敗時回傳 None，呼叫端應保留此網站上次的結果。
+    """
+    print(lang_dict['PROCESSING_SITE'].format(url=url))
+
+    adapter = SITE_REGISTRY.for_url(url)
+    if adapter is None:
+        print(lang_dict['PARSER_NOT_FOUND'].format(url=url))
+        return []
+
+    try:
+        with TRACER.trace('site', site=adapter.key):
+            numbers = discover_numbers(adapter, CHROME_SERVICE, url, lang_dict, countries, pages, user_agent)
+    except Exception:
+        SITE_SCRAPES.inc(adapter.key, 'failure')
+        raise
+    # 列表頁全部載入失敗時 discover_numbers 回傳 None
+    if numbers is None:
+        SITE_SCRAPES.inc(adapter.key, 'failure')
+        return None
+    SITE_SCRAPES.inc(adapter.key, 'success')
+    ACTIVE_NUMBERS.set(adapter.key, value=len(numbers))
+    return [tag_result(number, adapter.key, url) for number in numbers]
+
+def scrape_all_sites(CHROME_SERVICE, target_urls, lang_dict, on_site_done=None):
+    """
+    併發爬取 target_urls 中的所有網站，每個網站完成後立即合併其結果。
+    所有網站共用同一個 WebDriver 池，因此 Chrome 程序總數仍受 max_workers 限制。
+    on_site_done(url, numbers) 會在每個網站完成時被呼叫，讓呼叫端可以先發布部分結果；
+    列表頁載入失敗或出錯的網站不會呼叫，呼叫端保留其上次的結果。
     """
-    country_code = config.get('general', {}).get('country_code', 'us')
-    page_index = config.get('general', {}).get('page_index', 1)
     user_agent = config.get('headers', {}).get('User-Agent', 'Mozilla/5.0')
 
     all_results = []
+    FETCH_STATS.reset()
     print(lang_dict['TRAVERSING_SITES_START'].format(count=len(target_urls)))
 
-    for url in target_urls:
-        print(lang_dict['PROCESSING_SITE'].format(url=url))
-        
-        if "freereceivesms" in url:
-            try:
-                numbers = freereceivesms_find_active_numbers(CHROME_SERVICE, base_url=url, lang_dict=lang_dict, country_code=country_code, page=page_index)
-                if numbers:
-                    for number in numbers:
-                        number['source'] = 'Free-Receive-Sms'
-                    all_results.extend(numbers)
-            except Exception as e:
-                print(lang_dict['PROCESS_SITE_ERROR'].format(url=url, e=e))
-        elif "receive-smss" in url:
-            try:
-                numbers = receivesmss_find_active_numbers(CHROME_SERVICE, base_url=url, user_agent=user_agent, lang_dict=lang_dict)
-                if numbers:
-                    for number in numbers:
-                        number['source'] = 'Receive-Smss'
-                    all_results.extend(numbers)
-            except Exception as e:
-                print(lang_dict['PROCESS_SITE_ERROR'].format(url=url, e=e))
-        elif "temp-number" in url:
-            try:
-                numbers = tempnumber_find_active_numbers(CHROME_SERVICE, base_url=url, user_agent=user_agent, lang_dict=lang_dict)
-                if numbers:
-                    for number in numbers:
-                        number['source'] = 'Temp-Number'
-                    all_results.extend(numbers)
-            except Exception as e:
-                print(lang_dict['PROCESS_SITE_ERROR'].format(url=url, e=e))
-        else:
-            print(lang_dict['PARSER_NOT_FOUND'].format(url=url))
+    # 整輪的耗時 (各網站與號碼的細節在各自執行緒的追蹤中)
+    with CYCLE_SECONDS.time(), TRACER.trace('cycle', always=True, sites=len(target_urls)):
+        executor = ThreadPoolExecutor(max_workers=max(1, len(target_urls)))
+        future_to_url = {
+            executor.submit(scrape_site, CHROME_SERVICE, url, lang_dict, COUNTRIES, PAGES, user_agent): url
+            for url in target_urls
+        }
+        try:
+            for future in as_completed(future_to_url, timeout=SITE_TIMEOUT_SECONDS):
+                url = future_to_url[future]
+                try:
+                    numbers = future.result()
+                except Exception as e:
+                    print(lang_dict['PROCESS_SITE_ERROR'].format(url=url, e=e))
+                    continue
+                if numbers is None:
+                    print(lang_dict['SITE_LIST_FAILED'].format(url=url))
+                    continue
+                all_results.extend(numbers)
+                print(lang_dict['SITE_DONE'].format(url=url, count=len(numbers)))
+                if on_site_done:
+                    on_site_done(url, numbers)
+        except FuturesTimeoutError:
+            for future, url in future_to_url.items():
+                if not future.done():
+                    print(lang_dict['SITE_TIMEOUT'].format(url=url, seconds=SITE_TIMEOUT_SECONDS))
+        finally:
+            # 不等待卡住的網站，讓本輪可以先結束
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # 本輪結束後關閉閒置的瀏覽器，避免在兩輪之間的長時間等待中佔用記憶體
+    drain_driver_pools()
+
+    for site, counts in FETCH_STATS.snapshot().items():
+        print(lang_dict['FETCH_PATH_SUMMARY'].format(
+            site=site,
+            http=counts.get('http', 0),
+            selenium=counts.get('selenium', 0),
+            rate=FETCH_STATS.hit_rate(counts),
+        ))
 
     print(lang_dict['ALL_SITES_DONE'].format(count=len(target_urls), total=len(all_results)))
-    return all_results
\ No newline at end of file
+    return all_results
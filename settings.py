@@ -0,0 +1,21 @@
+# settings.py
+import threading
+
+import tomli
+
+CONFIG_PATH = 'config.toml'
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_config(path=CONFIG_PATH):
+    """
+    讀取 TOML 設定檔並回傳其內容；同一個路徑只讀取一次，main 與 scraper_core 共用同一份設定。
+    設定檔在運行期間不會自動熱更新，如需修改請重啟程式。找不到檔案時拋出 FileNotFoundError。
+    """
+    with _lock:
+        if path not in _loaded:
+            with open(path, 'rb') as f:
+                _loaded[path] = tomli.load(f)
+        return _loaded[path]
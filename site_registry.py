@@ -0,0 +1,119 @@
+# site_registry.py
+import threading
+from urllib.parse import urlparse
+
+from readiness import ReadinessStrategy
+
+
+class SiteAdapter:
+    """
+    一個網站的爬蟲介面：列表頁解析 (list_numbers)、號碼詳細頁解析 (check_number)、
+    時間文字判斷 (is_recent) 與來源標籤，以及此網站自己的併發上限、逾時、頁面就緒偵測與資源攔截設定。
+    同一網站同時進行的號碼檢查數不會超過 max_concurrency。
+    per_country / paged 表示列表頁是否依國家 / 頁碼分開；countries / pages 為此網站自己要爬取的國家與頁碼
+    (None 代表使用全域設定)。
+    """
+
+    def __init__(self, key, domain, source, list_numbers, check_number, is_recent,
+                 per_country=True, paged=True, countries=None, pages=None,
+                 max_concurrency=4, page_load_timeout=30, wait_timeout=10,
+                 list_page_load_timeout=60, list_wait_timeout=30,
+                 readiness_quiet=0.5, readiness_poll=0.1, blocked_urls=()):
+        self.key = key
+        self.domain = domain
+        self.source = source
+        self.list_numbers = list_numbers
+        self.check_number = check_number
+        self.is_recent = is_recent
+        self.per_country = per_country
+        self.paged = paged
+        self.countries = countries
+        self.pages = pages
+        self.max_concurrency = max(1, max_concurrency)
+        self.page_load_timeout = page_load_timeout
+        self.wait_timeout = wait_timeout
+        self.list_page_load_timeout = list_page_load_timeout
+        self.list_wait_timeout = list_wait_timeout
+        self.readiness_quiet = readiness_quiet
+        self.readiness_poll = readiness_poll
+        self.blocked_urls = tuple(blocked_urls)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def targets(self, countries, pages):
+        """
+        回傳要載入的列表頁 [(國碼, 頁碼)]：此網站自己的 countries / pages 優先於傳入的全域設定，
+        列表頁不分國家或不分頁時對應的欄位為 None。
+        """
+        countries = list(self.countries or countries) if self.per_country else [None]
+        pages = list(self.pages or pages) if self.paged else [None]
+        return [(country, page) for country in countries for page in pages]
+
+    def list_page(self, service, base_url, lang_dict, country_code, page, user_agent):
+        """
+        載入一個列表頁，回傳其上的號碼 [{'number', 'url', 'country', 'list_meta'}]；列表頁載入失敗時回傳 None。
+        """
+        return self.list_numbers(service, base_url, lang_dict, country_code, page, user_agent)
+
+    def check(self, number_info, user_agent, service, base_url, lang_dict):
+        """
+        在此網站的併發上限內檢查單一號碼。
+        """
+        with self._slots:
+            return self.check_number(number_info, user_agent, service, base_url, lang_dict)
+
+    def readiness(self, selector, timeout=None):
+        """
+        依此網站的設定建立頁面就緒偵測策略；未指定 timeout 時使用詳細頁的等待秒數。
+        """
+        return ReadinessStrategy(
+            selector,
+            timeout=self.wait_timeout if timeout is None else timeout,
+            quiet_period=self.readiness_quiet,
+            poll_interval=self.readiness_poll,
+        )
+
+
+class SiteRegistry:
+    """
+    以網域對應網站介面的登錄表；子網域 (例如 www.) 也會對應到同一個網站。
+    """
+
+    def __init__(self):
+        self._by_key = {}
+        self._by_domain = {}
+        self._lock = threading.Lock()
+
+    def register(self, adapter):
+        with self._lock:
+            self._by_key[adapter.key] = adapter
+            self._by_domain[adapter.domain.lower()] = adapter
+        return adapter
+
+    def alias(self, host, key):
+        """
+        讓另一個主機名稱 (可含連接埠，例如鏡像網站或本機測試伺服器) 也對應到已登錄的網站。
+        """
+        with self._lock:
+            self._by_domain[host.lower()] = self._by_key[key]
+
+    def get(self, key):
+        return self._by_key[key]
+
+    def for_url(self, url):
+        """
+        回傳負責此網址的網站介面；沒有對應的網站時回傳 None。
+        """
+        parsed = urlparse(url)
+        adapter = self._by_domain.get(parsed.netloc.lower())
+        if adapter is not None:
+            return adapter
+        host = (parsed.hostname or '').lower()
+        while host:
+            adapter = self._by_domain.get(host)
+            if adapter is not None:
+                return adapter
+            host = host.partition('.')[2]
+        return None
+
+    def __iter__(self):
+        return iter(list(self._by_key.values()))
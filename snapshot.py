@@ -0,0 +1,56 @@
+# snapshot.py
+from collections import namedtuple
+from types import MappingProxyType
+
+
+class Snapshot:
+    """
+    發布給網頁與 API 的號碼快照：號碼列表、時間戳記與依國家分組的索引在建立時一次算好，之後不再改變。
+    更新時建立新的快照，再以單一次指派取代全域的參照；讀取端在請求開始時取得一次參照，
+    整個請求都使用同一份資料，不需要加鎖，也不會看到只更新了一半的列表與時間戳記。
+    號碼本身 (dict) 由所有讀取端共用，只能讀取。
+    """
+
+    __slots__ = ('numbers', 'timestamp', 'by_country')
+
+    def __init__(self, numbers=None, timestamp=0, default_country=None):
+        numbers = None if numbers is None else tuple(numbers)
+        by_country = {}
+        for number in numbers or ():
+            by_country.setdefault(number.get('country') or default_country, []).append(number)
+        object.__setattr__(self, 'numbers', numbers)
+        object.__setattr__(self, 'timestamp', timestamp)
+        object.__setattr__(self, 'by_country', MappingProxyType({k: tuple(v) for k, v in by_country.items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def loaded(self):
+        """
+        是否已有資料 (第一輪爬蟲完成或從歷史資料庫載入前為 False)。
+        """
+        return self.numbers is not None
+
+    def country_numbers(self, country):
+        """
+        回傳屬於 country 的號碼；沒有國家欄位的舊資料歸在建立快照時指定的預設國家。
+        """
+        return self.by_country.get(country, ())
+
+    def __len__(self):
+        return len(self.numbers or ())
+
+
+class KeywordSettings(namedtuple('KeywordSettings', ('filter_mode', 'must_include', 'must_exclude'))):
+    """
+    主頁面的關鍵字篩選設定。修改時建立新的實例並取代全域的參照，讀取端拿到的三個欄位一定屬於同一次設定。
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, filter_mode='contains', must_include=(), must_exclude=()):
+        return super().__new__(cls, filter_mode, tuple(must_include), tuple(must_exclude))
@@ -32,4 +32,101 @@ function prepareSubmit() {
     document.getElementById('json_exclude').value = JSON.stringify(excludeArray);
     
     return true; // 允許表單提交
-}
\ No newline at end of file
+}
+// 依篩選模式決定 /events 使用的關鍵字 (與伺服器端的篩選規則相同)
+function eventsQuery() {
+    const params = new URLSearchParams();
+    const mode = typeof initialMode !== 'undefined' ? initialMode : 'none';
+    const include = (mode === 'contains' || mode === 'both') ? initialInclude : [];
+    const exclude = (mode === 'excludes' || mode === 'both') ? initialExclude : [];
+    params.set('include', include.join(','));
+    params.set('exclude', exclude.join(','));
+    if (typeof currentCountry !== 'undefined' && currentCountry) {
+        params.set('country', currentCountry);
+    }
+    if (eventsCursor) {
+        params.set('since', eventsCursor);
+    }
+    return params.toString();
+}
+
+// 建立一張號碼卡片 (結構與 index.html 相同)
+function createCard(item) {
+    const card = document.createElement('div');
+    const sourceClass = (item.source || '').toLowerCase().replace(/-/g, '').replace('.com', '');
+    card.className = `sms-card source-border-${sourceClass}`;
+    card.dataset.url = item.url;
+
+    const header = document.createElement('div');
+    header.className = 'card-header';
+    const link = document.createElement('a');
+    link.className = 'phone-number';
+    link.href = item.url;
+    link.target = '_blank';
+    link.rel = 'noopener noreferrer';
+    link.textContent = item.number;
+    const time = document.createElement('span');
+    time.className = 'sms-time';
+    header.append(link, time);
+
+    const content = document.createElement('p');
+    content.className = 'sms-content';
+
+    const footer = document.createElement('div');
+    footer.className = 'card-footer';
+    const source = document.createElement('span');
+    source.className = 'source-name';
+    source.textContent = item.source;
+    footer.appendChild(source);
+
+    card.append(header, content, footer);
+    return card;
+}
+
+function findCard(url) {
+    return Array.from(document.querySelectorAll('.sms-card')).find(card => card.dataset.url === url);
+}
+
+// 將推送的變化直接套用到頁面上：更新或新增的號碼移到最前面並標示，已移除的號碼從列表中刪除
+function applyNumbersEvent(payload) {
+    const grid = document.querySelector('.sms-grid');
+    if (!grid) {
+        // 頁面還在載入中或目前沒有任何結果，直接重新載入取得完整列表
+        if (payload.numbers.length > 0) {
+            window.location.reload();
+        }
+        return;
+    }
+    payload.removed.forEach(url => {
+        const card = findCard(url);
+        if (card) {
+            card.remove();
+        }
+    });
+    payload.numbers.forEach(item => {
+        const card = findCard(item.url) || createCard(item);
+        card.querySelector('.sms-time').textContent = item.last_time || '';
+        card.querySelector('.sms-content').textContent = item.last_sms || '';
+        grid.prepend(card);
+        card.classList.remove('sms-card-updated');
+        void card.offsetWidth; // 重新觸發動畫
+        card.classList.add('sms-card-updated');
+    });
+}
+
+// 訂閱伺服器推送的新簡訊；瀏覽器不支援時退回每 60 秒重新載入
+document.addEventListener('DOMContentLoaded', () => {
+    if (typeof eventsUrl === 'undefined' || eventsCursor === null) {
+        return;
+    }
+    if (!window.EventSource) {
+        setTimeout(() => window.location.reload(), 60000);
+        return;
+    }
+    const source = new EventSource(`${eventsUrl}?${eventsQuery()}`);
+    source.addEventListener('numbers', event => applyNumbersEvent(JSON.parse(event.data)));
+    source.addEventListener('reset', () => {
+        source.close();
+        window.location.reload();
+    });
+});
@@ -0,0 +1,116 @@
+# storage.py
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS numbers (
+    url TEXT PRIMARY KEY,
+    source TEXT,
+    number TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    number TEXT NOT NULL,
+    content TEXT NOT NULL,
+    time_bucket INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (source, number, content, time_bucket)
+);
+CREATE INDEX IF NOT EXISTS idx_messages_number ON messages (source, number, last_seen);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SmsStore:
+    """
+    以 SQLite 保存最近一次的號碼快照與所有看過的簡訊歷史，讓程式重新啟動後可以立即顯示上次的資料。
+    簡訊以 (來源, 號碼, 內容, 時間區間) 去除重複。
+    """
+
+    def __init__(self, path, message_bucket_seconds=86400):
+        self.path = path
+        self.message_bucket_seconds = max(1, int(message_bucket_seconds))
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def save_snapshot(self, numbers, timestamp):
+        """
+        在單一交易中以批次寫入取代號碼快照，並將所有簡訊併入歷史紀錄。
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM numbers")
+            self._write_numbers(numbers, timestamp)
+
+    def save_changes(self, numbers, removed_urls, timestamp):
+        """
+        只更新快照中有變化的號碼 (例如輪詢檢查的結果)：寫入 numbers 並將其簡訊併入歷史紀錄，
+        刪除 removed_urls 的號碼，其餘號碼不動。
+        """
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM numbers WHERE url = ?", [(url,) for url in removed_urls])
+            self._write_numbers(numbers, timestamp)
+
+    def _write_numbers(self, numbers, timestamp):
+        now = time.time()
+        bucket = int(now // self.message_bucket_seconds)
+        number_rows = [
+            (item['url'], item.get('source'), item.get('number'), json.dumps(item, ensure_ascii=False))
+            for item in numbers
+        ]
+        message_rows = [
+            (item.get('source') or '', item.get('number') or '', sms, bucket, now, now)
+            for item in numbers
+            for sms in item.get('smss', [])
+        ]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO numbers (url, source, number, data) VALUES (?, ?, ?, ?)",
+            number_rows,
+        )
+        self._conn.executemany(
+            "INSERT INTO messages (source, number, content, time_bucket, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (source, number, content, time_bucket) DO UPDATE SET last_seen = excluded.last_seen",
+            message_rows,
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('snapshot_timestamp', ?)",
+            (repr(timestamp),),
+        )
+
+    def load_snapshot(self):
+        """
+        讀取最近一次的號碼快照，回傳 (numbers, timestamp)；尚無快照時回傳 (None, 0)。
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'snapshot_timestamp'").fetchone()
+            if row is None:
+                return None, 0
+            numbers = [json.loads(data) for (data,) in self._conn.execute("SELECT data FROM numbers ORDER BY rowid")]
+        return numbers, float(row[0])
+
+    def message_history(self, source, number, limit=100):
+        """
+        依最後出現時間由新到舊，回傳某個號碼的簡訊歷史。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT content, first_seen, last_seen FROM messages "
+                "WHERE source = ? AND number = ? ORDER BY last_seen DESC, id DESC LIMIT ?",
+                (source, number, limit),
+            ).fetchall()
+        return [{'content': content, 'first_seen': first_seen, 'last_seen': last_seen} for content, first_seen, last_seen in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
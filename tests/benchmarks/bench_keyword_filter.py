@@ -0,0 +1,71 @@
+"""
+比較原本逐一比對關鍵字的篩選方式與 keyword_matcher 的編譯式篩選 (預先計算比對文字) 的耗時。
+"first" 為該組關鍵字第一次篩選這份資料，"repeat" 為之後的請求 (比對結果已被記住)。
+
+執行方式 (在專案根目錄):
+    python -m tests.benchmarks.bench_keyword_filter
+"""
+import argparse
+import random
+import string
+import timeit
+
+from keyword_matcher import apply_keyword_filter, compile_keywords, normalize_sms_text
+
+
+def legacy_filter(numbers, include_keywords, exclude_keywords):
+    """原本的實作：每次請求都重新組合並轉小寫所有簡訊，再逐一比對每個關鍵字。"""
+    if not include_keywords and not exclude_keywords:
+        return numbers
+    inc_lower = [k.lower() for k in include_keywords]
+    exc_lower = [k.lower() for k in exclude_keywords]
+    filtered_numbers = []
+    for item in numbers:
+        all_sms_text = " ".join(item.get('smss', [])).lower()
+        if any(k in all_sms_text for k in exc_lower if k):
+            continue
+        if inc_lower and not any(k in all_sms_text for k in inc_lower if k):
+            continue
+        filtered_numbers.append(item)
+    return filtered_numbers
+
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_letters) for _ in range(rng.randint(3, 9)))
+
+
+def make_dataset(rng, count, messages, vocabulary):
+    numbers = []
+    for i in range(count):
+        smss = [" ".join(rng.choice(vocabulary) for _ in range(12)) for _ in range(messages)]
+        numbers.append({'number': f'+{i}', 'smss': smss, 'search_text': normalize_sms_text(smss)})
+    return numbers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword filtering: legacy substring loop vs. compiled matcher.")
+    parser.add_argument('--numbers', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--messages', type=int, default=10, help="Messages per number.")
+    parser.add_argument('--keywords', type=int, default=20, help="Include and exclude keywords each.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [random_word(rng) for _ in range(2000)]
+    include = rng.sample(vocabulary, args.keywords)
+    exclude = rng.sample(vocabulary, args.keywords)
+
+    print(f"{'numbers':>8}{'legacy(ms)':>12}{'first(ms)':>11}{'repeat(ms)':>12}{'speedup':>9}")
+    for count in args.numbers:
+        numbers = make_dataset(rng, count, args.messages, vocabulary)
+        before = min(timeit.repeat(lambda: legacy_filter(numbers, include, exclude), number=1, repeat=args.repeat))
+        compile_keywords.cache_clear()
+        first = timeit.timeit(lambda: apply_keyword_filter(numbers, include, exclude), number=1)
+        repeat = min(timeit.repeat(lambda: apply_keyword_filter(numbers, include, exclude), number=1, repeat=args.repeat))
+        assert apply_keyword_filter(numbers, include, exclude) == legacy_filter(numbers, include, exclude)
+        print(f"{count:>8}{before * 1000:>12.2f}{first * 1000:>11.2f}{repeat * 1000:>12.2f}{before / repeat:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
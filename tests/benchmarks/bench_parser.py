@@ -0,0 +1,57 @@
+"""
+比較各頁面的 HTML 解析時間：原本的 html.parser 解析整頁、C 實作的 lxml 解析整頁，以及只解析所需子樹。
+預設使用 tests/fixtures/pages 中由 tests/fixtures/generate_pages.py 產生的合成頁面 (依照三個網站的結構，
+但內容與填充標記都是產生的)，結果適合比較不同解析方式的相對差異。要量測真實頁面時，
+以 --pages 指定從瀏覽器另存的頁面目錄，檔名需以 PARSE_TARGETS 的鍵值開頭 (例如 tempnumber_number_2.html)。
+
+執行方式 (在專案根目錄):
+    python -m tests.benchmarks.bench_parser
+"""
+import argparse
+import os
+import timeit
+
+from page_parser import parse_html, resolve_backend
+from scraper_core import PARSE_TARGETS
+
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fixtures', 'pages')
+
+
+def target_for(filename):
+    for target in sorted(PARSE_TARGETS, key=len, reverse=True):
+        if filename.startswith(target):
+            return target
+    return None
+
+
+def time_parse(markup, backend, only, repeat):
+    return min(timeit.repeat(lambda: parse_html(markup, backend, only), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parse time per saved page.")
+    parser.add_argument('--pages', default=DEFAULT_PAGES_DIR, help="Directory of saved .html pages.")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    fast = resolve_backend('auto')
+    variants = [
+        ('html.parser', 'html.parser', False),
+        (fast, fast, False),
+        (f'{fast}+subtree', fast, True),
+    ]
+    print(f"{'page':<28}{'KB':>6}" + "".join(f"{name + '(ms)':>22}" for name, _, _ in variants) + f"{'speedup':>9}")
+    for filename in sorted(os.listdir(args.pages)):
+        target = target_for(filename)
+        if target is None or not filename.endswith('.html'):
+            continue
+        with open(os.path.join(args.pages, filename), encoding='utf-8') as f:
+            markup = f.read()
+        timings = [time_parse(markup, backend, PARSE_TARGETS[target] if targeted else None, args.repeat)
+                   for _, backend, targeted in variants]
+        print(f"{filename:<28}{len(markup.encode('utf-8')) // 1024:>6}"
+              + "".join(f"{t * 1000:>22.2f}" for t in timings) + f"{timings[0] / timings[-1]:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
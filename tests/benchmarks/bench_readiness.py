@@ -0,0 +1,162 @@
+"""
+比較「WebDriverWait + 固定 sleep」與自適應就緒偵測 (readiness.ReadinessStrategy) 的每個號碼耗時。
+
+預設以真正的 headless Chrome 載入 stub_server.DelayedRenderServer 提供的詳細頁：回應中先不含訊息列，
+再由頁面上的腳本依隨機的時間 (simulation.random_timing，與模擬相同的分布) 逐列插入，
+兩種等待方式都從 driver.get() 開始計時，包含實際的頁面載入時間 (需要已安裝 Chrome 與 chromedriver)。
+頁面是 tests/fixtures/generate_pages.py 產生的合成頁面，可用 --pages 改用從瀏覽器另存的真實頁面。
+沒有 Chrome 的環境可以使用 --driver simulated，以虛擬時鐘模擬頁面渲染；這只是模型，不包含頁面載入時間。
+
+執行方式 (在專案根目錄):
+    python -m tests.benchmarks.bench_readiness --samples 20
+    python -m tests.benchmarks.bench_readiness --chromedriver /path/to/chromedriver --latency-ms 100
+    python -m tests.benchmarks.bench_readiness --driver simulated
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from readiness import ReadinessStrategy
+from tests.benchmarks.simulation import VirtualClock, random_page, random_timing
+from tests.benchmarks.stub_server import DelayedRenderServer
+
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fixtures', 'pages')
+# 原本各網站在 WebDriverWait 之後的固定等待 (settle) 與每次嘗試後的 sleep，以及嘗試次數
+LEGACY_PROFILES = {
+    'freereceivesms': {'settle': 4.0, 'post_attempt': 5.0, 'attempts': 2, 'quiet': 0.8},
+    'receivesmss': {'settle': 2.0, 'post_attempt': 0.0, 'attempts': 1, 'quiet': 0.5},
+    'tempnumber': {'settle': 2.0, 'post_attempt': 0.0, 'attempts': 1, 'quiet': 0.5},
+}
+# WebDriverWait 預設的輪詢間隔
+WEBDRIVER_WAIT_POLL = 0.5
+# 等待訊息列的逾時秒數 (兩種方式相同)
+WAIT_TIMEOUT = 20
+
+
+def legacy_wait(page, clock, profile):
+    """模擬 WebDriverWait(presence_of_element_located) 之後再 time.sleep() 的舊流程。"""
+    while page.row_count() == 0:
+        clock.sleep(WEBDRIVER_WAIT_POLL)
+    clock.sleep(profile['settle'])
+    clock.sleep(profile['post_attempt'])
+
+
+def adaptive_wait(page, clock, profile):
+    ReadinessStrategy('rows', timeout=WAIT_TIMEOUT, quiet_period=profile['quiet'], poll_interval=0.1,
+                      clock=clock.clock, sleep=clock.sleep).wait(page)
+
+
+def legacy_browser_wait(driver, selector, profile):
+    """舊流程本身：WebDriverWait(presence_of_element_located) 之後再 time.sleep()。"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, WAIT_TIMEOUT, poll_frequency=WEBDRIVER_WAIT_POLL).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+    time.sleep(profile['settle'])
+    time.sleep(profile['post_attempt'])
+
+
+def adaptive_browser_wait(driver, selector, profile):
+    ReadinessStrategy(selector, timeout=WAIT_TIMEOUT, quiet_period=profile['quiet'], poll_interval=0.1).wait(driver)
+
+
+def measure(wait_func, profile, samples, seed):
+    rng = random.Random(seed)
+    durations = []
+    for _ in range(samples):
+        clock = VirtualClock()
+        for _ in range(profile['attempts']):
+            page = random_page(clock, rng)
+            wait_func(page, clock, profile)
+        durations.append(clock.now)
+    return durations
+
+
+def measure_browser(driver, server, selector, wait_func, profile, samples, seed):
+    """
+    以瀏覽器載入 samples 個延遲渲染的頁面 (每個號碼 attempts 次)，回傳每個號碼從載入到等待結束的秒數。
+    """
+    rng = random.Random(seed)
+    durations = []
+    for _ in range(samples):
+        start = time.monotonic()
+        for _ in range(profile['attempts']):
+            driver.get(server.url(**random_timing(rng)))
+            wait_func(driver, selector, profile)
+        durations.append(time.monotonic() - start)
+    return durations
+
+
+def start_chrome(chromedriver=None):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    service = Service(executable_path=chromedriver) if chromedriver else Service()
+    return webdriver.Chrome(service=service, options=options)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-number wait time: fixed sleeps vs. adaptive readiness.")
+    parser.add_argument('--driver', choices=('chrome', 'simulated'), default='chrome',
+                        help="'chrome' loads delayed-render pages in real headless Chrome; 'simulated' uses a virtual-clock model.")
+    parser.add_argument('--samples', type=int, default=None,
+                        help="Numbers per site (default: 10 with Chrome, 500 simulated).")
+    parser.add_argument('--pages', default=DEFAULT_PAGES_DIR, help="Directory with <site>_number.html.")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Added response latency per page (Chrome only).")
+    parser.add_argument('--chromedriver', help="Path to chromedriver (default: let Selenium locate it).")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    samples = args.samples or (10 if args.driver == 'chrome' else 500)
+
+    results = {}
+    if args.driver == 'simulated':
+        for site, profile in LEGACY_PROFILES.items():
+            results[site] = (measure(legacy_wait, profile, samples, args.seed),
+                             measure(adaptive_wait, profile, samples, args.seed))
+    else:
+        from scraper_core import MESSAGE_ROW_SPECS
+
+        driver = start_chrome(args.chromedriver)
+        try:
+            for site, profile in LEGACY_PROFILES.items():
+                selector = MESSAGE_ROW_SPECS[site]['rows']
+                server = DelayedRenderServer(os.path.join(args.pages, f'{site}_number.html'), selector,
+                                             args.latency_ms / 1000).start()
+                try:
+                    results[site] = tuple(
+                        measure_browser(driver, server, selector, wait_func, profile, samples, args.seed)
+                        for wait_func in (legacy_browser_wait, adaptive_browser_wait)
+                    )
+                finally:
+                    server.stop()
+        finally:
+            driver.quit()
+
+    pages = 'synthetic (tests/fixtures/generate_pages.py)' if args.pages == DEFAULT_PAGES_DIR else args.pages
+    print(f"driver={args.driver} samples={samples}"
+          + (f" latency={args.latency_ms:.0f}ms pages={pages}" if args.driver == 'chrome' else ""))
+    print(f"{'site':<16}{'strategy':<10}{'mean(s)':>9}{'p50(s)':>9}{'p95(s)':>9}")
+    for site, (before, after) in results.items():
+        for name, durations in (('before', before), ('after', after)):
+            print(f"{site:<16}{name:<10}{statistics.mean(durations):>9.2f}"
+                  f"{percentile(durations, 50):>9.2f}{percentile(durations, 95):>9.2f}")
+        saved = 1 - statistics.mean(after) / statistics.mean(before)
+        print(f"{'':<16}{'saved':<10}{saved:>9.0%}")
+
+
+if __name__ == '__main__':
+    main()
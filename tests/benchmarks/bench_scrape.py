@@ -0,0 +1,294 @@
+"""
+離線的爬蟲吞吐量基準測試：以 tests.benchmarks.stub_server 在本機提供三個網站的列表頁與詳細頁 (可加上延遲)，
+再執行真正的各網站列表頁探索 (discover_numbers) 與 scrape_all_sites，回報每秒頁面數、每個號碼檢查耗時的百分位數、
+尖峰 RSS (本程序加上所有子程序) 與尖峰 Chrome 程序數。
+
+預設的頁面是 tests/fixtures/generate_pages.py 產生的合成頁面 (依照三個網站的結構，每個列表頁 40 個號碼)，
+不是真實網站的存檔，也沒有真實網站的腳本、樣式表與第三方資源，因此結果只能用來比較不同設定之間的相對差異，
+不代表對真實網站的吞吐量。要以真實頁面量測，先用瀏覽器另存各網站的列表頁與詳細頁，再以 --pages 指定該目錄。
+
+預設使用真正的 Chrome (需要已安裝 Chrome 與 chromedriver，可用 --chromedriver 指定路徑)；
+沒有 Chrome 的環境可以使用 --driver http，以 HTTP 取得頁面的簡易 WebDriver 代替瀏覽器 (此時 Chrome 程序數為 0)。
+每輪都會檢查所有號碼 (停用增量更新與自適應輪詢)，也不會下載廣告攔截外掛。
+使用 Chrome 時會另外列出各網站每頁的平均請求數、被攔截的請求數與傳輸量；以 --no-blocking 再跑一次即可比較資源攔截省下的量。
+
+執行方式 (在專案根目錄):
+    python -m tests.benchmarks.bench_scrape --latency-ms 80 --jitter-ms 40
+    python -m tests.benchmarks.bench_scrape --driver http --rounds 1
+    python -m tests.benchmarks.bench_scrape --no-blocking
+    python -m tests.benchmarks.bench_scrape --driver http --parse-workers 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import resource
+import threading
+import time
+from unittest import mock
+
+import driver_pool
+import scraper_core
+from lang import get_lang
+from parse_pool import ParsePool
+from tests.benchmarks.stub_server import HttpPageDriver, StubSiteServer
+
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fixtures', 'pages')
+SITES = ('freereceivesms', 'receivesmss', 'tempnumber')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def process_tree():
+    """
+    讀取 /proc，回傳本程序及其所有子孫程序的 [(pid, 名稱, RSS bytes)]；不是 Linux 時回傳 None。
+    """
+    if not os.path.isdir('/proc/self'):
+        return None
+    parents = {}
+    names = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 程序名稱在括號中且可能含有空白，以最後一個右括號分隔
+        name = stat[stat.index('(') + 1:stat.rindex(')')]
+        fields = stat[stat.rindex(')') + 2:].split()
+        parents[int(entry)] = int(fields[1])
+        names[int(entry)] = name
+    tree = {os.getpid()}
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in tree and pid not in tree:
+                tree.add(pid)
+                changed = True
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    processes = []
+    for pid in tree:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                rss = int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        processes.append((pid, names.get(pid, ''), rss))
+    return processes
+
+
+class ProcessSampler:
+    """在背景定期取樣程序樹，記錄尖峰 RSS 與尖峰 Chrome 程序數。"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_chrome = 0
+        self.supported = process_tree() is not None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        processes = process_tree()
+        if processes is None:
+            # 無法讀取 /proc 時只能取得本程序的尖峰 RSS (Linux 為 KB)
+            self.peak_rss = max(self.peak_rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+            return
+        self.peak_rss = max(self.peak_rss, sum(rss for _, _, rss in processes))
+        self.peak_chrome = max(self.peak_chrome, sum(1 for _, name, _ in processes if 'chrom' in name.lower()))
+
+    def __enter__(self):
+        self.peak_rss = 0
+        self.peak_chrome = 0
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.sample()
+
+        self.sample()
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+class CheckTimer:
+    """包裝各網站介面的 check_number，記錄每個號碼的檢查耗時。"""
+
+    def __init__(self):
+        self.durations = []
+        self._lock = threading.Lock()
+
+    def wrap(self, check_number):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return check_number(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.durations.append(time.perf_counter() - start)
+        return timed
+
+    def reset(self):
+        with self._lock:
+            self.durations = []
+
+
+def run_scenario(name, servers, timer, sampler, func, verbose):
+    for server in servers:
+        server.reset()
+    timer.reset()
+    start = time.perf_counter()
+    with sampler:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            numbers = func()
+    elapsed = time.perf_counter() - start
+    pages = sum(server.pages_served() for server in servers)
+    durations = timer.durations
+    return {
+        'scenario': name,
+        'pages': pages,
+        'seconds': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed else 0.0,
+        'checked': len(durations),
+        'active': len(numbers or []),
+        'p50': percentile(durations, 50),
+        'p95': percentile(durations, 95),
+        'p99': percentile(durations, 99),
+        'peak_rss_mb': sampler.peak_rss / (1024 * 1024),
+        'peak_chrome': sampler.peak_chrome if sampler.supported else None,
+    }
+
+
+def print_report(rows):
+    print(f"{'scenario':<22}{'pages':>7}{'sec':>8}{'pages/s':>9}{'checked':>9}{'active':>8}"
+          f"{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}{'RSS(MB)':>9}{'chrome':>8}")
+    for row in rows:
+        chrome = '-' if row['peak_chrome'] is None else row['peak_chrome']
+        print(f"{row['scenario']:<22}{row['pages']:>7}{row['seconds']:>8.2f}{row['pages_per_sec']:>9.1f}"
+              f"{row['checked']:>9}{row['active']:>8}{row['p50'] * 1000:>9.0f}{row['p95'] * 1000:>9.0f}"
+              f"{row['p99'] * 1000:>9.0f}{row['peak_rss_mb']:>9.1f}{chrome:>8}")
+
+
+def print_resource_report(sites):
+    rows = [(site, scraper_core.PAGE_REQUESTS.count(site)) for site in sites]
+    if not any(pages for _, pages in rows):
+        return
+    print(f"{'site':<22}{'pages':>7}{'req/page':>10}{'blocked/page':>14}{'KB/page':>10}")
+    for site, pages in rows:
+        if not pages:
+            continue
+        print(f"{site:<22}{pages:>7}{scraper_core.PAGE_REQUESTS.total(site) / pages:>10.1f}"
+              f"{scraper_core.PAGE_BLOCKED_REQUESTS.total(site) / pages:>14.1f}"
+              f"{scraper_core.PAGE_BYTES.total(site) / pages / 1024:>10.1f}")
+
+
+def make_service(args):
+    if args.driver == 'http':
+        return None
+    from selenium.webdriver.chrome.service import Service
+    return Service(executable_path=args.chromedriver) if args.chromedriver else Service()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper throughput against a local stub of the SMS sites.")
+    parser.add_argument('--pages', default=DEFAULT_PAGES_DIR,
+                        help="Directory with <site>_list.html and <site>_number.html (default: the synthetic generated pages).")
+    parser.add_argument('--sites', nargs='+', choices=SITES, default=list(SITES))
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Added response latency per page.")
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help="Uniform +/- jitter added to the latency.")
+    parser.add_argument('--rounds', type=int, default=2, help="How many times to repeat every scenario.")
+    parser.add_argument('--driver', choices=('chrome', 'http'), default='chrome',
+                        help="'chrome' launches real headless Chrome; 'http' uses a browser-less stand-in.")
+    parser.add_argument('--chromedriver', help="Path to chromedriver (default: let Selenium locate it).")
+    parser.add_argument('--no-blocking', action='store_true', help="Disable request-level resource blocking and image loading.")
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help="Parse number pages in a process pool of this size (0 = inline; default: config.toml).")
+    parser.add_argument('--skip-all', action='store_true', help="Only run the per-site scenarios, not scrape_all_sites.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's own log output.")
+    args = parser.parse_args()
+    scraper_core.configure()
+
+    servers = {
+        site: StubSiteServer(site, args.pages, args.latency_ms / 1000, args.jitter_ms / 1000, seed=args.seed + i).start()
+        for i, site in enumerate(args.sites)
+    }
+    for site, server in servers.items():
+        scraper_core.SITE_REGISTRY.alias(server.netloc, site)
+
+    timer = CheckTimer()
+    sampler = ProcessSampler()
+    service = make_service(args)
+    lang_dict = get_lang('en')
+    user_agent = scraper_core.HEADERS.get('User-Agent', 'Mozilla/5.0')
+
+    with contextlib.ExitStack() as stack:
+        # 每輪都檢查所有號碼，且本機頁面不需要廣告攔截外掛
+        stack.enter_context(mock.patch.object(scraper_core, 'REFRESHER', None))
+        stack.enter_context(mock.patch.object(scraper_core, 'SCHEDULER', None))
+        stack.enter_context(mock.patch.object(scraper_core, 'setup_adblocker', lambda lang_dict: None))
+        if args.driver == 'http':
+            stack.enter_context(mock.patch.object(driver_pool.webdriver, 'Chrome', HttpPageDriver))
+        if args.no_blocking:
+            stack.enter_context(mock.patch.object(scraper_core, 'BLOCKING_ENABLED', False))
+        if args.parse_workers is not None:
+            parse_pool = ParsePool(args.parse_workers) if args.parse_workers > 0 else None
+            stack.enter_context(mock.patch.object(scraper_core, 'PARSE_POOL', parse_pool))
+            if parse_pool is not None:
+                stack.callback(parse_pool.close)
+        for site in servers:
+            adapter = scraper_core.SITE_REGISTRY.get(site)
+            stack.enter_context(mock.patch.object(adapter, 'check_number', timer.wrap(adapter.check_number)))
+            if args.no_blocking:
+                stack.enter_context(mock.patch.object(adapter, 'blocked_urls', ()))
+        stack.callback(scraper_core.close_driver_pools)
+
+        rows = []
+        for round_index in range(1, args.rounds + 1):
+            for site, server in servers.items():
+                adapter = scraper_core.SITE_REGISTRY.get(site)
+                rows.append(run_scenario(
+                    f'{site} #{round_index}', [server], timer, sampler,
+                    lambda: scraper_core.discover_numbers(adapter, service, server.base_url, lang_dict,
+                                                          scraper_core.COUNTRIES, scraper_core.PAGES, user_agent),
+                    args.verbose,
+                ))
+                scraper_core.drain_driver_pools()
+            if not args.skip_all:
+                target_urls = [server.base_url for server in servers.values()]
+                rows.append(run_scenario(
+                    f'scrape_all_sites #{round_index}', list(servers.values()), timer, sampler,
+                    lambda: scraper_core.scrape_all_sites(service, target_urls, lang_dict),
+                    args.verbose,
+                ))
+
+    for server in servers.values():
+        server.stop()
+    pages = 'synthetic (tests/fixtures/generate_pages.py)' if args.pages == DEFAULT_PAGES_DIR else args.pages
+    print(f"pages={pages}")
+    print(f"driver={args.driver} latency={args.latency_ms:.0f}±{args.jitter_ms:.0f}ms "
+          f"pool_size={scraper_core.DRIVER_POOL_SIZE} max_workers={scraper_core.MAX_WORKERS} "
+          f"blocking={'off' if args.no_blocking else 'on'} "
+          f"parse_workers={scraper_core.PARSE_WORKERS if args.parse_workers is None else args.parse_workers}")
+    print_report(rows)
+    print_resource_report(servers)
+
+
+if __name__ == '__main__':
+    main()
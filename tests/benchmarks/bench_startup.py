@@ -0,0 +1,64 @@
+"""
+以 python -X importtime 量測各啟動模式的冷啟動匯入成本，並列出最耗時的模組。
+"ui" 對應 --test-ui / --serve-only (只匯入 main)，"scraper" 為一般模式第一次爬蟲時另外載入的 scraper_core。
+
+執行方式 (在專案根目錄):
+    python -m tests.benchmarks.bench_startup
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODES = {
+    'ui': "import main",
+    'scraper': "import main, scraper_core",
+}
+# 網頁 / API 模式不應載入的爬蟲相關套件
+SCRAPER_ONLY_MODULES = ('selenium', 'webdriver_manager', 'pyngrok', 'waitress', 'scraper_core', 'bs4', 'lxml', 'requests')
+
+
+def import_profile(code):
+    """
+    在新的直譯器中執行 code，回傳 {模組名稱: (自身微秒, 累計微秒)}。
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def loaded_packages(profile, packages=SCRAPER_ONLY_MODULES):
+    """
+    回傳 profile 中出現的 packages (含其子模組)。
+    """
+    return sorted(package for package in packages
+                  if any(name == package or name.startswith(package + '.') for name in profile))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import cost per startup mode.")
+    parser.add_argument('--top', type=int, default=10, help="Show the N modules with the highest cumulative time.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per mode (the fastest is reported).")
+    args = parser.parse_args()
+
+    for mode, code in MODES.items():
+        runs = [import_profile(code) for _ in range(args.repeat)]
+        profile = min(runs, key=lambda p: sum(self_us for self_us, _ in p.values()))
+        total_ms = sum(self_us for self_us, _ in profile.values()) / 1000
+        print(f"== {mode}: {code!r} total={total_ms:.1f}ms modules={len(profile)} "
+              f"scraper packages={loaded_packages(profile) or 'none'}")
+        top = sorted(profile.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in top:
+            print(f"   {name:<40}{cumulative_us / 1000:>10.1f}ms{self_us / 1000:>10.1f}ms self")
+
+
+if __name__ == '__main__':
+    main()
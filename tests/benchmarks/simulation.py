@@ -0,0 +1,61 @@
+"""
+以虛擬時鐘模擬頁面渲染過程，讓等待策略的基準測試不需要真的啟動瀏覽器或等待。
+"""
+import random
+
+
+class VirtualClock:
+    """可手動推進的時鐘，同時提供 clock() 與 sleep()。"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class SimulatedPage:
+    """
+    模擬一個逐步渲染的詳細頁面：第一列訊息在 first_row_at 秒出現，
+    之後每 row_interval 秒多一列，直到 total_rows 列；ready_at 秒後 readyState 變為 complete。
+    """
+
+    def __init__(self, clock, first_row_at, row_interval, total_rows, ready_at):
+        self.clock = clock
+        self.start = clock.now
+        self.first_row_at = first_row_at
+        self.row_interval = row_interval
+        self.total_rows = total_rows
+        self.ready_at = ready_at
+
+    def row_count(self):
+        elapsed = self.clock.now - self.start
+        if elapsed < self.first_row_at:
+            return 0
+        if self.row_interval <= 0:
+            return self.total_rows
+        return min(self.total_rows, 1 + int((elapsed - self.first_row_at) / self.row_interval))
+
+    def execute_script(self, script, *args):
+        elapsed = self.clock.now - self.start
+        return [self.row_count(), 'complete' if elapsed >= self.ready_at else 'interactive']
+
+
+def random_timing(rng=None):
+    """
+    依照實際網站常見的載入時間產生一組隨機的渲染時間 (SimulatedPage 與 DelayedRenderServer 共用)。
+    """
+    rng = rng or random
+    first_row_at = rng.uniform(0.3, 2.0)
+    total_rows = rng.randint(5, 30)
+    row_interval = rng.choice([0.0, rng.uniform(0.01, 0.05)])
+    ready_at = first_row_at + rng.uniform(0.0, 0.5)
+    return {'first_row_at': first_row_at, 'row_interval': row_interval, 'total_rows': total_rows, 'ready_at': ready_at}
+
+
+def random_page(clock, rng=None):
+    """依照實際網站常見的載入時間產生一個隨機頁面。"""
+    return SimulatedPage(clock, **random_timing(rng))
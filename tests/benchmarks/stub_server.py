@@ -0,0 +1,206 @@
+"""
+在本機以保存的頁面模擬三個簡訊網站，讓爬蟲的基準測試不需要連到真實網站。
+bench_scrape 預設提供 tests/fixtures/generate_pages.py 產生的合成頁面；也可以指定從瀏覽器另存的真實頁面目錄。
+每個網站使用自己的 HTTP 伺服器 (不同連接埠)：列表頁中連結到的路徑 (號碼詳細頁) 回傳 <site>_number.html，
+其他路徑都回傳 <site>_list.html，每個回應都會延遲 latency ± jitter 秒。
+DelayedRenderServer 則提供訊息列由頁面腳本延遲插入的詳細頁，供 bench_readiness 以真正的瀏覽器量測等待策略。
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from bs4 import BeautifulSoup
+
+from row_extractor import EXTRACT_ROWS_SCRIPT, extract_rows_from_soup
+
+HREF = re.compile(rb'href="(/[^"]*)"')
+
+
+class StubSiteServer:
+    """以保存的列表頁與詳細頁回應請求，並記錄已送出的頁面數。"""
+
+    def __init__(self, site, pages_dir, latency=0.0, jitter=0.0, seed=None):
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = {}
+        for kind in ('list', 'number'):
+            with open(os.path.join(pages_dir, f'{site}_{kind}.html'), 'rb') as f:
+                self.pages[kind] = f.read()
+        self.number_paths = {path.decode() for path in HREF.findall(self.pages['list'])}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = {'list': 0, 'number': 0}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def netloc(self):
+        host, port = self._server.server_address[:2]
+        return f'{host}:{port}'
+
+    @property
+    def base_url(self):
+        return f'http://{self.netloc}'
+
+    def pages_served(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def reset(self):
+        with self._lock:
+            self.requests = {'list': 0, 'number': 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delay(self):
+        with self._lock:
+            offset = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                kind = 'number' if self.path.split('?', 1)[0] in stub.number_paths else 'list'
+                with stub._lock:
+                    stub.requests[kind] += 1
+                time.sleep(stub._delay())
+                body = stub.pages[kind]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# 延遲渲染頁面插入訊息列的腳本：first / interval 秒數與列數由網址的查詢參數指定
+RENDER_SCRIPT = """<script>
+(function () {
+  var rows = %s, params = new URLSearchParams(location.search);
+  var first = parseFloat(params.get('first') || '0') * 1000, interval = parseFloat(params.get('interval') || '0') * 1000;
+  var total = Math.min(rows.length, parseInt(params.get('rows') || rows.length, 10));
+  var container = document.querySelector('[data-stub-rows]');
+  function add(i) {
+    if (interval <= 0) { container.insertAdjacentHTML('beforeend', rows.slice(i, total).join('')); return; }
+    container.insertAdjacentHTML('beforeend', rows[i]);
+    if (i + 1 < total) { setTimeout(function () { add(i + 1); }, interval); }
+  }
+  if (total > 0) { setTimeout(function () { add(0); }, first); }
+})();
+</script>"""
+
+
+class DelayedRenderServer:
+    """
+    以延遲渲染的方式提供一個號碼詳細頁，讓等待策略可以用真正的瀏覽器量測：回應中先不含訊息列，
+    頁面上的腳本在 first 秒後插入第一列，之後每 interval 秒插入一列 (interval 為 0 時一次插入)，直到 rows 列。
+    每個回應都會延遲 latency 秒。
+    """
+
+    def __init__(self, page_path, rows_selector, latency=0.0):
+        self.latency = latency
+        with open(page_path, encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        rows = soup.select(rows_selector)
+        if not rows:
+            raise ValueError(f"no element matches '{rows_selector}' in {page_path}")
+        rows[0].parent['data-stub-rows'] = ''
+        markup = [str(row.extract()) for row in rows]
+        script = RENDER_SCRIPT % json.dumps(markup).replace('</', '<\\/')
+        self.max_rows = len(markup)
+        self.body = str(soup).replace('</body>', script + '</body>', 1).encode('utf-8')
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url(self, first_row_at, row_interval, total_rows, **timing):
+        """
+        回傳依指定時間渲染的頁面網址；可直接傳入 simulation.random_timing() 的結果 (ready_at 由瀏覽器決定，不使用)。
+        """
+        return f'{self.base_url}/number?first={first_row_at:.3f}&interval={row_interval:.3f}&rows={total_rows}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(stub.latency)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class HttpPageDriver:
+    """
+    給沒有安裝 Chrome 的環境使用的簡易 WebDriver：以 HTTP 取得頁面，
+    並以 BeautifulSoup 回答就緒偵測與訊息列擷取的腳本。不執行 JavaScript，也不會啟動任何瀏覽器程序。
+    """
+
+    def __init__(self, service=None, options=None):
+        self.session = requests.Session()
+        self.current_url = None
+        self.page_source = ''
+        self._soup = None
+        self._timeout = 30
+
+    def set_page_load_timeout(self, seconds):
+        self._timeout = seconds
+
+    def get(self, url):
+        response = self.session.get(url, timeout=self._timeout)
+        self.current_url = url
+        self.page_source = response.text
+        self._soup = None
+
+    def execute_script(self, script, *args):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.page_source, 'html.parser')
+        if script == EXTRACT_ROWS_SCRIPT:
+            rows_selector, fields = args
+            return json.dumps(extract_rows_from_soup(self._soup, {'rows': rows_selector, 'fields': fields}))
+        # 就緒偵測：[符合選擇器的元素數, document.readyState]
+        return [len(self._soup.select(args[0])), 'complete']
+
+    def quit(self):
+        self.session.close()
@@ -0,0 +1,162 @@
+"""
+產生 tests/fixtures/pages 中的測試頁面。這些頁面是合成的，不是從真實網站保存下來的：
+只有解析、就緒偵測與訊息列擷取用到的標記 (列表項目、訊息列、時間與內容的 class) 依照三個網站的結構撰寫，
+號碼 (+1 開頭的隨機號碼)、時間與簡訊內容都由固定的亂數種子產生；
+其餘的 hreflang 連結、.cN 樣式、設定腳本、導覽列、廣告欄位與頁尾只是填充，讓頁面大小接近真實頁面 (約 80 KB)。
+
+執行方式 (在專案根目錄):
+    python -m tests.fixtures.generate_pages
+    python -m tests.fixtures.generate_pages --out /tmp/pages --seed 7
+"""
+import argparse
+import os
+import random
+
+DEFAULT_OUT_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+# 號碼詳細頁的標題號碼，依網站順序遞增
+TITLE_NUMBERS = {'freereceivesms': '+12025550100', 'receivesmss': '+12025550101', 'tempnumber': '+12025550102'}
+WORDS = ('account', 'amazon', 'anyone', 'code', 'do', 'facebook', 'for', 'google', 'is', 'login', 'minutes', 'not',
+         'share', 'telegram', 'this', 'valid', 'verification', 'whatsapp', 'with', 'your')
+LIST_ENTRIES = 40
+MESSAGE_ROWS = 30
+
+
+def page_shell(title, content):
+    """
+    包住頁面主要內容的填充標記：head 中的 hreflang、樣式與腳本，body 中的導覽列、廣告欄位與頁尾。
+    """
+    head = [f'<html lang="en"><head><meta charset="utf-8"><title>{title}</title>']
+    head += [f'<link rel="alternate" hreflang="l{i}" href="/l{i}/">' for i in range(40)]
+    head += ['<style>'] + [f'.c{i} {{ margin: {i % 7}px; padding: {i % 5}px; color: #{i:06x}; }}' for i in range(600)]
+    head += ['</style>', '<script>']
+    head += [f"window.__cfg{i} = {{id: {i}, name: 'module{i}', enabled: {'true' if i % 2 == 0 else 'false'}}};"
+             for i in range(400)]
+    head += ['</script>', '</head><body>']
+    nav = ''.join(f'<li class="nav-item"><a class="nav-link" href="/country/{i}/">Country {i}</a></li>' for i in range(80))
+    ads = ''.join(f'<div class="ad-slot"><ins class="adsbygoogle" data-ad-slot="{i}"></ins>'
+                  '<script>(adsbygoogle = window.adsbygoogle || []).push({});</script></div>' for i in range(10))
+    footer = ''.join(
+        f'<div class="col-md-3"><h5>Section {s}</h5><ul>'
+        + ''.join(f'<li><a href="/p/{s}/{i}">Link {i}</a></li>' for i in range(15))
+        + '</ul></div>'
+        for s in range(6)
+    )
+    body = (f'<nav class="navbar navbar-expand-lg"><div class="container"><ul class="navbar-nav">{nav}</ul></div></nav>'
+            f'<div class="container">{content}</div>{ads}'
+            f'<footer class="footer"><div class="row">{footer}</div></footer></body></html>')
+    return '<!DOCTYPE html>\n' + '\n'.join(head) + '\n' + body
+
+
+def random_number(rng):
+    return f"1{rng.randint(200, 999)}{rng.randint(0, 9999999):07d}"
+
+
+def message_times(rng):
+    """
+    由新到舊的訊息時間：最新三則在一小時內，接著五則以小時計，其餘以天計。
+    """
+    return ([f'{rng.randint(1, 59)} minutes ago' for _ in range(3)]
+            + [f'{rng.randint(1, 23)} hours ago' for _ in range(5)]
+            + [f'{rng.randint(1, 20)} days ago' for _ in range(MESSAGE_ROWS - 8)])
+
+
+def message_text(rng):
+    return f"{rng.randint(100000, 999999)} " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16)))
+
+
+def freereceivesms_list(rng):
+    items = []
+    for _ in range(LIST_ENTRIES):
+        number = random_number(rng)
+        items.append('<div class="col-sm-6 col-md-4 col-lg-3 number-boxes-item"><div class="card"><div class="card-body">\n'
+                     f'<h4 class="card-title">+{number}</h4><p class="card-text">United States</p>'
+                     f'<p class="small">Last SMS {rng.randint(1, 59)} minutes ago</p>\n'
+                     f'<a class="btn btn-outline-info btn-sm" href="/us/{number}/">Receive SMS</a></div></div></div>')
+    return 'US numbers', '<div class="row number-boxes">' + ''.join(items) + '</div>'
+
+
+def freereceivesms_number(rng):
+    rows = []
+    for i, time_text in enumerate(message_times(rng)):
+        rows.append(f'<div class="row border-bottom table-hover"><div class="col-xs-12 col-md-2"><a href="/sender/{i}/">Sender{i}</a>\n'
+                    f'<div class="d-block d-lg-none ml-2">{time_text}</div></div>'
+                    f'<div class="d-none d-lg-block col-lg-2"><span>{time_text}</span></div>\n'
+                    f'<div class="col-xs-12 col-md-8 col-lg-8"><div>{message_text(rng)}</div></div></div>')
+    title = TITLE_NUMBERS['freereceivesms']
+    return title, f'<h1>{title}</h1><div class="messages">' + ''.join(rows) + '</div>'
+
+
+def receivesmss_list(rng):
+    items = []
+    for _ in range(LIST_ENTRIES):
+        number = random_number(rng)
+        items.append(f'<a href="/sms/{number}/"><div class="number-boxes-item d-flex flex-column">'
+                     f'<div class="number-boxes-itemm-number">+{number}</div>\n'
+                     '<div class="number-boxes-item-country">United States</div><span class="btn">Open</span></div></a>')
+    return 'Receive SMS', '<div class="number-boxes">' + ''.join(items) + '</div>'
+
+
+def receivesmss_number(rng):
+    rows = []
+    for i, time_text in enumerate(message_times(rng)):
+        rows.append(f'<div class="row border-bottom py-2"><div class="col-md-2"><label>Sender</label><a href="/s/{i}">S{i}</a></div>\n'
+                    f'<div class="col-md-8"><label>Message</label>{message_text(rng)}</div>'
+                    f'<div class="col-md-2 text-right"><label>Time</label><span class="text-muted">{time_text}</span></div></div>')
+    return TITLE_NUMBERS['receivesmss'], '<div class="message_details">' + ''.join(rows) + '</div>'
+
+
+def tempnumber_list(rng):
+    items = []
+    for _ in range(LIST_ENTRIES):
+        number = random_number(rng)
+        items.append(f'<div class="col-md-4"><a class="country-link" href="/temporary-numbers/United-States/{number}/1">'
+                     '<div class="country-box">\n'
+                     f'<h4>{number}</h4><span class="add_time-top">{rng.randint(1, 59)} min ago</span></div></a></div>')
+    return 'United States', '<div class="row">' + ''.join(items) + '</div>'
+
+
+def tempnumber_number(rng):
+    rows = []
+    for i, time_text in enumerate(message_times(rng)):
+        rows.append('<div class="direct-chat-msg left"><div class="direct-chat-info clearfix">'
+                    f'<span class="direct-chat-name">From S{i}</span>\n'
+                    f'<time class="direct-chat-timestamp">{time_text}</time></div>'
+                    f'<div class="direct-chat-text">{message_text(rng)}</div></div>')
+    return TITLE_NUMBERS['tempnumber'], '<div class="direct-chat-messages">' + ''.join(rows) + '</div>'
+
+
+# 頁面名稱 (與 PARSE_TARGETS 的鍵值相同) 對應產生 (標題, 主要內容) 的函式
+PAGES = {
+    'freereceivesms_list': freereceivesms_list,
+    'freereceivesms_number': freereceivesms_number,
+    'receivesmss_list': receivesmss_list,
+    'receivesmss_number': receivesmss_number,
+    'tempnumber_list': tempnumber_list,
+    'tempnumber_number': tempnumber_number,
+}
+
+
+def generate(name, seed=42):
+    """
+    產生一個頁面的 HTML；相同的名稱與種子一定產生相同的內容。
+    """
+    title, content = PAGES[name](random.Random(f'{seed}:{name}'))
+    return page_shell(title, content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the synthetic test pages in tests/fixtures/pages.")
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help="Output directory.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name in PAGES:
+        path = os.path.join(args.out, f'{name}.html')
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(generate(name, args.seed))
+        print(f"{path}: {os.path.getsize(path)} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+from artifact_cache import ArtifactCache, IntegrityError, detect_chrome_version, major_version
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(str(tmp_path / "artifacts"))
+
+def write_driver(content):
+    def populate(staging):
+        with open(os.path.join(staging, 'chromedriver'), 'wb') as f:
+            f.write(content)
+    return populate
+
+def test_put_then_get_round_trip(cache):
+    """存入的項目應能以相同的 (名稱, 鍵值) 取回，並通過完整性檢查。"""
+    path = cache.put('chromedriver', '124', write_driver(b'driver-124'), source='test')
+    assert cache.get('chromedriver', '124') == path
+    with open(os.path.join(path, 'chromedriver'), 'rb') as f:
+        assert f.read() == b'driver-124'
+    assert cache.get('chromedriver', '125') is None
+
+def test_tampered_file_fails_integrity_check(cache):
+    """快取中的檔案被修改後，讀取時應拋出 IntegrityError。"""
+    path = cache.put('chromedriver', '124', write_driver(b'driver-124'))
+    with open(os.path.join(path, 'chromedriver'), 'wb') as f:
+        f.write(b'corrupted')
+    with pytest.raises(IntegrityError):
+        cache.get('chromedriver', '124')
+
+def test_failed_populate_leaves_no_entry(cache):
+    """寫入失敗時不應留下不完整的項目，也不影響既有的項目。"""
+    cache.put('chromedriver', '124', write_driver(b'old'))
+
+    def broken(staging):
+        write_driver(b'partial')(staging)
+        raise OSError("download interrupted")
+
+    with pytest.raises(OSError):
+        cache.put('chromedriver', '125', broken)
+    assert cache.keys('chromedriver') == ['124']
+
+def test_keys_are_newest_first(cache):
+    """數字鍵值應依數值由新到舊排序。"""
+    for key in ('9', '124', '100'):
+        cache.put('chromedriver', key, write_driver(key.encode()))
+    assert cache.keys('chromedriver') == ['124', '100', '9']
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason="uses a shell script as a fake Chrome binary")
+def test_detect_chrome_version_from_binary(tmp_path):
+    """應從 `chrome --version` 的輸出解析出完整版本，並以主版本作為快取鍵值。"""
+    fake_chrome = tmp_path / "chrome"
+    fake_chrome.write_text("#!/bin/sh\necho 'Google Chrome 124.0.6367.91 '\n")
+    fake_chrome.chmod(0o755)
+    version = detect_chrome_version(str(fake_chrome))
+    assert version == '124.0.6367.91'
+    assert major_version(version) == '124'
+    assert detect_chrome_version(str(tmp_path / "missing")) is None
@@ -0,0 +1,40 @@
+from change_feed import ChangeFeed
+
+
+def number(url, smss):
+    return {'url': url, 'number': url, 'smss': smss}
+
+def make_feed():
+    return ChangeFeed(clock=lambda: 1700000000)
+
+def test_unchanged_snapshot_keeps_revision():
+    """內容沒有變化的快照不應產生新版本。"""
+    feed = make_feed()
+    first = feed.update([number('a', ['x'])])
+    assert feed.update([number('a', ['x'])]) == first == '1700000000-1'
+
+def test_changes_since_reports_new_messages_and_removals():
+    """只回傳游標之後變更的號碼、其新增的簡訊，以及被移除的號碼。"""
+    feed = make_feed()
+    cursor = feed.update([number('a', ['x']), number('b', ['y']), number('c', ['z'])])
+    snapshot = [number('a', ['new', 'x']), number('b', ['y'])]
+    feed.update(snapshot)
+    changed, removed = feed.changes_since(snapshot, feed.parse_cursor(cursor))
+    assert [(item['url'], new_smss) for item, new_smss in changed] == [('a', ['new'])]
+    assert removed == ['c']
+
+def test_invalid_cursors_require_reset():
+    """格式錯誤、來自其他執行期間或比目前版本新的游標都無效。"""
+    feed = make_feed()
+    feed.update([number('a', ['x'])])
+    assert feed.parse_cursor('1700000000-1') == 1
+    for cursor in ('garbage', '1600000000-1', '1700000000-9'):
+        assert feed.parse_cursor(cursor) is None
+
+def test_trimmed_removals_invalidate_old_cursors():
+    """移除紀錄超過上限被淘汰後，更早的游標必須重新取得完整快照。"""
+    feed = ChangeFeed(max_removed=1, clock=lambda: 1)
+    old = feed.update([number('a', ['x']), number('b', ['y'])])
+    feed.update([number('b', ['y'])])
+    feed.update([])
+    assert feed.parse_cursor(old) is None
@@ -0,0 +1,19 @@
+from countries import configured_countries, country_code, country_name, country_slug
+
+
+def test_names_codes_and_slugs():
+    """國碼與網站上顯示的國家名稱應能互相對應，temp-number.com 的網址以連字號連接。"""
+    assert country_name('gb') == 'United Kingdom'
+    assert country_name('xx') == 'XX'
+    assert country_slug('us') == 'United-States'
+    assert country_code(' united  states ') == 'us'
+    assert country_code('Atlantis') is None
+
+def test_configured_countries_merge_general_and_site_overrides():
+    """應合併 [general] 與各網站的 countries，保留順序且不重複；未設定 countries 時使用 country_code。"""
+    config = {
+        'general': {'country_code': 'us', 'countries': ['US', 'ca']},
+        'sites': {'tempnumber': {'countries': ['gb', 'ca']}, 'freereceivesms': {}},
+    }
+    assert configured_countries(config) == ['us', 'ca', 'gb']
+    assert configured_countries({'general': {'country_code': 'gb'}}) == ['gb']
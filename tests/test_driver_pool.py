@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+import driver_pool
+from driver_pool import DriverPool
+from lang import get_lang
+
+
+class FakeDriver:
+    """模擬 webdriver.Chrome 的最小替身。"""
+
+    def __init__(self, service=None, options=None):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """攔截瀏覽器啟動，並記錄所有建立過的假瀏覽器。"""
+    drivers = []
+
+    def fake_chrome(service=None, options=None):
+        driver = FakeDriver(service, options)
+        drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(driver_pool.webdriver, 'Chrome', fake_chrome)
+    return drivers
+
+
+def make_pool(**kwargs):
+    return DriverPool(None, None, get_lang('en'), **kwargs)
+
+
+def test_driver_is_reused_after_checkin(launched):
+    """歸還後再次借出應取得同一個瀏覽器，而不是重新啟動。"""
+    pool = make_pool(size=2)
+    first = pool.checkout()
+    pool.checkin(first)
+    second = pool.checkout()
+    assert second is first
+    assert len(launched) == 1
+
+def test_driver_recycled_after_max_pages(launched):
+    """達到頁面上限的瀏覽器應被關閉並替換。"""
+    pool = make_pool(size=1, max_pages_per_driver=2)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    assert pool.checkout() is driver
+    pool.checkin(driver)
+    assert driver.quit_called
+    assert pool.checkout() is not driver
+    assert len(launched) == 2
+
+def test_crashed_driver_replaced_on_checkout(launched):
+    """閒置期間崩潰的瀏覽器在借出時應被偵測並替換。"""
+    pool = make_pool(size=1)
+    driver = pool.checkout()
+    pool.checkin(driver)
+    driver.alive = False
+    replacement = pool.checkout()
+    assert replacement is not driver
+    assert driver.quit_called
+
+def test_pool_size_is_bounded(launched):
+    """池滿時借出應阻塞，逾時後拋出 TimeoutError。"""
+    pool = make_pool(size=1, checkout_timeout=0.05)
+    pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout()
+    assert len(launched) == 1
+
+def test_concurrent_checkouts_never_exceed_size(launched):
+    """多執行緒同時借用時，建立的瀏覽器數量不應超過池大小。"""
+    pool = make_pool(size=3, max_pages_per_driver=1000)
+
+    def worker():
+        for _ in range(20):
+            driver = pool.checkout()
+            pool.checkin(driver)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(launched) <= 3
+
+def test_close_quits_idle_and_returned_drivers(launched):
+    """關閉池時應結束閒置瀏覽器，使用中的瀏覽器則在歸還時結束。"""
+    pool = make_pool(size=2)
+    idle = pool.checkout()
+    busy = pool.checkout()
+    pool.checkin(idle)
+    pool.close()
+    assert idle.quit_called
+    assert not busy.quit_called
+    pool.checkin(busy)
+    assert busy.quit_called
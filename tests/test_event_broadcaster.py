@@ -0,0 +1,61 @@
+import json
+
+from event_broadcaster import EventBroadcaster
+
+
+def number(url, text):
+    return {'url': url, 'number': url, 'smss': [text], 'last_sms': text, 'search_text': text.lower()}
+
+def to_public(item):
+    return {'url': item['url'], 'last_sms': item['last_sms']}
+
+def make_batch(*items, removed=()):
+    return EventBroadcaster.make_batch('1-2', [(item, item['smss']) for item in items], removed, to_public)
+
+def test_events_are_filtered_per_subscriber():
+    """每個用戶端只收到符合自己篩選條件的號碼，不符合的號碼視為移除。"""
+    broadcaster = EventBroadcaster()
+    google = broadcaster.subscribe(['google'], [])
+    everything = broadcaster.subscribe([], [])
+    broadcaster.publish(make_batch(number('a', 'Google code'), number('b', 'Telegram code'), removed=['c']))
+
+    cursor, data = google.queue.get_nowait()
+    assert cursor == '1-2'
+    payload = json.loads(data)
+    assert [n['url'] for n in payload['numbers']] == ['a']
+    assert payload['removed'] == ['c', 'b']
+    assert [n['url'] for n in json.loads(everything.queue.get_nowait()[1])['numbers']] == ['a', 'b']
+
+def test_events_are_filtered_by_country():
+    """指定國家的用戶端只收到該國家的號碼；未指定國家時收到全部。"""
+    broadcaster = EventBroadcaster()
+    canada = broadcaster.subscribe([], [], 'ca')
+    everything = broadcaster.subscribe([], [])
+    broadcaster.publish(make_batch(dict(number('a', 'code'), country='us'), dict(number('b', 'code'), country='ca')))
+    assert [n['url'] for n in json.loads(canada.queue.get_nowait()[1])['numbers']] == ['b']
+    assert [n['url'] for n in json.loads(everything.queue.get_nowait()[1])['numbers']] == ['a', 'b']
+
+def test_same_filters_share_rendered_event(mocker):
+    """篩選條件相同的用戶端共用同一份事件內容。"""
+    broadcaster = EventBroadcaster()
+    subscribers = [broadcaster.subscribe(['code'], []) for _ in range(5)]
+    render = mocker.spy(subscribers[0].__class__, 'render')
+    broadcaster.publish(make_batch(number('a', 'code')))
+    assert render.call_count == 1
+    assert len({s.queue.get_nowait()[1] for s in subscribers}) == 1
+
+def test_empty_events_are_not_sent():
+    broadcaster = EventBroadcaster()
+    subscriber = broadcaster.subscribe(['nothing'], ['code'])
+    broadcaster.publish(EventBroadcaster.make_batch('1-2', [], [], to_public))
+    assert subscriber.queue.empty()
+
+def test_subscriber_limit_and_slow_clients():
+    """超過連線上限時拒絕新用戶端；佇列滿的慢速用戶端會被中斷。"""
+    broadcaster = EventBroadcaster(max_subscribers=1, max_queue=1)
+    subscriber = broadcaster.subscribe([], [])
+    assert broadcaster.subscribe([], []) is None
+    broadcaster.publish(make_batch(number('a', 'x')))
+    broadcaster.publish(make_batch(number('a', 'y')))
+    assert subscriber.closed
+    assert len(broadcaster) == 0
@@ -0,0 +1,49 @@
+import gzip
+
+import pytest
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+import http_cache
+from http_cache import compress, encoded_etag, file_digest, make_etag, negotiate_encoding
+
+
+def accept(header):
+    return parse_accept_header(header, Accept)
+
+def test_make_etag_is_stable_and_sensitive():
+    assert make_etag(1.5, 'both', ('a',), ()) == make_etag(1.5, 'both', ('a',), ())
+    assert make_etag(1.5, 'both', ('a',), ()) != make_etag(1.5, 'both', (), ('a',))
+
+def test_negotiate_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(http_cache, 'brotli', None)
+    assert negotiate_encoding(accept('gzip, deflate, br')) == 'gzip'
+    assert negotiate_encoding(accept('identity')) is None
+    assert negotiate_encoding(accept('')) is None
+
+def test_negotiate_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(http_cache, 'brotli', object())
+    assert negotiate_encoding(accept('gzip, br')) == 'br'
+    assert negotiate_encoding(accept('gzip')) == 'gzip'
+
+def test_compress_round_trip():
+    data = b'<html>' * 100
+    assert gzip.decompress(compress(data, 'gzip')) == data
+    assert compress(data, None) is data
+
+def test_encoded_etag():
+    assert encoded_etag('abc', 'gzip') == 'abc-gzip'
+    assert encoded_etag('abc', None) == 'abc'
+
+def test_file_digest_follows_content(tmp_path):
+    path = tmp_path / 'app.js'
+    path.write_text('one')
+    first = file_digest(str(path))
+    path.write_text('two!')
+    assert file_digest(str(path)) != first
+    assert file_digest(str(tmp_path / 'missing.js')) is None
+
+@pytest.mark.skipif(http_cache.brotli is None, reason="brotli 未安裝")
+def test_brotli_round_trip():
+    data = b'<html>' * 100
+    assert http_cache.brotli.decompress(compress(data, 'br')) == data
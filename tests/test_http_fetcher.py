@@ -0,0 +1,53 @@
+import pytest
+import requests
+
+from http_fetcher import HttpFetcher, FetchStats, looks_like_challenge
+
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+@pytest.mark.parametrize("status_code, content, expected", [
+    (200, b"<html><body><div class='number-boxes-item'></div></body></html>", False),
+    (200, b"<html><head><title>Just a moment...</title></head></html>", True),
+    (200, b"<script src='/cdn-cgi/challenge-platform/h/b/orchestrate'></script>", True),
+    (403, b"Forbidden", True),
+    (503, b"", True),
+])
+def test_looks_like_challenge(status_code, content, expected):
+    """測試驗證頁面的判斷。"""
+    assert looks_like_challenge(status_code, content) == expected
+
+def test_fetch_returns_content_on_success(mocker):
+    """正常頁面應回傳原始內容。"""
+    fetcher = HttpFetcher({'User-Agent': 'test'})
+    mocker.patch.object(fetcher.session, 'get', return_value=FakeResponse(200, b"<html>ok</html>"))
+    assert fetcher.fetch("http://example.com") == b"<html>ok</html>"
+
+def test_fetch_returns_none_on_challenge_or_error(mocker):
+    """遇到驗證頁面或連線錯誤時應回傳 None，以便改用 Selenium。"""
+    fetcher = HttpFetcher({'User-Agent': 'test'})
+    mocker.patch.object(fetcher.session, 'get', return_value=FakeResponse(503, b"<title>Just a moment</title>"))
+    assert fetcher.fetch("http://example.com") is None
+    mocker.patch.object(fetcher.session, 'get', side_effect=requests.exceptions.ConnectionError())
+    assert fetcher.fetch("http://example.com") is None
+
+def test_session_uses_configured_headers():
+    """Session 應帶上設定檔中的 headers。"""
+    fetcher = HttpFetcher({'User-Agent': 'custom-agent'})
+    assert fetcher.session.headers['User-Agent'] == 'custom-agent'
+
+def test_fetch_stats_hit_rate():
+    """測試快速路徑命中率的統計。"""
+    stats = FetchStats()
+    stats.record('freereceivesms', 'http')
+    stats.record('freereceivesms', 'http')
+    stats.record('freereceivesms', 'http')
+    stats.record('freereceivesms', 'selenium')
+    counts = stats.snapshot()['freereceivesms']
+    assert counts == {'http': 3, 'selenium': 1}
+    assert FetchStats.hit_rate(counts) == 0.75
+    stats.reset()
+    assert stats.snapshot() == {}
@@ -0,0 +1,65 @@
+from incremental import IncrementalRefresher, sms_fingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_number(url, meta='meta'):
+    return {'number': url, 'url': url, 'list_meta': meta}
+
+def make_result(url, smss):
+    return {'number': url, 'url': url, 'last_sms': smss[0], 'smss': smss, 'last_time': '1 minutes ago'}
+
+def test_unseen_numbers_are_checked():
+    """第一次看到的號碼一定要檢查。"""
+    refresher = IncrementalRefresher()
+    to_check, carried = refresher.plan([make_number('a'), make_number('b')])
+    assert [n['url'] for n in to_check] == ['a', 'b']
+    assert carried == []
+
+def test_unchanged_numbers_are_skipped_and_carried():
+    """列表項目沒有變化且未過期時，不活躍號碼略過，活躍號碼沿用上次結果。"""
+    clock = FakeClock()
+    refresher = IncrementalRefresher(active_max_age=900, inactive_max_age=5400, clock=clock)
+    refresher.record(make_number('active'), make_result('active', ['code 1234']))
+    refresher.record(make_number('inactive'), None)
+    clock.now += 60
+    to_check, carried = refresher.plan([make_number('active'), make_number('inactive')])
+    assert to_check == []
+    assert [r['url'] for r in carried] == ['active']
+
+def test_changed_list_entry_triggers_recheck():
+    """列表頁資訊改變時應重新檢查。"""
+    refresher = IncrementalRefresher()
+    refresher.record(make_number('a', meta='old'), None)
+    to_check, _ = refresher.plan([make_number('a', meta='new')])
+    assert [n['url'] for n in to_check] == ['a']
+
+def test_stale_entries_are_rechecked():
+    """超過時限的號碼應重新檢查，活躍號碼的時限較短。"""
+    clock = FakeClock()
+    refresher = IncrementalRefresher(active_max_age=100, inactive_max_age=1000, clock=clock)
+    refresher.record(make_number('active'), make_result('active', ['hi']))
+    refresher.record(make_number('inactive'), None)
+    clock.now += 500
+    to_check, carried = refresher.plan([make_number('active'), make_number('inactive')])
+    assert [n['url'] for n in to_check] == ['active']
+    assert carried == []
+
+def test_record_reports_sms_changes():
+    """record 應回報簡訊內容是否與上次不同。"""
+    refresher = IncrementalRefresher()
+    assert refresher.record(make_number('a'), make_result('a', ['one'])) is True
+    assert refresher.record(make_number('a'), make_result('a', ['one'])) is False
+    assert refresher.record(make_number('a'), make_result('a', ['two', 'one'])) is True
+
+def test_sms_fingerprint_is_order_and_boundary_sensitive():
+    """指紋應區分訊息順序與分隔位置。"""
+    assert sms_fingerprint(['ab', 'c']) != sms_fingerprint(['a', 'bc'])
+    assert sms_fingerprint(['a', 'b']) != sms_fingerprint(['b', 'a'])
+    assert sms_fingerprint([]) == sms_fingerprint(None)
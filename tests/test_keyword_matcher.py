@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, apply_keyword_filter, compile_keywords, normalize_sms_text, prune_keywords
+
+
+def naive_filter(numbers, include_keywords, exclude_keywords):
+    """原本逐一比對每個關鍵字的實作，作為比較基準。"""
+    if not include_keywords and not exclude_keywords:
+        return numbers
+    inc_lower = [k.lower() for k in include_keywords if k]
+    exc_lower = [k.lower() for k in exclude_keywords if k]
+    result = []
+    for item in numbers:
+        text = " ".join(item.get('smss', [])).lower()
+        if any(k in text for k in exc_lower):
+            continue
+        if inc_lower and not any(k in text for k in inc_lower):
+            continue
+        result.append(item)
+    return result
+
+def test_special_characters_are_matched_literally():
+    """關鍵字中的特殊字元應被當成一般文字。"""
+    numbers = [{'number': '+1', 'smss': ['price: $5 (a+b)']}, {'number': '+2', 'smss': ['price 5 ab']}]
+    assert [n['number'] for n in apply_keyword_filter(numbers, ['$5 (a+b)'], [])] == ['+1']
+    assert [n['number'] for n in apply_keyword_filter(numbers, [], ['.'])] == ['+1', '+2']
+
+def test_precomputed_search_text_is_used():
+    """有 search_text 時應直接使用，不再重新組合簡訊內容。"""
+    numbers = [{'number': '+1', 'smss': ['ignored'], 'search_text': 'google code'}]
+    assert apply_keyword_filter(numbers, ['google'], []) == numbers
+
+def test_compiled_matchers_are_cached():
+    """相同的關鍵字組合只編譯一次。"""
+    assert compile_keywords(('Google', 'code'), ()) is compile_keywords(('Google', 'code'), ())
+
+def test_redundant_keywords_are_pruned():
+    """轉小寫、去重複，並移除包含較短關鍵字的多餘關鍵字。"""
+    assert prune_keywords(['Google Code', 'CODE', 'code', '', 'tg']) == ('tg', 'code')
+
+def test_match_results_are_memoized():
+    """同一段文字只實際比對一次。"""
+    matcher = KeywordMatcher(['code'], [], memo_size=2)
+    assert matcher.matches('your code') is True
+    matcher.include = ('nothing',)
+    assert matcher.matches('your code') is True
+    matcher.matches('a')
+    matcher.matches('b')
+    assert matcher.matches('your code') is False
+
+def test_normalize_sms_text():
+    assert normalize_sms_text(['Hello', 'WORLD']) == 'hello world'
+    assert normalize_sms_text(None) == ''
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_filter(seed):
+    """在隨機資料上，編譯後的比對結果應與原本的實作完全相同。"""
+    rng = random.Random(seed)
+    vocabulary = ['Google', 'code', 'Telegram', 'ÄBC', 'verify', '1234', 'a.b', 'x*y']
+    numbers = []
+    for i in range(200):
+        smss = [" ".join(rng.choice(vocabulary) for _ in range(3)) for _ in range(rng.randint(0, 3))]
+        item = {'number': f'+{i}', 'smss': smss}
+        if i % 2:
+            item['search_text'] = normalize_sms_text(smss)
+        numbers.append(item)
+    include = rng.sample(vocabulary, 2) + ['']
+    exclude = [k.upper() for k in rng.sample(vocabulary, 1)]
+    assert apply_keyword_filter(numbers, include, exclude) == naive_filter(numbers, include, exclude)
+    assert apply_keyword_filter(numbers, [], exclude) == naive_filter(numbers, [], exclude)
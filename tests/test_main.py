@@ -1,6 +1,13 @@
 
+import sys
+
 import pytest
+import main
 from main import app as flask_app # 從 main.py 匯入您的 Flask app
+from snapshot import KeywordSettings, Snapshot
+
+# 匯入 main 時不讀取設定檔，測試前先套用 config.toml
+main.configure()
 
 @pytest.fixture
 def app():
@@ -12,6 +19,13 @@ def app():
     })
     yield flask_app
 
+@pytest.fixture(autouse=True)
+def clear_view_cache():
+    """每個測試都從空的頁面快取開始，避免沿用其他測試渲染的結果。"""
+    main.VIEW_CACHE.clear()
+    yield
+    main.VIEW_CACHE.clear()
+
 @pytest.fixture
 def client(app):
     """一個 Flask 測試客戶端。"""
@@ -24,16 +38,299 @@ def test_home_page_loads(client, mocker):
     # 這裡我們讓 apply_keyword_filter 回傳一個可預測的空列表
     mocker.patch('main.apply_keyword_filter', return_value=[])
     
-    # 模擬 cached_data，讓模板渲染時有資料可用
-    mocker.patch('main.cached_data', {
-        "raw_numbers": [
-            {'number': '+123', 'url': 'http://a.com', 'last_sms': 'sms1', 'smss': ['sms1']}
-        ],
-        "timestamp": 1234567890
-    })
+    # 模擬快取資料的快照，讓模板渲染時有資料可用
+    mocker.patch('main.SNAPSHOT', Snapshot(
+        [{'number': '+123', 'url': 'http://a.com', 'last_sms': 'sms1', 'smss': ['sms1']}],
+        1234567890,
+        'us',
+    ))
 
     response = client.get('/')
     assert response.status_code == 200
     # 檢查頁面 h1 標題中的中文字串是否存在，並使用 utf-8 編碼
     assert "活躍簡訊號碼".encode('utf-8') in response.data
     assert b"United States" in response.data
+
+def test_home_page_is_memoized(client, mocker):
+    """資料與篩選條件不變時，重複的請求不應再次篩選；資料時間戳記改變後才重新計算。"""
+    mock_filter = mocker.patch('main.apply_keyword_filter', return_value=[])
+    numbers = [{'number': '+123', 'url': 'http://a.com', 'last_sms': 'sms1', 'smss': ['sms1']}]
+    mocker.patch('main.SNAPSHOT', Snapshot(numbers, 1234567890, 'us'))
+    mocker.patch('main.KEYWORD_SETTINGS', KeywordSettings('contains', ['code'], []))
+
+    first = client.get('/')
+    second = client.get('/')
+    assert first.data == second.data
+    assert mock_filter.call_count == 1
+
+    mocker.patch('main.SNAPSHOT', Snapshot(numbers, 1234567999, 'us'))
+    client.get('/')
+    assert mock_filter.call_count == 2
+
+def test_home_page_conditional_get(client, mocker):
+    """帶著相同 ETag 的請求應得到沒有內容的 304；資料更新後 ETag 應改變。"""
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1234567890))
+
+    first = client.get('/')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    second = client.get('/', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1234567999))
+    third = client.get('/', headers={'If-None-Match': etag})
+    assert third.status_code == 200
+    assert third.headers['ETag'] != etag
+
+def test_home_page_is_compressed(client, mocker):
+    """用戶端接受 gzip 時回傳壓縮後的頁面，且 ETag 與未壓縮的版本不同。"""
+    import gzip
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1234567890))
+
+    plain = client.get('/')
+    compressed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+
+def test_static_assets_use_content_hashed_urls(client, mocker):
+    """頁面中的靜態檔案網址帶有內容雜湊，依此網址請求時回傳長期快取標頭。"""
+    import re
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1234567890))
+    page = client.get('/').data.decode('utf-8')
+    url = re.search(r'/static/style\.css\?v=[0-9a-f]+', page).group(0)
+
+    response = client.get(url)
+    assert 'immutable' in response.headers['Cache-Control']
+    response.close()
+    stale = client.get('/static/style.css?v=outdated')
+    assert 'immutable' not in stale.headers.get('Cache-Control', '')
+    stale.close()
+
+def test_api_numbers_pagination_and_delta(client, mocker):
+    """API 應分頁回傳篩選後的號碼，並可用游標只取得之後的變化。"""
+    feed = main.ChangeFeed()
+    mocker.patch('main.CHANGE_FEED', feed)
+    numbers = [{'number': f'+{i}', 'url': f'u{i}', 'smss': [f'code {i}'], 'search_text': f'code {i}'} for i in range(3)]
+    mocker.patch('main.SNAPSHOT', Snapshot(numbers, 1))
+    feed.update(numbers)
+
+    page = client.get('/api/numbers?limit=2&include=code').get_json()
+    assert [n['url'] for n in page['numbers']] == ['u0', 'u1']
+    assert page['next_offset'] == 2 and page['total'] == 3 and page['reset'] is True
+    assert 'search_text' not in page['numbers'][0]
+
+    updated = [dict(numbers[0], smss=['new', 'code 0'], search_text='new code 0'), numbers[1]]
+    mocker.patch('main.SNAPSHOT', Snapshot(updated, 2))
+    feed.update(updated)
+    delta = client.get(f"/api/numbers?include=code&since={page['cursor']}").get_json()
+    assert delta['reset'] is False
+    assert [(n['url'], n['new_smss']) for n in delta['numbers']] == [('u0', ['new'])]
+    assert delta['removed'] == ['u2']
+
+    assert client.get('/api/numbers?limit=abc').status_code == 400
+
+def test_home_page_cursor_is_read_before_snapshot(client, mocker):
+    """頁面的游標不可比頁面上的資料新：讀取游標時剛好發布的資料必須出現在頁面上，否則事件串流會永遠漏掉這些變化。"""
+    old = [{'number': '+1', 'url': 'u1', 'country': 'us', 'source': 'A', 'last_sms': 'code 1', 'smss': ['code 1']}]
+    new = old + [{'number': '+2', 'url': 'u2', 'country': 'us', 'source': 'A', 'last_sms': 'code 2', 'smss': ['code 2']}]
+
+    class PublishingFeed(main.ChangeFeed):
+        publish_on_read = False
+
+        @property
+        def cursor(self):
+            if self.publish_on_read:
+                self.publish_on_read = False
+                main.SNAPSHOT = Snapshot(new, 2, 'us')
+                self.update(new)
+            return super().cursor
+
+    feed = PublishingFeed()
+    mocker.patch('main.CHANGE_FEED', feed)
+    mocker.patch('main.SNAPSHOT', Snapshot(old, 1, 'us'))
+    stale_cursor = feed.update(old)
+    feed.publish_on_read = True
+
+    page = client.get('/').get_data(as_text=True)
+    assert feed.cursor != stale_cursor
+    assert f'const eventsCursor = "{feed.cursor}";' in page
+    assert 'u2' in page
+
+def test_dashboard_and_api_select_country(client, mocker):
+    """主頁面依 ?country= 只顯示該國家的號碼 (未指定時為預設國家)，API 的 country 參數亦同。"""
+    numbers = [
+        {'number': '+1555', 'url': 'u-us', 'country': 'us', 'source': 'A', 'last_sms': 'us code', 'smss': ['us code']},
+        {'number': '+1604', 'url': 'u-ca', 'country': 'ca', 'source': 'A', 'last_sms': 'ca code', 'smss': ['ca code']},
+    ]
+    mocker.patch('main.SNAPSHOT', Snapshot(numbers, 1, 'us'))
+    mocker.patch('main.COUNTRIES', ['us', 'ca'])
+    mocker.patch('main.DEFAULT_COUNTRY', 'us')
+    mocker.patch('main.KEYWORD_SETTINGS', KeywordSettings('none'))
+
+    default_page = client.get('/').data
+    assert b'u-us' in default_page and b'u-ca' not in default_page
+    canada = client.get('/?country=ca').data
+    assert b'u-ca' in canada and b'u-us' not in canada and b'Canada' in canada
+    # 不在設定中的國家退回預設國家
+    assert b'u-us' in client.get('/?country=zz').data
+
+    assert [n['url'] for n in client.get('/api/numbers').get_json()['numbers']] == ['u-us', 'u-ca']
+    api_ca = client.get('/api/numbers?country=ca').get_json()['numbers']
+    assert [(n['url'], n['country']) for n in api_ca] == [('u-ca', 'ca')]
+
+def test_events_stream_catches_up_and_pushes(client, mocker):
+    """/events 應先補送游標之後的變化，再推送之後發布的事件。"""
+    feed = main.ChangeFeed()
+    mocker.patch('main.CHANGE_FEED', feed)
+    mocker.patch('main.BROADCASTER', main.EventBroadcaster())
+    mocker.patch('main.SSE_HEARTBEAT_SECONDS', 0.01)
+    old = [{'number': '+1', 'url': 'u1', 'smss': ['code 1']}]
+    cursor = feed.update(old)
+    new = old + [{'number': '+2', 'url': 'u2', 'smss': ['code 2']}]
+    feed.update(new)
+    mocker.patch('main.SNAPSHOT', Snapshot(new, 1))
+
+    response = client.get(f'/events?include=code&since={cursor}', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    chunks = (chunk.decode('utf-8') for chunk in response.response)
+    assert next(chunks) == 'retry: 5000\n\n'
+    catch_up = next(chunks)
+    assert catch_up.startswith('event: numbers\nid: ')
+    assert '"u2"' in catch_up and '"u1"' not in catch_up
+    assert next(chunks) == ': keep-alive\n\n'
+    assert len(main.BROADCASTER) == 1
+    response.close()
+    assert len(main.BROADCASTER) == 0
+
+def test_events_stream_resets_stale_cursor(client, mocker):
+    mocker.patch('main.BROADCASTER', main.EventBroadcaster())
+    response = client.get('/events?since=0-0', buffered=False)
+    chunks = [chunk.decode('utf-8') for chunk in response.response]
+    assert chunks[1].startswith('event: reset')
+
+def test_metrics_endpoint_exports_web_metrics(client, mocker):
+    """/metrics 應以 Prometheus 文字格式輸出指標，且包含主頁面的延遲。"""
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1234567890))
+    before = main.HOME_SECONDS.count()
+    client.get('/')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert '# TYPE smscatcher_home_seconds histogram' in text
+    # 爬蟲指標在 scraper_core 載入時註冊；main 只在開始爬蟲時才匯入它，只提供網頁時不會出現
+    assert ('# TYPE smscatcher_number_checks_total counter' in text) == ('scraper_core' in sys.modules)
+    assert main.HOME_SECONDS.count() == before + 1
+
+def test_filter_post_replaces_settings_instead_of_mutating(client, mocker):
+    """POST 篩選條件時應換上新的設定物件，先前取得舊設定的請求看到的內容不變。"""
+    mocker.patch('main.SNAPSHOT', Snapshot([], 1))
+    previous = KeywordSettings('contains', ['old'], [])
+    mocker.patch('main.KEYWORD_SETTINGS', previous)
+
+    response = client.post('/', data={'filter_mode': 'both', 'must_include_json': '["otp"]', 'must_exclude_json': '["ad"]'})
+    assert response.status_code == 302
+    assert main.KEYWORD_SETTINGS == ('both', ('otp',), ('ad',))
+    assert previous == ('contains', ('old',), ())
+
+class StopUpdateLoop(Exception):
+    pass
+
+def run_update_cycle(mocker, scrape_all_sites, poll_results):
+    """
+    以假的 scraper_core 執行 update_cache：一次完整更新，接著依序回報 poll_results 中每一批輪詢結果，然後停止。
+    """
+    import types
+    batches = list(poll_results)
+
+    def poll_due_numbers(service, lang_dict, on_result):
+        if not batches:
+            return 0
+        batch = batches.pop(0)
+        for number_info, result in batch:
+            on_result(number_info, result)
+        return len(batch)
+
+    fake = types.SimpleNamespace(scrape_all_sites=scrape_all_sites, poll_due_numbers=poll_due_numbers,
+                                 seconds_until_next_poll=lambda: None)
+    mocker.patch('main.load_scraper', return_value=fake)
+    # 第一次等待 (完整更新之後) 照常返回，輪詢結果都回報完後的下一次等待結束迴圈
+    mocker.patch('main.time.sleep', side_effect=[None, StopUpdateLoop()])
+    with pytest.raises(StopUpdateLoop):
+        main.update_cache(['https://site.test/'], main.lang_dict)
+
+def test_poll_results_are_batched_and_saved_incrementally(mocker):
+    """輪詢的結果每輪排程迴圈只發布一次，且只寫入有檢查的號碼，不重寫整個快照。"""
+    store = mocker.Mock()
+    mocker.patch('main.SMS_STORE', store)
+    mocker.patch('main.SNAPSHOT', Snapshot())
+    mocker.patch('main.CHANGE_FEED', main.ChangeFeed())
+    base_url = 'https://site.test/'
+    listed = [{'number': f'+{i}', 'url': f'u{i}', 'base_url': base_url, 'smss': [f'code {i}']} for i in range(3)]
+
+    def scrape_all_sites(service, target_urls, lang_dict, on_site_done=None):
+        on_site_done(base_url, [dict(n) for n in listed])
+        return listed
+
+    polls = [[
+        ({'url': 'u0', 'base_url': base_url}, dict(listed[0], smss=['new', 'code 0'])),
+        ({'url': 'u1', 'base_url': base_url}, None),
+    ]]
+    run_update_cycle(mocker, scrape_all_sites, polls)
+
+    store.save_changes.assert_called_once()
+    updated, removed, timestamp = store.save_changes.call_args.args
+    assert [n['url'] for n in updated] == ['u0'] and removed == ['u1']
+    assert timestamp == main.SNAPSHOT.timestamp
+    assert sorted(n['url'] for n in main.SNAPSHOT.numbers) == ['u0', 'u2']
+    # 整個快照只在完整更新時寫入，輪詢之後沒有再重寫
+    assert [name for name, _, _ in store.method_calls][-1] == 'save_changes'
+
+def test_unchanged_results_keep_snapshot_and_view_cache(mocker):
+    """檢查結果與目前的資料相同時不發布新的快照：時間戳記不變，記住的頁面與 ETag 也不會失效。"""
+    mocker.patch('main.SMS_STORE', None)
+    mocker.patch('main.SNAPSHOT', Snapshot())
+    mocker.patch('main.CHANGE_FEED', main.ChangeFeed())
+    base_url = 'https://site.test/'
+    listed = [{'number': '+0', 'url': 'u0', 'base_url': base_url, 'smss': ['code 0']}]
+    published = []
+
+    def scrape_all_sites(service, target_urls, lang_dict, on_site_done=None):
+        on_site_done(base_url, [dict(n) for n in listed])
+        published.append(main.SNAPSHOT)
+        main.VIEW_CACHE.get_or_create(('page', main.SNAPSHOT.timestamp), lambda: 'rendered')
+        return listed
+
+    polls = [[({'url': 'u0', 'base_url': base_url}, dict(listed[0]))]]
+    run_update_cycle(mocker, scrape_all_sites, polls)
+
+    assert main.SNAPSHOT is published[0]
+    assert len(main.VIEW_CACHE) == 1
+
+def test_page_shows_last_completed_scrape_when_data_is_unchanged(client, mocker):
+    """資料沒有變化時快照不更新，但頁面上的更新時間應是最近一次完成爬取的時間，不會看起來停在上次資料變化時。"""
+    import itertools
+    mocker.patch('main.SMS_STORE', None)
+    mocker.patch('main.SNAPSHOT', Snapshot())
+    mocker.patch('main.CHANGE_FEED', main.ChangeFeed())
+    mocker.patch('main.LAST_SCRAPE_TIME', 0)
+    mocker.patch('main.time.time', side_effect=itertools.count(1_700_000_000, 600))
+    base_url = 'https://site.test/'
+    listed = [{'number': '+0', 'url': 'u0', 'base_url': base_url, 'source': 'A', 'last_sms': 'code 0', 'smss': ['code 0']}]
+
+    def scrape_all_sites(service, target_urls, lang_dict, on_site_done=None):
+        on_site_done(base_url, [dict(n) for n in listed])
+        return listed
+
+    polls = [[({'url': 'u0', 'base_url': base_url}, dict(listed[0]))]]
+    run_update_cycle(mocker, scrape_all_sites, polls)
+
+    assert main.LAST_SCRAPE_TIME > main.SNAPSHOT.timestamp
+    cursor = main.CHANGE_FEED.cursor
+    page = client.get('/').get_data(as_text=True)
+    assert main.time.strftime('%Y-%m-%d %H:%M:%S', main.time.localtime(main.LAST_SCRAPE_TIME)) in page
+    assert main.CHANGE_FEED.cursor == cursor
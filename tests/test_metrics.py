@@ -0,0 +1,51 @@
+import pytest
+
+from metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_renders_per_label_values(registry):
+    """計數器應依標籤值分別累計，並輸出 HELP/TYPE 與每個標籤組合的數值。"""
+    checks = registry.counter('checks_total', 'Number checks.', ('site', 'outcome'))
+    checks.inc('tempnumber', 'active')
+    checks.inc('tempnumber', 'active')
+    checks.inc('receivesmss', 'error', amount=3)
+    text = registry.render()
+    assert '# HELP checks_total Number checks.\n# TYPE checks_total counter\n' in text
+    assert 'checks_total{site="tempnumber",outcome="active"} 2\n' in text
+    assert 'checks_total{site="receivesmss",outcome="error"} 3\n' in text
+
+def test_histogram_buckets_are_cumulative(registry):
+    """直方圖輸出的區間應為累積次數，並包含 +Inf、總和與總數。"""
+    latency = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value=value)
+    text = registry.render()
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="1"} 3\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4\n' in text
+    assert 'latency_seconds_sum 6.05\n' in text
+    assert 'latency_seconds_count 4\n' in text
+    assert latency.count() == 4 and latency.total() == 6.05
+
+def test_histogram_timer_records_one_observation(registry):
+    """time() 區塊結束時應記錄一次觀測值，即使區塊中發生例外。"""
+    parse = registry.histogram('parse_seconds', 'Parse time.', ('target',))
+    with parse.time('tempnumber_list'):
+        pass
+    with pytest.raises(ValueError):
+        with parse.time('tempnumber_list'):
+            raise ValueError
+    assert parse.count('tempnumber_list') == 2
+
+def test_registering_same_name_returns_existing_metric(registry):
+    """同名指標重複註冊時應回傳同一個物件，避免重新匯入模組時重複輸出。"""
+    assert registry.counter('a_total', 'A.') is registry.counter('a_total', 'A.')
+
+def test_label_values_are_escaped(registry):
+    """標籤值中的引號、反斜線與換行應被跳脫。"""
+    registry.gauge('g', 'G.', ('name',)).set('a"b\\c\nd', value=1)
+    assert 'g{name="a\\"b\\\\c\\nd"} 1\n' in registry.render()
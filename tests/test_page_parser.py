@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import page_parser
+from page_parser import parse_html, resolve_backend
+from scraper_core import PARSE_TARGETS
+from tests.fixtures.generate_pages import PAGES, generate
+
+# 測試頁面是由 tests/fixtures/generate_pages.py 產生的合成頁面 (依照三個網站的結構)，不是真實網站的存檔
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+
+# 各頁面實際使用的選擇器
+PAGE_SELECTORS = {
+    'freereceivesms_list': '.number-boxes-item',
+    'freereceivesms_number': '.container .row.border-bottom',
+    'receivesmss_list': '.number-boxes > a',
+    'receivesmss_number': 'div.row.border-bottom.py-2',
+    'tempnumber_list': 'a.country-link',
+    'tempnumber_number': 'div.direct-chat-msg',
+}
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, f"{name}.html"), encoding='utf-8') as f:
+        return f.read()
+
+def select_texts(soup, selector):
+    return [" ".join(el.get_text(" ", strip=True).split()) for el in soup.select(selector)]
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_saved_pages_match_generator(page):
+    """tests/fixtures/pages 中的頁面應與產生器的輸出相同；修改產生器後請重新執行 python -m tests.fixtures.generate_pages。"""
+    assert read_page(page) == generate(page)
+
+def test_resolve_backend_falls_back(monkeypatch):
+    """指定的解析器未安裝時應退回可用的解析器。"""
+    monkeypatch.setattr(page_parser, 'PARSER_BACKENDS', ('not-installed', 'html.parser'))
+    assert resolve_backend('auto') == 'html.parser'
+    assert resolve_backend('not-installed') == 'html.parser'
+    assert resolve_backend('html.parser') == 'html.parser'
+
+def test_subtree_matches_single_class_token():
+    """只保留 class 中含有完整 class 名稱的元素，不包含名稱相似的 class。"""
+    markup = '<div class="a x">1</div><div class="xx">2</div><div class="x-y">3</div><span class="x">4</span>'
+    soup = parse_html(markup, 'html.parser', only=('div', 'x'))
+    assert [el.get_text() for el in soup.find_all(True)] == ['1']
+
+@pytest.mark.parametrize("backend", sorted({'html.parser', resolve_backend('auto')}))
+@pytest.mark.parametrize("page", sorted(PAGE_SELECTORS))
+def test_targeted_parse_matches_full_parse(page, backend):
+    """只解析子樹時，選擇器取得的內容應與解析整頁完全相同。"""
+    markup = read_page(page)
+    full = select_texts(parse_html(markup, 'html.parser'), PAGE_SELECTORS[page])
+    targeted = select_texts(parse_html(markup, backend, only=PARSE_TARGETS[page]), PAGE_SELECTORS[page])
+    assert full
+    assert targeted == full
@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+
+import pytest
+
+import parse_pool
+from parse_pool import ParsePool, parse_message_rows
+
+SPEC = {'rows': 'div.msg', 'fields': {'text': 'p'}}
+PAGE = '<div class="msg"><p> hello </p></div><div class="msg"><p>world</p></div>'
+
+
+def exit_in_worker():
+    """在工作程序中直接結束程序 (模擬工作程序崩潰)；在主程序中則正常回傳。"""
+    if multiprocessing.current_process().name != 'MainProcess':
+        os._exit(1)
+    return 'inline'
+
+def fail_to_parse():
+    raise ValueError("bad page")
+
+@pytest.fixture
+def pool():
+    fallbacks = []
+    pool = ParsePool(1, on_fallback=fallbacks.append)
+    pool.fallbacks = fallbacks
+    yield pool
+    pool.close()
+
+def test_parse_message_rows_returns_rows_or_none():
+    assert parse_message_rows(PAGE, 'html.parser', None, SPEC) == [{'text': 'hello'}, {'text': 'world'}]
+    assert parse_message_rows('<p>challenge</p>', 'html.parser', None, SPEC, expected_selector='div.msg') is None
+
+def test_pool_returns_worker_results(pool):
+    """工作程序的結果應與就地解析相同。"""
+    assert pool.run(parse_message_rows, PAGE, 'html.parser', None, SPEC) == parse_message_rows(PAGE, 'html.parser', None, SPEC)
+    assert pool.fallbacks == []
+
+def test_errors_from_the_parser_are_raised(pool):
+    """解析函式本身的例外應照常傳回呼叫端，不算是程序池故障。"""
+    with pytest.raises(ValueError):
+        pool.run(fail_to_parse)
+    assert pool.fallbacks == []
+
+def test_crashed_worker_falls_back_inline_and_recovers(pool):
+    """工作程序崩潰時這一頁改為就地解析，之後重建程序池繼續使用。"""
+    assert pool.run(exit_in_worker) == 'inline'
+    assert len(pool.fallbacks) == 1
+    assert pool.run(parse_message_rows, PAGE, 'html.parser', None, SPEC) == [{'text': 'hello'}, {'text': 'world'}]
+    assert len(pool.fallbacks) == 1
+
+def test_pool_that_cannot_start_parses_inline(mocker):
+    """無法建立程序池時所有頁面都改為就地解析。"""
+    mocker.patch.object(parse_pool, 'ProcessPoolExecutor', side_effect=OSError("no semaphores"))
+    fallbacks = []
+    pool = ParsePool(2, on_fallback=fallbacks.append)
+    assert pool.run(parse_message_rows, PAGE, 'html.parser', None, SPEC)[0] == {'text': 'hello'}
+    assert pool.run(parse_message_rows, PAGE, 'html.parser', None, SPEC)[1] == {'text': 'world'}
+    assert len(fallbacks) == 1
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+
+from readiness import ReadinessStrategy
+from tests.benchmarks.simulation import VirtualClock, SimulatedPage
+from tests.benchmarks.stub_server import DelayedRenderServer
+
+
+def make_strategy(clock, **kwargs):
+    return ReadinessStrategy('.row', clock=clock.clock, sleep=clock.sleep, **kwargs)
+
+def test_returns_once_row_count_is_stable():
+    """列數停止變化並維持 quiet_period 後應立即回傳，而不是固定等待。"""
+    clock = VirtualClock()
+    page = SimulatedPage(clock, first_row_at=1.0, row_interval=0.1, total_rows=5, ready_at=1.0)
+    count = make_strategy(clock, timeout=10, quiet_period=0.5, poll_interval=0.1).wait(page)
+    assert count == 5
+    # 最後一列在 1.4 秒出現，再穩定 0.5 秒
+    assert 1.9 <= clock.now < 2.1
+
+def test_waits_for_document_ready():
+    """文件仍在 loading 時不應判定為就緒。"""
+    clock = VirtualClock()
+    page = SimulatedPage(clock, first_row_at=0.0, row_interval=0.0, total_rows=3, ready_at=2.0)
+    page.execute_script = lambda script, *args: [3, 'complete' if clock.now >= 2.0 else 'loading']
+    make_strategy(clock, timeout=10, quiet_period=0.2, poll_interval=0.1).wait(page)
+    assert clock.now >= 2.0
+
+def test_raises_timeout_when_no_rows_appear():
+    """逾時仍找不到任何元素時應拋出 TimeoutException。"""
+    clock = VirtualClock()
+    page = SimulatedPage(clock, first_row_at=99.0, row_interval=0.0, total_rows=3, ready_at=0.0)
+    with pytest.raises(TimeoutException):
+        make_strategy(clock, timeout=1, quiet_period=0.2, poll_interval=0.1).wait(page)
+
+def test_returns_partial_rows_at_timeout():
+    """元素持續變化直到逾時，仍應回傳目前的數量。"""
+    clock = VirtualClock()
+    page = SimulatedPage(clock, first_row_at=0.0, row_interval=0.05, total_rows=1000, ready_at=0.0)
+    count = make_strategy(clock, timeout=1, quiet_period=0.5, poll_interval=0.1).wait(page)
+    assert count > 1
+
+def test_delayed_render_page_starts_without_rows():
+    """延遲渲染的頁面在回應中不含訊息列，所有訊息列都交由頁面腳本插入。"""
+    page_path = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages', 'tempnumber_number.html')
+    server = DelayedRenderServer(page_path, 'div.direct-chat-msg').start()
+    try:
+        url = server.url(first_row_at=0.5, row_interval=0.02, total_rows=12, ready_at=0.6)
+        assert url.endswith('?first=0.500&interval=0.020&rows=12')
+        markup = requests.get(url, timeout=5).text
+    finally:
+        server.stop()
+    soup = BeautifulSoup(markup, 'html.parser')
+    assert soup.select('div.direct-chat-msg') == []
+    assert soup.select_one('[data-stub-rows]') is not None
+    assert markup.count('direct-chat-msg left') == server.max_rows == 30
@@ -0,0 +1,77 @@
+import json
+
+from selenium.webdriver.chrome.options import Options
+
+from resource_blocking import ResourceBlocker, configure_options, enable_network_log, summarize_network_log
+
+
+def log_entry(method, **params):
+    return {'level': 'INFO', 'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class CdpDriver:
+    """記錄收到的 CDP 指令，並回傳預先準備的效能日誌。"""
+
+    def __init__(self, log=()):
+        self.commands = []
+        self.log = list(log)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {}
+
+    def get_log(self, log_type):
+        assert log_type == 'performance'
+        entries, self.log = self.log, []
+        return entries
+
+
+def test_summarize_network_log_counts_requests_blocked_and_bytes():
+    """應計算發出的請求、被攔截的請求 (有 blockedReason) 與實際傳輸的位元組數。"""
+    entries = [
+        log_entry('Network.requestWillBeSent', requestId='1'),
+        log_entry('Network.requestWillBeSent', requestId='2'),
+        log_entry('Network.requestWillBeSent', requestId='3'),
+        log_entry('Network.loadingFinished', requestId='1', encodedDataLength=1200),
+        log_entry('Network.loadingFailed', requestId='2', blockedReason='inspector'),
+        log_entry('Network.loadingFailed', requestId='3', errorText='net::ERR_ABORTED'),
+        {'message': 'not json'},
+    ]
+    assert summarize_network_log(entries) == {'requests': 3, 'blocked': 1, 'bytes': 1200}
+
+def test_blocked_urls_are_only_sent_when_they_change():
+    """同一瀏覽器連續載入同一網站時只送出一次 CDP 指令，換成其他網站的清單時才重新設定。"""
+    blocker = ResourceBlocker(measure=False)
+    driver = CdpDriver()
+    blocker.apply(driver, ['*.png*'])
+    blocker.apply(driver, ['*.png*'])
+    assert driver.commands == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': ['*.png*']})]
+    blocker.apply(driver, [])
+    assert driver.commands[-1] == ('Network.setBlockedURLs', {'urls': []})
+
+def test_empty_blocklist_sends_nothing_to_a_fresh_driver():
+    blocker = ResourceBlocker(measure=False)
+    driver = CdpDriver()
+    blocker.apply(driver, [])
+    assert driver.commands == []
+
+def test_page_stats_only_cover_the_current_page():
+    """apply() 會清掉先前頁面的日誌，page_stats() 只統計這次載入的頁面。"""
+    blocker = ResourceBlocker()
+    driver = CdpDriver(log=[log_entry('Network.requestWillBeSent')] * 5)
+    blocker.apply(driver, ['*.css*'])
+    driver.log = [log_entry('Network.requestWillBeSent'), log_entry('Network.loadingFinished', encodedDataLength=300)]
+    assert blocker.page_stats(driver) == {'requests': 1, 'blocked': 0, 'bytes': 300}
+
+def test_drivers_without_cdp_are_skipped():
+    """不支援 CDP 與效能日誌的 WebDriver 直接略過，不會拋出例外。"""
+    blocker = ResourceBlocker()
+    driver = object.__new__(type('PlainDriver', (), {}))
+    blocker.apply(driver, ['*.png*'])
+    assert blocker.page_stats(driver) is None
+
+def test_configure_options_disables_images_and_enables_network_log():
+    options = enable_network_log(configure_options(Options(), disable_images=True))
+    assert options.experimental_options['prefs'] == {'profile.managed_default_content_settings.images': 2}
+    assert options.experimental_options['perfLoggingPrefs']['enableNetwork'] is True
+    assert options.to_capabilities()['goog:loggingPrefs'] == {'performance': 'ALL'}
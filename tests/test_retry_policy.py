@@ -0,0 +1,65 @@
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from retry_policy import RetryPolicy, RetryableError, ChallengePageError
+
+
+def make_policy(**kwargs):
+    sleeps = []
+    policy = RetryPolicy(sleep=sleeps.append, rng=lambda: 0.0, **kwargs)
+    return policy, sleeps
+
+def test_stops_on_first_success():
+    """第一次就成功時不應重複執行。"""
+    policy, sleeps = make_policy(max_attempts=3)
+    calls = []
+    assert policy.run(lambda attempt: calls.append(attempt) or "ok") == "ok"
+    assert calls == [1]
+    assert sleeps == []
+
+def test_retries_retryable_errors_with_backoff():
+    """逾時與驗證頁面應重試，等待時間呈指數成長。"""
+    policy, sleeps = make_policy(max_attempts=3, base_delay=1.0)
+    errors = [TimeoutException("slow"), ChallengePageError("cloudflare")]
+
+    def flaky(attempt):
+        if errors:
+            raise errors.pop(0)
+        return attempt
+
+    assert policy.run(flaky) == 3
+    assert sleeps == [1.0, 2.0]
+
+def test_non_retryable_error_raises_immediately():
+    """不可重試的錯誤應立即拋出，不做任何等待。"""
+    policy, sleeps = make_policy(max_attempts=3)
+
+    def broken(attempt):
+        raise WebDriverException("chrome crashed")
+
+    with pytest.raises(WebDriverException):
+        policy.run(broken)
+    assert sleeps == []
+
+def test_raises_after_budget_exhausted():
+    """用完重試次數後應拋出最後一次的錯誤，並回呼 on_retry。"""
+    policy, sleeps = make_policy(max_attempts=2)
+    retried = []
+
+    def always_fails(attempt):
+        raise RetryableError(f"attempt {attempt}")
+
+    with pytest.raises(RetryableError, match="attempt 2"):
+        policy.run(always_fails, on_retry=lambda attempt, e, delay: retried.append(attempt))
+    assert retried == [1]
+
+@pytest.mark.parametrize("attempt, rng_value, expected", [
+    (1, 0.0, 1.0),
+    (3, 0.0, 4.0),
+    (10, 0.0, 30.0),
+    (3, 1.0, 2.0),
+])
+def test_delay_is_capped_and_jittered(attempt, rng_value, expected):
+    """退避時間應有上限，且抖動只會縮短等待。"""
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=0.5, rng=lambda: rng_value)
+    assert policy.delay(attempt) == pytest.approx(expected)
@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from page_parser import parse_html
+from row_extractor import EXTRACT_ROWS_SCRIPT, extract_rows_from_soup, extract_rows_in_browser
+from scraper_core import MESSAGE_ROW_SPECS
+
+# 合成的測試頁面，由 tests/fixtures/generate_pages.py 產生
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, f"{name}.html"), encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize("site", sorted(MESSAGE_ROW_SPECS))
+def test_extract_rows_from_saved_pages(site):
+    """每個網站的號碼頁面都應取出所有訊息列，且最新一列有時間與內容。"""
+    spec = MESSAGE_ROW_SPECS[site]
+    rows = extract_rows_from_soup(parse_html(read_page(f"{site}_number")), spec)
+    assert len(rows) == 30
+    assert set(rows[0]) == set(spec['fields'])
+    assert rows[0]['text'] and 'minutes ago' in " ".join(v for k, v in rows[0].items() if k != 'text' and v)
+
+def test_missing_fields_are_none():
+    spec = {'rows': 'li', 'fields': {'text': 'b', 'time': 'i'}}
+    rows = extract_rows_from_soup(parse_html('<ul><li><b> a <em>b</em> </b></li><li></li></ul>'), spec)
+    assert rows == [{'text': 'ab', 'time': None}, {'text': None, 'time': None}]
+
+def test_extract_rows_in_browser_sends_only_selectors():
+    """瀏覽器端擷取應只傳入選擇器並解析回傳的 JSON。"""
+    calls = []
+
+    class FakeDriver:
+        def execute_script(self, script, *args):
+            calls.append((script, args))
+            return json.dumps([{'text': 'code 1234', 'time': '1 minutes ago'}])
+
+    spec = MESSAGE_ROW_SPECS['tempnumber']
+    assert extract_rows_in_browser(FakeDriver(), spec) == [{'text': 'code 1234', 'time': '1 minutes ago'}]
+    assert calls == [(EXTRACT_ROWS_SCRIPT, (spec['rows'], spec['fields']))]
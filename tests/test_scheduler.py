@@ -0,0 +1,90 @@
+import pytest
+
+from scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_scheduler(clock, **kwargs):
+    options = dict(min_interval=60, active_max_interval=600, max_interval=3600, backoff_factor=2.0, pages_per_minute=600)
+    options.update(kwargs)
+    return PollScheduler(clock=clock, **options)
+
+def numbers(*urls):
+    return [{'url': url, 'number': url} for url in urls]
+
+def test_new_numbers_become_due_after_min_interval(clock):
+    """新加入的號碼在最短間隔後才到期。"""
+    scheduler = make_scheduler(clock)
+    scheduler.sync('site', numbers('a', 'b'))
+    assert scheduler.pop_due(limit=10) == []
+    assert scheduler.seconds_until_due() == 60
+    clock.now = 60
+    assert [n['url'] for n in scheduler.pop_due(limit=10)] == ['a', 'b']
+
+def test_inactive_numbers_back_off_exponentially(clock):
+    """不活躍的號碼間隔應指數成長，直到上限。"""
+    scheduler = make_scheduler(clock, max_interval=300)
+    scheduler.sync('site', numbers('a'))
+    intervals = []
+    for _ in range(5):
+        clock.now += scheduler.seconds_until_due()
+        assert scheduler.pop_due(limit=1)
+        start = clock.now
+        scheduler.observe('a', active=False, changed=False)
+        intervals.append(start + scheduler.seconds_until_due() - clock.now)
+    assert intervals == [120, 240, 300, 300, 300]
+
+def test_live_numbers_follow_message_rate(clock):
+    """簡訊頻繁的號碼應依訊息間隔縮短檢查間隔。"""
+    scheduler = make_scheduler(clock, min_interval=10)
+    scheduler.sync('site', numbers('live'))
+    for _ in range(4):
+        clock.now += 100
+        scheduler.observe('live', active=True, changed=True)
+    assert scheduler.seconds_until_due() == 50
+
+def test_budget_limits_pages_per_minute(clock):
+    """全域頁面預算用完時不應再取出號碼，直到預算回補。"""
+    scheduler = make_scheduler(clock, pages_per_minute=2)
+    scheduler.sync('site', numbers('a', 'b', 'c'))
+    clock.now = 60
+    assert len(scheduler.pop_due(limit=10)) == 2
+    assert scheduler.pop_due(limit=10) == []
+    assert scheduler.seconds_until_due() == pytest.approx(30)
+    clock.now += 30
+    assert [n['url'] for n in scheduler.pop_due(limit=10)] == ['c']
+
+def test_charge_consumes_budget(clock):
+    """完整更新載入的頁面應從同一個預算扣除。"""
+    scheduler = make_scheduler(clock, pages_per_minute=5)
+    scheduler.sync('site', numbers('a'))
+    scheduler.charge(10)
+    clock.now = 60
+    assert scheduler.pop_due(limit=10) == []
+
+def test_sync_removes_numbers_missing_from_list(clock):
+    """已不在列表上的號碼應從排程中移除，且不影響其他網站。"""
+    scheduler = make_scheduler(clock)
+    scheduler.sync('site1', numbers('a', 'b'))
+    scheduler.sync('site2', numbers('c'))
+    scheduler.sync('site1', numbers('b'))
+    clock.now = 60
+    assert sorted(n['url'] for n in scheduler.pop_due(limit=10)) == ['b', 'c']
+
+def test_payloads_returns_numbers_of_one_site(clock):
+    scheduler = make_scheduler(clock)
+    scheduler.sync('site1', numbers('a', 'b'))
+    scheduler.sync('site2', numbers('c'))
+    assert sorted(n['url'] for n in scheduler.payloads('site1')) == ['a', 'b']
+    assert scheduler.payloads('missing') == []
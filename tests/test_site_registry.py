@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from site_registry import SiteAdapter, SiteRegistry
+
+
+def make_adapter(key, domain, check_number=None, **kwargs):
+    return SiteAdapter(key, domain, key.title(), list_numbers=lambda *args: [],
+                       check_number=check_number or (lambda *args: None), is_recent=lambda text: True, **kwargs)
+
+def test_for_url_matches_domain_and_subdomains():
+    """網址應依主機名稱對應到網站，www. 等子網域也應對應到同一個網站。"""
+    registry = SiteRegistry()
+    free = registry.register(make_adapter('freereceivesms', 'freereceivesms.com'))
+    smss = registry.register(make_adapter('receivesmss', 'receive-smss.com'))
+    assert registry.for_url('https://www.freereceivesms.com/en/us/') is free
+    assert registry.for_url('https://receive-smss.com/') is smss
+    assert registry.get('receivesmss') is smss
+
+def test_for_url_does_not_match_by_substring():
+    """不相關的網域即使網址中含有網站名稱也不應被對應。"""
+    registry = SiteRegistry()
+    registry.register(make_adapter('receivesmss', 'receive-smss.com'))
+    assert registry.for_url('https://example.com/receive-smss.com') is None
+    assert registry.for_url('https://notreceive-smss.com/') is None
+    assert registry.for_url('not a url') is None
+
+def test_check_respects_max_concurrency():
+    """同一網站同時進行的檢查數不應超過 max_concurrency。"""
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0}
+
+    def check_number(*args):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        time.sleep(0.02)
+        with lock:
+            state['running'] -= 1
+
+    adapter = make_adapter('receivesmss', 'receive-smss.com', check_number=check_number, max_concurrency=2)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: adapter.check({'url': i}, 'ua', None, '', {}), range(16)))
+    assert state['peak'] == 2
+
+def test_readiness_uses_site_timeouts():
+    """未指定 timeout 時，就緒偵測應使用網站詳細頁的等待秒數與自己的靜止時間。"""
+    adapter = make_adapter('tempnumber', 'temp-number.com', wait_timeout=20, readiness_quiet=0.8)
+    strategy = adapter.readiness('div.direct-chat-msg')
+    assert strategy.timeout == 20
+    assert strategy.quiet_period == 0.8
+    assert adapter.readiness('a', timeout=5).timeout == 5
+
+def test_alias_maps_host_and_port():
+    """別名 (含連接埠) 應對應到已登錄的網站，且不影響同主機的其他連接埠。"""
+    registry = SiteRegistry()
+    smss = registry.register(make_adapter('receivesmss', 'receive-smss.com'))
+    registry.alias('127.0.0.1:8001', 'receivesmss')
+    assert registry.for_url('http://127.0.0.1:8001/l0/') is smss
+    assert registry.for_url('http://127.0.0.1:8002/') is None
+
+def test_targets_fan_out_over_countries_and_pages():
+    """列表頁依國家與頁碼展開；不分國家或不分頁的網站對應欄位為 None，網站自己的設定優先於全域設定。"""
+    assert make_adapter('a', 'a.com').targets(['us', 'ca'], [1, 2]) == [('us', 1), ('us', 2), ('ca', 1), ('ca', 2)]
+    assert make_adapter('b', 'b.com', paged=False).targets(['us', 'ca'], [1, 2]) == [('us', None), ('ca', None)]
+    assert make_adapter('c', 'c.com', per_country=False, paged=False).targets(['us', 'ca'], [1, 2]) == [(None, None)]
+    assert make_adapter('d', 'd.com', countries=['gb'], pages=[3]).targets(['us'], [1]) == [('gb', 3)]
@@ -0,0 +1,43 @@
+import pytest
+
+from snapshot import KeywordSettings, Snapshot
+
+
+def test_snapshot_indexes_numbers_by_country():
+    """依國家分組的索引在建立時算好；沒有國家欄位的號碼歸在預設國家。"""
+    numbers = [
+        {'url': 'u1', 'country': 'us'},
+        {'url': 'u2', 'country': 'ca'},
+        {'url': 'u3'},
+    ]
+    snapshot = Snapshot(numbers, 10, 'us')
+    assert [n['url'] for n in snapshot.country_numbers('us')] == ['u1', 'u3']
+    assert [n['url'] for n in snapshot.country_numbers('ca')] == ['u2']
+    assert snapshot.country_numbers('gb') == ()
+    assert len(snapshot) == 3 and snapshot.loaded
+
+def test_snapshot_does_not_follow_later_changes_to_the_source_list():
+    numbers = [{'url': 'u1', 'country': 'us'}]
+    snapshot = Snapshot(numbers, 10, 'us')
+    numbers.append({'url': 'u2', 'country': 'us'})
+    assert len(snapshot) == 1
+    assert len(snapshot.country_numbers('us')) == 1
+
+def test_snapshot_is_immutable():
+    snapshot = Snapshot([{'url': 'u1'}], 10, 'us')
+    with pytest.raises(AttributeError):
+        snapshot.timestamp = 11
+    with pytest.raises(AttributeError):
+        del snapshot.numbers
+    with pytest.raises(TypeError):
+        snapshot.by_country['us'] = ()
+
+def test_empty_snapshot_is_not_loaded():
+    snapshot = Snapshot()
+    assert not snapshot.loaded
+    assert len(snapshot) == 0 and snapshot.timestamp == 0
+
+def test_keyword_settings_store_tuples():
+    settings = KeywordSettings('both', ['otp'], ['ad'])
+    assert settings == ('both', ('otp',), ('ad',))
+    assert KeywordSettings() == ('contains', (), ())
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from tests.benchmarks.bench_startup import MODES, ROOT, import_profile, loaded_packages
+
+# 冷啟動匯入 main 的時間上限 (毫秒)；寬鬆的上限只用來抓出明顯的退步，細節請用 bench_startup 量測
+UI_IMPORT_BUDGET_MS = 1500
+
+
+def test_ui_mode_does_not_import_scraper_dependencies():
+    """只匯入 main (--test-ui / --serve-only 模式) 時不應載入 selenium、pyngrok、scraper_core 等爬蟲相關套件。"""
+    profile = import_profile(MODES['ui'])
+    assert 'main' in profile
+    assert loaded_packages(profile) == []
+
+def test_ui_mode_import_time_within_budget():
+    """匯入 main 的總時間應在預算內 (取三次中最快的一次)。"""
+    best_ms = min(
+        sum(self_us for self_us, _ in import_profile(MODES['ui']).values()) / 1000
+        for _ in range(3)
+    )
+    assert best_ms < UI_IMPORT_BUDGET_MS
+
+def test_scraper_mode_still_loads_scraper_core():
+    """一般模式匯入 scraper_core 時才載入爬蟲相關套件。"""
+    profile = import_profile(MODES['scraper'])
+    assert 'scraper_core' in loaded_packages(profile)
+    assert 'selenium' in loaded_packages(profile)
+
+def test_importing_modules_does_not_read_config(tmp_path):
+    """匯入 main 與 scraper_core 時不應讀取 config.toml：在沒有設定檔的目錄中也能匯入，呼叫 configure() 時才讀取。"""
+    code = (
+        "import main, scraper_core\n"
+        "assert not scraper_core.CONFIGURED\n"
+        "try:\n"
+        "    main.configure()\n"
+        "except FileNotFoundError:\n"
+        "    print('config read on configure')\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-c', code], cwd=tmp_path, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == 'config read on configure'
@@ -0,0 +1,54 @@
+import pytest
+
+from storage import SmsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    sms_store = SmsStore(str(tmp_path / "history.sqlite3"))
+    yield sms_store
+    sms_store.close()
+
+def make_number(url, smss, source='Temp-Number'):
+    return {'number': url, 'url': url, 'source': source, 'base_url': 'https://temp-number.com/',
+            'last_sms': smss[0], 'smss': smss, 'last_time': '1 minutes ago'}
+
+def test_empty_store_has_no_snapshot(store):
+    """尚未寫入任何資料時應回傳 (None, 0)。"""
+    assert store.load_snapshot() == (None, 0)
+
+def test_snapshot_round_trip(store, tmp_path):
+    """寫入的快照在重新開啟資料庫後應能完整讀回。"""
+    numbers = [make_number('+1', ['code 1234']), make_number('+2', ['驗證碼 5678'])]
+    store.save_snapshot(numbers, 1700000000.5)
+    store.close()
+    reopened = SmsStore(str(tmp_path / "history.sqlite3"))
+    try:
+        loaded, timestamp = reopened.load_snapshot()
+    finally:
+        reopened.close()
+    assert loaded == numbers
+    assert timestamp == 1700000000.5
+
+def test_snapshot_replaces_previous_numbers(store):
+    """新的快照應取代舊的號碼列表。"""
+    store.save_snapshot([make_number('+1', ['a'])], 1.0)
+    store.save_snapshot([make_number('+2', ['b'])], 2.0)
+    loaded, _ = store.load_snapshot()
+    assert [n['url'] for n in loaded] == ['+2']
+
+def test_messages_are_deduplicated_and_kept(store):
+    """相同的簡訊在同一時間區間內只記錄一次，舊簡訊在快照更新後仍保留於歷史中。"""
+    store.save_snapshot([make_number('+1', ['old', 'shared'])], 1.0)
+    store.save_snapshot([make_number('+1', ['new', 'shared'])], 2.0)
+    history = [m['content'] for m in store.message_history('Temp-Number', '+1')]
+    assert sorted(history) == ['new', 'old', 'shared']
+
+def test_save_changes_only_touches_given_numbers(store):
+    """save_changes 只更新與刪除指定的號碼，其他號碼保留，新的簡訊併入歷史。"""
+    store.save_snapshot([make_number('+1', ['a']), make_number('+2', ['b']), make_number('+3', ['c'])], 1.0)
+    store.save_changes([make_number('+2', ['b2', 'b'])], ['+3'], 2.0)
+    loaded, timestamp = store.load_snapshot()
+    assert sorted((n['url'], n['smss'][0]) for n in loaded) == [('+1', 'a'), ('+2', 'b2')]
+    assert timestamp == 2.0
+    assert sorted(m['content'] for m in store.message_history('Temp-Number', '+2')) == ['b', 'b2']
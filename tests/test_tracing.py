@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from tracing import Tracer, main, summarize, trace_files
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+@pytest.fixture
+def tracer(tmp_path):
+    sampled = Tracer(rng=lambda: 0.0)
+    sampled.configure(str(tmp_path / "traces.jsonl"), sample_rate=1.0)
+    yield sampled
+    sampled.close()
+
+def test_child_spans_inherit_attributes(tracer, tmp_path):
+    """子區段應繼承根區段的屬性 (site、number) 與上層的 attempt，並屬於同一個追蹤。"""
+    with tracer.trace('check', site='tempnumber', number='+1') as root:
+        with tracer.span('attempt', attempt=2):
+            with tracer.span('page_load'):
+                pass
+        root.set(outcome='active')
+    records = read_records(tmp_path / "traces.jsonl")
+    assert [r['span'] for r in records] == ['page_load', 'attempt', 'check']
+    page_load = records[0]
+    assert page_load['site'] == 'tempnumber' and page_load['number'] == '+1' and page_load['attempt'] == 2
+    assert page_load['parent'] == 'attempt'
+    assert len({r['trace'] for r in records}) == 1
+    assert records[2]['outcome'] == 'active'
+
+def test_errors_are_recorded(tracer, tmp_path):
+    """區段中發生例外時應記錄例外類型，並讓例外繼續拋出。"""
+    with pytest.raises(TimeoutError):
+        with tracer.trace('check', site='receivesmss'):
+            raise TimeoutError
+    assert read_records(tmp_path / "traces.jsonl")[0]['error'] == 'TimeoutError'
+
+def test_unsampled_traces_write_nothing(tmp_path):
+    """未被取樣的追蹤及其子區段都不應寫入；always=True 的追蹤不受取樣影響。"""
+    path = tmp_path / "traces.jsonl"
+    unsampled = Tracer(rng=lambda: 0.9)
+    unsampled.configure(str(path), sample_rate=0.5)
+    try:
+        with unsampled.trace('check'):
+            with unsampled.span('page_load'):
+                pass
+        with unsampled.trace('cycle', always=True):
+            pass
+    finally:
+        unsampled.close()
+    assert [r['span'] for r in read_records(path)] == ['cycle']
+
+def test_spans_outside_a_trace_are_noops():
+    """未設定檔案或不在追蹤中時，span() 不應做任何事。"""
+    disabled = Tracer()
+    with disabled.trace('check') as span:
+        span.set(outcome='active')
+        with disabled.span('parse'):
+            pass
+    assert not disabled.enabled
+
+def test_summary_groups_by_stage_and_field(tmp_path, capsys):
+    """彙總應依區段 (與指定欄位) 計算次數與耗時，並讀取輪替後的舊檔。"""
+    spans = [
+        {'span': 'wait', 'site': 'a', 'duration_ms': 100.0},
+        {'span': 'wait', 'site': 'a', 'duration_ms': 300.0},
+        {'span': 'parse', 'site': 'b', 'duration_ms': 5.0, 'error': 'ValueError'},
+    ]
+    rows = dict(summarize(spans, by=('site',)))
+    assert rows[('a', 'wait')]['count'] == 2
+    assert rows[('a', 'wait')]['mean_ms'] == 200.0
+    assert rows[('b', 'parse')]['errors'] == 1
+
+    path = tmp_path / "traces.jsonl"
+    path.write_text(json.dumps(spans[0]) + "\n", encoding='utf-8')
+    (tmp_path / "traces.jsonl.1").write_text(json.dumps(spans[1]) + "\n", encoding='utf-8')
+    assert trace_files(str(path)) == [str(path) + ".1", str(path)]
+    main(['summary', str(path)])
+    assert 'wait' in capsys.readouterr().out
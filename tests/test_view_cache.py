@@ -0,0 +1,28 @@
+from view_cache import ViewCache
+
+
+def test_factory_called_once_per_key():
+    """相同的鍵值只建立一次。"""
+    cache = ViewCache(maxsize=4)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_create('a', lambda: calls.append('a') or 'value') == 'value'
+    assert calls == ['a']
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_least_recently_used_is_evicted():
+    """超過容量時淘汰最久未使用的項目。"""
+    cache = ViewCache(maxsize=2)
+    cache.get_or_create('a', lambda: 1)
+    cache.get_or_create('b', lambda: 2)
+    cache.get_or_create('a', lambda: 0)
+    cache.get_or_create('c', lambda: 3)
+    assert cache.get_or_create('a', lambda: 'new') == 1
+    assert cache.get_or_create('b', lambda: 'new') == 'new'
+
+def test_clear():
+    cache = ViewCache()
+    cache.get_or_create('a', lambda: 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get_or_create('a', lambda: 2) == 2
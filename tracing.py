@@ -0,0 +1,244 @@
+# tracing.py
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import random
+import threading
+import time
+import uuid
+
+
+class _NoopSpan:
+    """
+    未啟用追蹤或該次追蹤未被取樣時使用的空區段，進出幾乎沒有成本。
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Unsampled:
+    """
+    未被取樣的根區段：在執行緒的堆疊上放一個 None，讓其中的子區段都變成空區段。
+    """
+
+    def __init__(self, stack):
+        self.stack = stack
+
+    def __enter__(self):
+        self.stack.append(None)
+        return self
+
+    def __exit__(self, *exc):
+        self.stack.pop()
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+class Span:
+    """
+    一個計時區段。屬性 (例如 site、number、attempt) 會被其中的子區段繼承。
+    """
+
+    __slots__ = ('tracer', 'name', 'attrs', 'trace_id', 'parent', 'stack', 'wall', 'start')
+
+    def __init__(self, tracer, name, attrs, trace_id, parent, stack):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = trace_id
+        self.parent = parent
+        self.stack = stack
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.stack.append(self)
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.stack.pop()
+        record = {
+            'ts': round(self.wall, 3),
+            'trace': self.trace_id,
+            'span': self.name,
+            'parent': self.parent.name if self.parent is not None else None,
+            'duration_ms': round(duration * 1000, 3),
+        }
+        record.update(self.attrs)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        self.tracer.emit(record)
+        return False
+
+
+class Tracer:
+    """
+    以 JSON lines 將各階段的耗時寫入輪替的檔案。trace() 開始一次追蹤 (例如一個號碼的檢查)，
+    並依 sample_rate 決定是否取樣；span() 在目前執行緒的追蹤中建立子區段，沒有進行中的追蹤時不做任何事。
+    """
+
+    def __init__(self, rng=random.random):
+        self.sample_rate = 0.0
+        self._rng = rng
+        self._local = threading.local()
+        self._logger = None
+
+    @property
+    def enabled(self):
+        return self._logger is not None and self.sample_rate > 0
+
+    def configure(self, path, sample_rate=1.0, max_bytes=10 * 1024 * 1024, backup_count=3):
+        """
+        開始將區段寫入 path (超過 max_bytes 時輪替，保留 backup_count 個舊檔)。
+        """
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger = logging.getLogger(f'{__name__}.{id(self)}')
+        logger.handlers[:] = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        self._logger = logger
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+
+    def close(self):
+        if self._logger is not None:
+            for handler in self._logger.handlers:
+                handler.close()
+            self._logger.handlers[:] = []
+        self._logger = None
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def trace(self, name, always=False, **attrs):
+        """
+        開始一次追蹤 (根區段)；已在追蹤中時則建立子區段。always 為 True 時不經取樣 (用於整輪爬蟲等少量的追蹤)。
+        """
+        if not self.enabled:
+            return _NOOP
+        stack = self._stack()
+        if stack:
+            return self.span(name, **attrs)
+        if not always and self._rng() >= self.sample_rate:
+            return _Unsampled(stack)
+        return Span(self, name, attrs, uuid.uuid4().hex[:16], None, stack)
+
+    def span(self, name, **attrs):
+        """
+        在目前執行緒進行中的追蹤內建立子區段，繼承上層區段的屬性。
+        """
+        stack = getattr(self._local, 'stack', None)
+        if not stack or stack[-1] is None:
+            return _NOOP
+        parent = stack[-1]
+        return Span(self, name, dict(parent.attrs, **attrs), parent.trace_id, parent, stack)
+
+    def emit(self, record):
+        logger = self._logger
+        if logger is not None:
+            logger.info(json.dumps(record, ensure_ascii=False))
+
+
+# 爬蟲共用的追蹤器，由 scraper_core 依 [tracing] 設定啟用
+TRACER = Tracer()
+
+
+def trace_files(path):
+    """
+    回傳 path 與其輪替後的舊檔 (path.1、path.2 ...)，由舊到新。
+    """
+    files = [path] if os.path.exists(path) else []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        files.insert(0, f'{path}.{index}')
+        index += 1
+    return files
+
+def read_spans(paths):
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(spans, by=()):
+    """
+    依 (by 欄位..., 區段名稱) 彙總耗時，回傳依總耗時排序的
+    [(鍵值, {'count', 'errors', 'total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'})]。
+    """
+    groups = {}
+    for span in spans:
+        key = tuple(span.get(field) for field in by) + (span.get('span'),)
+        group = groups.setdefault(key, {'durations': [], 'errors': 0})
+        group['durations'].append(span.get('duration_ms', 0.0))
+        if span.get('error'):
+            group['errors'] += 1
+    rows = []
+    for key, group in groups.items():
+        durations = group['durations']
+        total = sum(durations)
+        rows.append((key, {
+            'count': len(durations),
+            'errors': group['errors'],
+            'total_ms': total,
+            'mean_ms': total / len(durations),
+            'p50_ms': percentile(durations, 50),
+            'p95_ms': percentile(durations, 95),
+            'max_ms': max(durations),
+        }))
+    rows.sort(key=lambda row: row[1]['total_ms'], reverse=True)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize per-stage latency from a JSON-lines trace file.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary = subparsers.add_parser('summary', help="Aggregate spans into per-stage latency breakdowns.")
+    summary.add_argument('path', nargs='?', default='traces.jsonl', help="Trace file (rotated backups are included).")
+    summary.add_argument('--by', nargs='*', default=[], help="Extra fields to group by, e.g. --by site.")
+    args = parser.parse_args(argv)
+
+    files = trace_files(args.path)
+    if not files:
+        parser.error(f"no trace file found at {args.path}")
+    rows = summarize(read_spans(files), by=args.by)
+    header = [field for field in args.by] + ['span']
+    print("".join(f"{name:<18}" for name in header)
+          + f"{'count':>8}{'errors':>8}{'total(s)':>10}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}")
+    for key, stats in rows:
+        print("".join(f"{str(value):<18}" for value in key)
+              + f"{stats['count']:>8}{stats['errors']:>8}{stats['total_ms'] / 1000:>10.1f}{stats['mean_ms']:>10.1f}"
+              f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
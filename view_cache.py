@@ -0,0 +1,42 @@
+# view_cache.py
+import threading
+from collections import OrderedDict
+
+
+class ViewCache:
+    """
+    執行緒安全的小型 LRU 快取，用來記住篩選後的號碼列表與渲染好的頁面。
+    鍵值中包含快取資料的時間戳記，資料更新後舊的項目自然不會再命中；新的爬取結果發布時也會整個清空。
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = max(1, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        """
+        回傳 key 對應的值；沒有時呼叫 factory() 建立並存入 (超過容量時淘汰最久未使用的項目)。
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)